@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark the runtime and accuracy of the draft, standard and final tiers.
+
+Usage: python benchmark_tiers.py blade.yml [repeats]
+
+Every tier runs the optimal runs of the config ``repeats`` times (default 3)
+in this process, after one warm-up run, and the best wall time is reported.
+Accuracy is the largest deviation of power, thrust and root flapwise moment
+from the final tier over the wind speeds each tier solves, relative to the
+largest final-tier value. Prints a Markdown table.
+"""
+
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from b3_bem.core.step import B3BemStep
+from b3_bem.core.store import ResultsStore
+from b3_bem.core.tiers import TIERS
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def run_tier(yml: Path, tier: str, repeats: int):
+    """Return the best wall time of a tier and its optimal run results."""
+    times = []
+    for _ in range(repeats):
+        step = B3BemStep(str(yml), force=True, tier=tier)
+        start = time.perf_counter()
+        step.run()
+        times.append(time.perf_counter() - start)
+    results_path = yml.parent / step.config["workdir"] / "results.json"
+    with open(results_path) as f:
+        results = json.load(f)
+    store = (
+        ResultsStore(results_path.with_name(results["arrays"]))
+        if "arrays" in results
+        else None
+    )
+    runs = results["config"]["bem"].get("runs", {"default": {"type": "optimal"}})
+    curves = {}
+    for run_name, run_data in results["runs"].items():
+        if runs[run_name]["type"] != "optimal":
+            continue
+        prefix = f"runs/{run_name}"
+        if store is None:
+            performance = run_data["performance"]
+            moments = run_data["blade_loads"]["flapwise_moments"]
+        else:
+            performance = {
+                key: store[f"{prefix}/performance/{key}"] for key in ("uinf", "P", "T")
+            }
+            moments = store[f"{prefix}/blade_loads/flapwise_moments"]
+        curves[run_name] = {
+            "uinf": np.asarray(performance["uinf"], dtype=float),
+            "P": np.asarray(performance["P"], dtype=float),
+            "T": np.asarray(performance["T"], dtype=float),
+            "Mflap": np.asarray(moments, dtype=float),
+            "stations": len(results["planform"]["r"]),
+        }
+    return min(times), curves
+
+
+def deviation(curve, reference, key):
+    """Return the largest deviation from the reference, relative to its maximum."""
+    values = np.interp(curve["uinf"], reference["uinf"], reference[key])
+    return np.max(np.abs(curve[key] - values)) / np.max(np.abs(reference[key]))
+
+
+def main():
+    yml = Path(sys.argv[1]).resolve()
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    B3BemStep(str(yml), force=True, tier="draft").run()  # Warm-up
+    timings = {tier: run_tier(yml, tier, repeats) for tier in TIERS}
+    _, reference = timings["final"]
+    print("| tier | run | stations | wind speeds | time [s] | P | T | root flap |")
+    print("|---|---|---|---|---|---|---|---|")
+    for tier, (seconds, curves) in timings.items():
+        for run_name, curve in curves.items():
+            errors = [
+                f"{100 * deviation(curve, reference[run_name], key):.2f}%"
+                for key in ("P", "T", "Mflap")
+            ]
+            print(
+                f"| {tier} | {run_name} | {curve['stations']} | {len(curve['uinf'])} "
+                f"| {seconds:.2f} | {' | '.join(errors)} |"
+            )
+
+
+if __name__ == "__main__":
+    main()
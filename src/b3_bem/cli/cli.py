@@ -4,6 +4,7 @@
 from pathlib import Path
 from treeparse import cli, command, option
 from ..core.step import B3BemStep
+from ..core.tiers import TIERS
 from ..plots.plotter import B3BemPlotter
 import logging
 from rich.logging import RichHandler
@@ -15,9 +16,11 @@ logging.basicConfig(
 
 
 # Treeparse CLI for b3_bem
-def run_b3bem_callback(yml: Path, force: bool = False, plot: bool = False):
+def run_b3bem_callback(
+    yml: Path, force: bool = False, plot: bool = False, tier: str = "standard"
+):
     """Callback for running the B3 BEM step."""
-    step = B3BemStep(str(yml), force=force)
+    step = B3BemStep(str(yml), force=force, tier=tier)
     step.run()
     if plot:
         results_path = Path(yml).parent / step.config["workdir"] / "results.json"
@@ -57,7 +60,7 @@ b3bem_cli.commands.append(
                 flags=["--force", "-f"],
                 arg_type=bool,
                 default=False,
-                help="Force run despite statesman",
+                help="Rerun all runs, even those with unchanged inputs",
             ),
             option(
                 flags=["--plot", "-p"],
@@ -65,6 +68,13 @@ b3bem_cli.commands.append(
                 default=False,
                 help="Generate plots after run",
             ),
+            option(
+                flags=["--tier", "-t"],
+                arg_type=str,
+                default="standard",
+                choices=list(TIERS),
+                help="Accuracy tier: draft (fast preview), standard or final",
+            ),
         ],
     )
 )
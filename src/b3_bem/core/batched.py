@@ -0,0 +1,131 @@
+# Lock-step vectorized solvers for b3_bem.
+
+import numpy as np
+from typing import Callable, Tuple
+
+# fun(idx, x) -> (f, g) for the points idx at x with shape (m, d)
+GradFunc = Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+# fun(idx, x) -> f for the points idx at x with shape (m,)
+RootFunc = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def batched_maximize(
+    fun: GradFunc,
+    x0: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    ftol: float = 1e-9,
+    xtol: float = 1e-5,
+    maxiter: int = 100,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Maximize n independent bounded problems in lock-step.
+
+    Every point runs its own projected BFGS iteration with backtracking, but
+    all points still active are evaluated together in one call to ``fun`` per
+    iteration. Returns the optimum (n, d) and the iteration count per point.
+    """
+    x = np.clip(np.array(x0, dtype=float), lower, upper)
+    n, d = x.shape
+    f, g = fun(np.arange(n), x)
+    g = np.asarray(g, dtype=float).reshape(n, d)
+    # Initial inverse Hessian gives a unit step along the gradient
+    scale = 1.0 / np.maximum(np.abs(g).max(axis=1), 1e-12)
+    Hinv = np.eye(d)[None, :, :] * scale[:, None, None]
+    t = np.ones(n)
+    niter = np.ones(n, dtype=int)
+    active = np.ones(n, dtype=bool)
+    for _ in range(maxiter):
+        # Drop bound-constrained directions pointing outward
+        free = ~(((x <= lower) & (g < 0)) | ((x >= upper) & (g > 0)))
+        gp = np.where(free, g, 0.0)
+        active &= np.abs(gp).max(axis=1) > 0
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        p = np.einsum("nij,nj->ni", Hinv[idx], gp[idx])
+        p = np.where(free[idx], p, 0.0)
+        x_trial = np.clip(x[idx] + t[idx, None] * p, lower, upper)
+        f_trial, g_trial = fun(idx, x_trial)
+        g_trial = np.asarray(g_trial, dtype=float).reshape(idx.size, d)
+        niter[idx] += 1
+        s = x_trial - x[idx]
+        gain = f_trial - f[idx]
+        slope = np.einsum("ni,ni->n", g[idx], s)
+        accept = (gain >= 1e-4 * slope) & (gain >= 0)
+        # BFGS update of the inverse Hessian of -f for accepted steps
+        y = -(g_trial - g[idx])
+        sy = np.einsum("ni,ni->n", s, y)
+        update = accept & (sy > 1e-12 * np.linalg.norm(s, axis=1) ** 2)
+        for k in np.flatnonzero(update):
+            rho = 1.0 / sy[k]
+            V = np.eye(d) - rho * np.outer(s[k], y[k])
+            Hinv[idx[k]] = V @ Hinv[idx[k]] @ V.T + rho * np.outer(s[k], s[k])
+        small_f = np.abs(gain) <= ftol * np.maximum(
+            np.maximum(np.abs(f[idx]), np.abs(f_trial)), 1.0
+        )
+        small_x = np.abs(s).max(axis=1) <= xtol
+        acc = idx[accept]
+        x[acc] = x_trial[accept]
+        f[acc] = f_trial[accept]
+        g[acc] = g_trial[accept]
+        t[acc] = 1.0
+        # Backtrack to the maximum of the quadratic through f, slope and f_trial
+        curv = gain - slope
+        frac = np.where(curv < 0, -slope / (2 * np.minimum(curv, -1e-300)), 0.5)
+        rej = idx[~accept]
+        t[rej] *= np.clip(frac[~accept], 0.1, 0.5)
+        tiny = np.abs(t[idx, None] * p).max(axis=1) <= xtol
+        done = (accept & (small_f | small_x)) | (~accept & tiny)
+        active[idx[done]] = False
+    return x, niter
+
+
+def batched_root(
+    fun: RootFunc,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    f_lower: np.ndarray,
+    f_upper: np.ndarray,
+    xtol: float = 1e-6,
+    rtol: float = 1e-9,
+    maxiter: int = 100,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Find roots of n bracketed scalar functions in lock-step.
+
+    Uses the Illinois variant of regula falsi on every bracket, evaluating all
+    unconverged points together in one call to ``fun`` per iteration. The
+    brackets must contain a sign change. Returns the roots and the iteration
+    count per point.
+    """
+    a = np.array(lower, dtype=float)
+    b = np.array(upper, dtype=float)
+    fa = np.array(f_lower, dtype=float)
+    fb = np.array(f_upper, dtype=float)
+    n = a.size
+    x = np.where(np.abs(fa) < np.abs(fb), a, b)
+    niter = np.zeros(n, dtype=int)
+    active = (fa != 0) & (fb != 0)
+    x[fa == 0] = a[fa == 0]
+    x[fb == 0] = b[fb == 0]
+    side = np.zeros(n, dtype=int)
+    scale = np.maximum(np.abs(fa), np.abs(fb))
+    for _ in range(maxiter):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        c = (a[idx] * fb[idx] - b[idx] * fa[idx]) / (fb[idx] - fa[idx])
+        fc = fun(idx, c)
+        niter[idx] += 1
+        x[idx] = c
+        left = np.sign(fc) == np.sign(fa[idx])
+        # Replace the endpoint with the same sign, halve the stale one
+        il, ir = idx[left], idx[~left]
+        a[il], fa[il] = c[left], fc[left]
+        fb[il] *= np.where(side[il] == -1, 0.5, 1.0)
+        side[il] = -1
+        b[ir], fb[ir] = c[~left], fc[~left]
+        fa[ir] *= np.where(side[ir] == 1, 0.5, 1.0)
+        side[ir] = 1
+        done = (np.abs(fc) <= rtol * scale[idx]) | (np.abs(b[idx] - a[idx]) <= xtol)
+        active[idx[done]] = False
+    return x, niter
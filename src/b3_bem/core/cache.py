@@ -0,0 +1,196 @@
+# Rotor evaluation cache for b3_bem.
+
+import hashlib
+import itertools
+import pickle
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .disk_cache import DiskCache
+from .evaluator import rotor_evaluator
+
+_tokens = itertools.count()
+_rotor_tokens = weakref.WeakKeyDictionary()
+_fingerprints = weakref.WeakKeyDictionary()
+
+
+def rotor_token(rotor) -> int:
+    """Return a process-unique token identifying a rotor object."""
+    if rotor not in _rotor_tokens:
+        _rotor_tokens[rotor] = next(_tokens)
+    return _rotor_tokens[rotor]
+
+
+def rotor_fingerprint(rotor) -> str:
+    """Return a content hash of a rotor, equal for identically built rotors.
+
+    The hash covers everything the rotor holds: planform, interpolated polars
+    and the flow and geometry settings. It is computed once per rotor object.
+    """
+    try:
+        return _fingerprints[rotor]
+    except KeyError:
+        pass
+    except TypeError:
+        # Not weakly referenceable, hashed on every call
+        return hashlib.sha1(pickle.dumps(rotor)).hexdigest()
+    _fingerprints[rotor] = hashlib.sha1(pickle.dumps(rotor)).hexdigest()
+    return _fingerprints[rotor]
+
+
+def remember_fingerprint(rotor, fingerprint: str) -> None:
+    """Set the fingerprint of a rotor, for copies of a fingerprinted rotor."""
+    try:
+        _fingerprints[rotor] = fingerprint
+    except TypeError:
+        pass
+
+
+class EvaluationCache:
+    """Bounded LRU cache of rotor evaluations per operating point.
+
+    Entries are keyed on the rotor identity and the exact (Uinf, Omega, pitch)
+    so repeated points are never re-solved. Misses are always evaluated with
+    coefficients, and only the derivatives of power with respect to Omega and
+    pitch are kept. With a ``disk`` cache, misses are looked up there by
+    rotor fingerprint before solving, and solved entries are added to it.
+    """
+
+    def __init__(self, maxsize: int = 4096, disk: Optional[DiskCache] = None):
+        """Initialize an empty cache holding at most maxsize entries."""
+        self.maxsize = maxsize
+        self.disk = disk
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def _disk_keys(self, rotor, kind, points):
+        fingerprint = rotor_fingerprint(rotor)
+        return [(kind, fingerprint, *point) for point in points]
+
+    def _from_disk(self, rotor, kind, points):
+        """Return the disk entries of (Uinf, Omega, pitch, azimuth) points."""
+        if self.disk is None:
+            return [None] * len(points)
+        entries = self.disk.get_many(self._disk_keys(rotor, kind, points))
+        self.disk_hits += sum(e is not None for e in entries)
+        return entries
+
+    def _to_disk(self, rotor, kind, points, entries) -> None:
+        if self.disk is not None:
+            self.disk.put_many(zip(self._disk_keys(rotor, kind, points), entries))
+
+    def _get(self, key):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return None
+
+    def _put(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def evaluate(
+        self, rotor, Uinf, Omega, pitch, coefficients: bool = False
+    ) -> Tuple[Dict[str, np.ndarray], Optional[Dict[str, Any]]]:
+        """Return rotor.evaluate outputs and power derivatives, solving misses.
+
+        Outputs always include the coefficients, whatever ``coefficients``.
+        """
+        Uinf = np.atleast_1d(np.asarray(Uinf, dtype=float)).ravel()
+        Omega = np.atleast_1d(np.asarray(Omega, dtype=float)).ravel()
+        pitch = np.atleast_1d(np.asarray(pitch, dtype=float)).ravel()
+        token = rotor_token(rotor)
+        keys = [
+            ("evaluate", token, float(u), float(o), float(p))
+            for u, o, p in zip(Uinf, Omega, pitch)
+        ]
+        entries = [self._get(key) for key in keys]
+        missing = [i for i, e in enumerate(entries) if e is None]
+        if missing:
+            stored = self._from_disk(
+                rotor, "evaluate", [keys[i][2:] + (0.0,) for i in missing]
+            )
+            for i, entry in zip(missing, stored):
+                if entry is not None:
+                    entries[i] = entry
+                    self._put(keys[i], entry)
+            missing = [i for i in missing if entries[i] is None]
+        if missing:
+            outputs, derivs = rotor_evaluator(rotor).evaluate(
+                Uinf[missing], Omega[missing], pitch[missing], coefficients=True
+            )
+            dP = derivs.get("dP") if derivs else None
+            if dP is not None:
+                dP_dOmega = np.asarray(dP["dOmega"])
+                dP_dpitch = np.asarray(dP["dpitch"])
+                if dP_dOmega.ndim == 2:
+                    dP_dOmega, dP_dpitch = np.diag(dP_dOmega), np.diag(dP_dpitch)
+            for j, i in enumerate(missing):
+                entry = {k: v[j] for k, v in outputs.items()}
+                grad = None
+                if dP is not None:
+                    grad = (dP_dOmega.ravel()[j], dP_dpitch.ravel()[j])
+                entries[i] = (entry, grad)
+                self._put(keys[i], entries[i])
+            self._to_disk(
+                rotor,
+                "evaluate",
+                [keys[i][2:] + (0.0,) for i in missing],
+                [entries[i] for i in missing],
+            )
+        outputs = {k: np.array([e[0][k] for e in entries]) for k in entries[0][0]}
+        if any(e[1] is None for e in entries):
+            return outputs, None
+        derivs = {
+            "dP": {
+                "dOmega": np.array([e[1][0] for e in entries]),
+                "dpitch": np.array([e[1][1] for e in entries]),
+            }
+        }
+        return outputs, derivs
+
+    def loads(self, rotor, Uinf, Omega, pitch, azimuth=0.0) -> Dict[str, np.ndarray]:
+        """Return rotor.distributedAeroLoads at one operating point."""
+        key = (
+            "loads",
+            rotor_token(rotor),
+            float(Uinf),
+            float(Omega),
+            float(pitch),
+            float(azimuth),
+        )
+        loads = self._get(key)
+        if loads is None:
+            loads = self._from_disk(rotor, "loads", [key[2:]])[0]
+            if loads is None:
+                loads = rotor_evaluator(rotor).loads(Uinf, Omega, pitch, azimuth)[0]
+                self._to_disk(rotor, "loads", [key[2:]], [loads])
+            self._put(key, loads)
+        return loads
+
+    def record(self, hits: int, misses: int, disk_hits: int = 0) -> None:
+        """Add hit and miss counts gathered by another process."""
+        self.hits += hits
+        self.misses += misses
+        self.disk_hits += disk_hits
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current number of entries.
+
+        With a disk cache, disk_hits counts the misses found on disk.
+        """
+        stats = {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+        if self.disk is not None:
+            stats["disk_hits"] = self.disk_hits
+        return stats
@@ -0,0 +1,61 @@
+# Checkpoint stream of solved operating points for b3_bem.
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable
+
+import numpy as np
+
+
+class Checkpoint:
+    """Append-only JSONL file of result rows tagged with a key.
+
+    Every line holds ``{"key": ..., "row": [Uinf, zone, Omega, pitch, P, T,
+    CT, CP, Mb, niter]}``. The key identifies the rotor and settings the row
+    was solved for, so rows of other keys are ignored on load. Lines are
+    flushed as they are written, which lets external monitors follow a run,
+    and a line cut short by an interruption is skipped.
+    """
+
+    def __init__(self, path: Path, key: str):
+        """Initialize with the checkpoint file and the key of this run."""
+        self.path = Path(path)
+        self.key = key
+
+    def load(self) -> Dict[float, tuple]:
+        """Return the rows stored under this key by wind speed."""
+        rows = {}
+        if not self.path.exists():
+            return rows
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("key") == self.key:
+                    rows[float(entry["row"][0])] = tuple(entry["row"])
+        return rows
+
+    def append(self, rows: Iterable[tuple]) -> None:
+        """Append result rows and flush them to disk."""
+        lines = [
+            json.dumps(
+                {
+                    "key": self.key,
+                    "row": [v.item() if isinstance(v, np.generic) else v for v in row],
+                }
+            )
+            for row in rows
+        ]
+        if not lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a+b") as f:
+            # Start on a fresh line after a write cut short by an interruption
+            if f.tell() > 0:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(("\n".join(lines) + "\n").encode())
+            f.flush()
@@ -0,0 +1,194 @@
+# Persistent rotor evaluation cache for b3_bem.
+
+import atexit
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# (kind, rotor fingerprint, Uinf, Omega, pitch, azimuth)
+Key = Tuple[str, str, float, float, float, float]
+
+# The triggers keep the total entry size in ``stored``, so no process has to
+# sum it over the table
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT, rotor TEXT, uinf REAL, omega REAL, pitch REAL, azimuth REAL,
+    value BLOB, size INTEGER, accessed REAL,
+    PRIMARY KEY (kind, rotor, uinf, omega, pitch, azimuth)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS stored (bytes INTEGER);
+INSERT INTO stored SELECT COALESCE(SUM(size), 0) FROM entries
+    WHERE NOT EXISTS (SELECT 1 FROM stored);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries
+    BEGIN UPDATE stored SET bytes = bytes + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries
+    BEGIN UPDATE stored SET bytes = bytes - OLD.size; END;
+"""
+_KEY_MATCH = "kind=? AND rotor=? AND uinf=? AND omega=? AND pitch=? AND azimuth=?"
+# Pending access times written at once when no store comes first
+_MAX_PENDING = 1024
+
+
+class _Connection:
+    """Connection of this process to a cache file, and its pending access times."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.pid = os.getpid()
+        self.sqlite = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.sqlite.execute("PRAGMA journal_mode=WAL")
+        self.sqlite.execute("PRAGMA synchronous=NORMAL")
+        self.sqlite.executescript(f"BEGIN IMMEDIATE; {_SCHEMA} COMMIT;")
+        self.accessed: Dict[int, float] = {}  # Time of the last hit by rowid
+
+
+# Connections of this process by database file, shared by its DiskCaches
+_connections: Dict[Path, _Connection] = {}
+
+
+class DiskCache:
+    """SQLite store of rotor evaluations shared across runs and processes.
+
+    Entries are keyed on the rotor fingerprint and the exact operating point
+    and hold pickled values. When the stored values exceed ``max_bytes`` the
+    least recently used entries are evicted down to 80% of it. The cache
+    pickles as its path and size, and every process opens one connection
+    per file, shared by all its caches and kept across pool tasks. Access
+    times of hits are written along with the next stored values, so reads
+    never take the write lock.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 256 * 2**20):
+        """Initialize with the database file and the size limit in bytes."""
+        self.path = Path(path).absolute()
+        self.max_bytes = max_bytes
+
+    def __getstate__(self):
+        return {"path": self.path, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["max_bytes"])
+
+    @property
+    def _process_connection(self) -> _Connection:
+        connection = _connections.get(self.path)
+        if connection is None or connection.pid != os.getpid():
+            # Connections inherited from a forked parent are not reused
+            connection = _connections[self.path] = _Connection(self.path)
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._process_connection.sqlite
+
+    @contextmanager
+    def _transaction(self):
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _stored_bytes(self) -> int:
+        return self.connection.execute("SELECT bytes FROM stored").fetchone()[0]
+
+    def _write_accessed(self, connection: sqlite3.Connection) -> None:
+        """Write the pending access times inside a transaction."""
+        accessed = self._process_connection.accessed
+        if accessed:
+            connection.executemany(
+                "UPDATE entries SET accessed=? WHERE rowid=?",
+                [(now, rowid) for rowid, now in accessed.items()],
+            )
+            accessed.clear()
+
+    def get_many(self, keys: Iterable[Key]) -> List[Optional[Any]]:
+        """Return the stored value of every key, None where missing."""
+        values = []
+        accessed = self._process_connection.accessed
+        now = time.time()
+        for key in keys:
+            row = self.connection.execute(
+                f"SELECT rowid, value FROM entries WHERE {_KEY_MATCH}", key
+            ).fetchone()
+            values.append(None if row is None else pickle.loads(row[1]))
+            if row is not None:
+                accessed[row[0]] = now
+        if len(accessed) >= _MAX_PENDING:
+            with self._transaction() as connection:
+                self._write_accessed(connection)
+        return values
+
+    def put_many(self, items: Iterable[Tuple[Key, Any]]) -> None:
+        """Store values by key, evicting old entries beyond the size limit.
+
+        A key already stored keeps its value, evaluations are deterministic.
+        """
+        now = time.time()
+        rows = []
+        for key, value in items:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((*key, blob, len(blob), now))
+        if not rows:
+            return
+        with self._transaction() as connection:
+            self._write_accessed(connection)
+            connection.executemany(
+                "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            stored = self._stored_bytes()
+        if stored > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries down to 80% of the limit."""
+        with self._transaction() as connection:
+            self._write_accessed(connection)
+            excess = self._stored_bytes() - int(0.8 * self.max_bytes)
+            if excess <= 0:
+                return
+            freed, rowids = 0, []
+            cursor = connection.execute(
+                "SELECT rowid, size FROM entries ORDER BY accessed"
+            )
+            for rowid, size in cursor:
+                if freed >= excess:
+                    break
+                rowids.append((rowid,))
+                freed += size
+            cursor.close()
+            connection.executemany("DELETE FROM entries WHERE rowid=?", rowids)
+
+    def stats(self) -> dict:
+        """Return the number of entries and their stored bytes."""
+        count = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {"entries": count, "bytes": self._stored_bytes()}
+
+    def close(self) -> None:
+        """Write pending access times and close this process's connection.
+
+        It is reopened on next use.
+        """
+        connection = _connections.get(self.path)
+        if connection is None or connection.pid != os.getpid():
+            return
+        with self._transaction() as sqlite:
+            self._write_accessed(sqlite)
+        connection.sqlite.close()
+        del _connections[self.path]
+
+
+@atexit.register
+def _close_all() -> None:
+    """Write the pending access times of every connection of this process."""
+    for path in list(_connections):
+        DiskCache(path).close()
@@ -0,0 +1,142 @@
+# Rotor evaluation layer for b3_bem.
+
+import os
+import sys
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Descriptor of os.devnull, opened once per process
+_devnull = None
+# True once stdout and stderr of this process point to devnull for good
+_silenced = False
+_evaluators = weakref.WeakKeyDictionary()
+
+
+def _devnull_fd() -> int:
+    global _devnull
+    if _devnull is None:
+        _devnull = os.open(os.devnull, os.O_WRONLY)
+    return _devnull
+
+
+def silence_process() -> None:
+    """Point stdout and stderr of this process to devnull for good.
+
+    Meant for pool workers, whose output is never shown. Later quiet blocks
+    in the process cost nothing.
+    """
+    global _silenced
+    if _silenced:
+        return
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(_devnull_fd(), 1)
+    os.dup2(_devnull_fd(), 2)
+    _silenced = True
+
+
+@contextmanager
+def quiet():
+    """Silence stdout and stderr at the file descriptor level.
+
+    This also catches output written by compiled code. The descriptors are
+    swapped with dup2 onto the devnull descriptor kept open by the process,
+    so no file objects are created and sys.stdout is left alone.
+    """
+    if _silenced:
+        yield
+        return
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        saved = (os.dup(1), os.dup(2))
+    except OSError:
+        # No descriptors to silence
+        yield
+        return
+    os.dup2(_devnull_fd(), 1)
+    os.dup2(_devnull_fd(), 2)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, saved_fd in zip((1, 2), saved):
+            os.dup2(saved_fd, fd)
+            os.close(saved_fd)
+
+
+class RotorEvaluator:
+    """Silenced and instrumented access to a CCBlade rotor.
+
+    All rotor evaluations of the package go through an evaluator. Calls,
+    evaluated operating points and wall time are counted per method.
+    """
+
+    def __init__(self, rotor):
+        """Initialize with the rotor to evaluate."""
+        self.rotor = rotor
+        self.counters = {
+            name: {"calls": 0, "points": 0, "seconds": 0.0}
+            for name in ("evaluate", "loads")
+        }
+
+    def _count(self, name: str, points: int, start: float) -> None:
+        counter = self.counters[name]
+        counter["calls"] += 1
+        counter["points"] += points
+        counter["seconds"] += time.perf_counter() - start
+
+    def evaluate(
+        self, Uinf, Omega, pitch, coefficients: bool = False
+    ) -> Tuple[Dict[str, np.ndarray], Any]:
+        """Return rotor.evaluate outputs and derivatives at operating points."""
+        start = time.perf_counter()
+        with quiet():
+            outputs, derivs = self.rotor.evaluate(
+                Uinf, Omega, pitch, coefficients=coefficients
+            )
+        self._count("evaluate", np.size(Uinf), start)
+        return outputs, derivs
+
+    def loads(self, Uinf, Omega, pitch, azimuth=0.0) -> List[Dict[str, np.ndarray]]:
+        """Return rotor.distributedAeroLoads at every operating point."""
+        Uinf, Omega, pitch = np.broadcast_arrays(
+            np.atleast_1d(Uinf), np.atleast_1d(Omega), np.atleast_1d(pitch)
+        )
+        start = time.perf_counter()
+        with quiet():
+            loads = [
+                self.rotor.distributedAeroLoads(u, o, p, azimuth)[0]
+                for u, o, p in zip(Uinf.tolist(), Omega.tolist(), pitch.tolist())
+            ]
+        self._count("loads", len(loads), start)
+        return loads
+
+    def record(self, counters: Dict[str, Dict[str, float]]) -> None:
+        """Add counters gathered by another process."""
+        for name, counter in counters.items():
+            for key, value in counter.items():
+                self.counters[name][key] += value
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return a copy of the counters."""
+        return {name: dict(counter) for name, counter in self.counters.items()}
+
+    def stats_since(self, before: Dict[str, Dict[str, float]]):
+        """Return the counters accumulated since an earlier stats()."""
+        return {
+            name: {key: value - before[name][key] for key, value in counter.items()}
+            for name, counter in self.counters.items()
+        }
+
+
+def rotor_evaluator(rotor) -> RotorEvaluator:
+    """Return the evaluator of a rotor, one per rotor object and process."""
+    if rotor not in _evaluators:
+        _evaluators[rotor] = RotorEvaluator(rotor)
+    return _evaluators[rotor]
@@ -1,78 +1,202 @@
 # Fixed run handler for b3_bem.
+from pathlib import Path
 import numpy as np
+import pandas as pd
 from ccblade.ccblade import CCBlade
-import os
 import logging
-from contextlib import redirect_stdout, redirect_stderr
-from typing import List, Dict, Any
+from functools import partial
+from typing import List, Dict, Any, Iterator, Optional, Union
+
+from .cache import EvaluationCache
+from .evaluator import rotor_evaluator
+from .pool import RotorPool
+from .results import BladeLoads, OperatingPoints
 
 logger = logging.getLogger(__name__)
 
+# Columns of setpoint files, in the order of NPY columns
+SETPOINT_COLUMNS = ("wind_speed", "rpm", "pitch")
+
 
 class FixedRun:
     """Handle fixed setpoint operations for B3 BEM analysis."""
 
-    def __init__(self, rotor: CCBlade, operation: List[Dict[str, Any]], rtip: float):
-        """Initialize with rotor, operation points, and tip radius."""
+    def __init__(
+        self,
+        rotor: CCBlade,
+        operation: Union[List[Dict[str, Any]], Dict[str, np.ndarray]],
+        rtip: float,
+        chunk_size: int = 256,
+        cache: Optional[EvaluationCache] = None,
+    ):
+        """Initialize with rotor, operation points, and tip radius.
+
+        The operation points are a list of dicts or a dict of arrays with keys
+        uinf, omega and pitch. Rotor evaluations are batched over chunk_size
+        points, which bounds the memory of each call. With a ``cache``
+        evaluations and loads are looked up there before solving.
+        """
         self.rotor = rotor
-        self.operation = operation
+        if isinstance(operation, dict):
+            self.operation = {
+                k: np.asarray(operation[k], dtype=float)
+                for k in ("uinf", "omega", "pitch")
+            }
+        else:
+            self.operation = {
+                k: np.array([op[k] for op in operation], dtype=float)
+                for k in ("uinf", "omega", "pitch")
+            }
         self.rtip = rtip
+        self.chunk_size = chunk_size
+        self.cache = cache
 
-    def run(self) -> List[tuple]:
-        """Execute the fixed run and return results."""
-        results = []
-        for op in self.operation:
-            with (
-                redirect_stdout(open(os.devnull, "w")),
-                redirect_stderr(open(os.devnull, "w")),
-            ):
-                outputs, _ = self.rotor.evaluate(
-                    [op["uinf"]], [op["omega"]], [op["pitch"]], coefficients=True
-                )
-            P = outputs["P"][0]
-            T = outputs["T"][0]
-            CT = outputs["CT"][0]
-            CP = outputs["CP"][0]
-            Mb = outputs["Mb"][0]
-            results.append(
-                (op["uinf"], "fixed", op["omega"], op["pitch"], P, T, CT, CP, Mb, 1)
+    def _chunks(self, n: int):
+        for start in range(0, n, self.chunk_size):
+            yield slice(start, min(start + self.chunk_size, n))
+
+    def run(self) -> OperatingPoints:
+        """Execute the fixed run and return results as OperatingPoints."""
+        evaluator = rotor_evaluator(self.rotor)
+        uinf, omega, pitch = (self.operation[k] for k in ("uinf", "omega", "pitch"))
+        n = uinf.size
+        outputs = {key: np.empty(n) for key in ("P", "T", "CT", "CP", "Mb")}
+        evaluate = evaluator.evaluate
+        if self.cache is not None:
+            evaluate = partial(self.cache.evaluate, self.rotor)
+        for chunk in self._chunks(n):
+            chunk_outputs, _ = evaluate(
+                uinf[chunk], omega[chunk], pitch[chunk], coefficients=True
             )
-        logger.info(f"Fixed run completed with {len(results)} operating points")
-        return results
+            for key, values in outputs.items():
+                values[chunk] = chunk_outputs[key]
+        logger.info(f"Fixed run completed with {n} operating points")
+        return OperatingPoints(
+            uinf=uinf,
+            zone=np.full(n, "fixed"),
+            omega=omega,
+            pitch=pitch,
+            niter=np.ones(n, dtype=int),
+            rtip=self.rtip,
+            **outputs,
+        )
 
-    def compute_bladeloads(self, results: List[tuple]) -> Dict[str, Any]:
-        """Compute blade loads for fixed operation."""
+    def compute_bladeloads(self, results) -> BladeLoads:
+        """Compute the blade loads at the results as BladeLoads."""
+        evaluator = rotor_evaluator(self.rotor)
         loads_list = []
-        uinf_list = []
-        flapwise_moments = []
-        edgewise_moments = []
-        r = self.rotor.r
-        for uinf, _, omega, pitch, _, _, _, _, _, _ in results:
-            with (
-                redirect_stdout(open(os.devnull, "w")),
-                redirect_stderr(open(os.devnull, "w")),
-            ):
-                loads, _ = self.rotor.distributedAeroLoads(uinf, omega, pitch, 0)
-            loads_list.append(loads)
-            uinf_list.append(uinf)
-            # Compute moments
-            Np = loads["Np"]
-            Tp = loads["Tp"]
-            moment_flap = np.trapezoid(Np * r, r)
-            moment_edge = np.trapezoid(Tp * r, r)
-            flapwise_moments.append(moment_flap)
-            edgewise_moments.append(moment_edge)
-        combined_rms = np.sqrt(
-            np.array(flapwise_moments) ** 2 + np.array(edgewise_moments) ** 2
+        for chunk in self._chunks(len(results["uinf"])):
+            points = (results[k][chunk] for k in ("uinf", "omega", "pitch"))
+            if self.cache is None:
+                loads_list.extend(evaluator.loads(*points))
+            else:
+                loads_list.extend(
+                    self.cache.loads(self.rotor, *point) for point in zip(*points)
+                )
+        return BladeLoads.from_loads(self.rotor.r, results["uinf"], loads_list)
+
+
+def read_setpoints(path: Path, chunk_size: int) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield chunks of a setpoint file as dicts of uinf, omega and pitch arrays.
+
+    CSV and Parquet files need wind_speed, rpm and pitch columns, NPY files
+    hold an (n, 3) array with the same columns. Parquet needs the optional
+    pyarrow dependency, the ``parquet`` extra. The file is read chunk by
+    chunk (NPY through a memory map), never as a whole.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        table = np.load(path, mmap_mode="r")
+        for start in range(0, len(table), chunk_size):
+            block = np.array(table[start : start + chunk_size], dtype=float)
+            yield {"uinf": block[:, 0], "omega": block[:, 1], "pitch": block[:, 2]}
+        return
+    if suffix == ".csv":
+        frames = pd.read_csv(path, usecols=list(SETPOINT_COLUMNS), chunksize=chunk_size)
+    elif suffix in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                f"Reading {path} needs pyarrow, install it with "
+                "pip install 'b3_bem[parquet]'"
+            ) from e
+
+        frames = (
+            batch.to_pandas()
+            for batch in pq.ParquetFile(path).iter_batches(
+                batch_size=chunk_size, columns=list(SETPOINT_COLUMNS)
+            )
         )
-        blade_data = {
-            "r": r.tolist(),
-            "loads_list": [
-                {k: v.tolist() for k, v in load.items()} for load in loads_list
-            ],
-            "uinf_list": uinf_list,
-            "flapwise_moments": [float(m) for m in flapwise_moments],
-            "edgewise_moments": [float(m) for m in edgewise_moments],
-            "combined_rms": combined_rms.tolist(),
+    else:
+        raise ValueError(f"Unsupported setpoint file type: {path}")
+    for frame in frames:
+        yield {
+            "uinf": frame["wind_speed"].to_numpy(dtype=float),
+            "omega": frame["rpm"].to_numpy(dtype=float),
+            "pitch": frame["pitch"].to_numpy(dtype=float),
+        }
+
+
+def _fixed_chunk_task(rotor, task):
+    """Evaluate one chunk of setpoints on a pool worker holding the rotor."""
+    chunk, rtip, blade_loads = task
+    evaluator = rotor_evaluator(rotor)
+    before = evaluator.stats()
+    fixed_run = FixedRun(rotor, chunk, rtip, chunk_size=len(chunk["uinf"]))
+    results = fixed_run.run()
+    frame = pd.DataFrame(
+        {
+            "wind_speed": results.uinf,
+            "rpm": results.omega,
+            "pitch": results.pitch,
+            "P": results.P,
+            "T": results.T,
+            "CT": results.CT,
+            "CP": results.CP,
+            "Mb": results.Mb,
+            "tsr": results.tsr(),
+            "tip_speed": results.tip_speed(),
         }
-        return blade_data
+    )
+    if blade_loads:
+        loads = fixed_run.compute_bladeloads(results)
+        frame["flapwise_moment"] = loads.flapwise_moments
+        frame["edgewise_moment"] = loads.edgewise_moments
+    return frame, evaluator.stats_since(before)
+
+
+def stream_setpoints(
+    rotor: CCBlade,
+    path: Path,
+    output_path: Path,
+    rtip: float,
+    chunk_size: int = 4096,
+    blade_loads: bool = False,
+    pool: Optional[RotorPool] = None,
+) -> int:
+    """Evaluate a setpoint file chunk by chunk and append the results to a CSV.
+
+    Chunks are evaluated on the pool workers when a pool is given, with at
+    most two chunks per worker in flight, so memory stays bounded by the
+    chunk size whatever the file length. Returns the number of setpoints.
+    """
+    tasks = ((chunk, rtip, blade_loads) for chunk in read_setpoints(path, chunk_size))
+    if pool is None:
+        results = (_fixed_chunk_task(rotor, task) for task in tasks)
+    else:
+        results = pool.imap_bounded(_fixed_chunk_task, tasks, 2 * pool.processes)
+    evaluator = rotor_evaluator(rotor)
+    n = 0
+    for frame, counters in results:
+        frame.to_csv(
+            output_path, mode="w" if n == 0 else "a", header=n == 0, index=False
+        )
+        if pool is not None:
+            evaluator.record(counters)
+        n += len(frame)
+    if n == 0:
+        pd.DataFrame(columns=list(SETPOINT_COLUMNS)).to_csv(output_path, index=False)
+    logger.info(f"Streamed {n} setpoints from {path} to {output_path}")
+    return n
@@ -0,0 +1,22 @@
+# Sectional moment distributions for b3_bem.
+
+import numpy as np
+
+
+def sectional_moments(r: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Return the moment of a distributed load about every station.
+
+    For loads q of shape (..., len(r)) this is the trapezoid integral of
+    ``q * (r - r[i])`` from r[i] to the tip at every station i, computed with
+    two cumulative integrals from the tip instead of one integral per station.
+    """
+    r = np.asarray(r, dtype=float)
+    q = np.asarray(q, dtype=float)
+    dr = np.diff(r)
+
+    def tip_integral(f):
+        segments = 0.5 * (f[..., 1:] + f[..., :-1]) * dr
+        tail = np.cumsum(segments[..., ::-1], axis=-1)[..., ::-1]
+        return np.concatenate([tail, np.zeros(f.shape[:-1] + (1,))], axis=-1)
+
+    return tip_integral(q * r) - r * tip_integral(q)
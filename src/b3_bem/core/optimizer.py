@@ -1,18 +1,107 @@
 # Optimizer classes for b3_bem.
 
+import hashlib
+import warnings
+from dataclasses import replace
 from pathlib import Path
+from typing import Optional
 import numpy as np
 from scipy.optimize import minimize, brentq
-import multiprocessing as mp
 from ccblade.ccblade import CCBlade
-import os
 import logging
-from contextlib import redirect_stdout, redirect_stderr
 from rich.progress import Progress
 
+from .batched import batched_maximize, batched_root
+from .cache import EvaluationCache, rotor_fingerprint
+from .checkpoint import Checkpoint
+from .evaluator import rotor_evaluator
+from .options import SolverOptions
+from .pool import get_pool
+from .results import BladeLoads, OperatingPoints
+from .table import RPM, PerformanceTable
+
 
 logger = logging.getLogger(__name__)
 
+# Evaluation cache of pool worker processes, kept across tasks
+_worker_cache = EvaluationCache()
+
+
+def _scalar_derivative(d) -> np.ndarray:
+    """Return per-point values of a CCBlade scalar-input derivative.
+
+    Depending on the CCBlade version these come as a vector or as a diagonal
+    (npts, npts) matrix.
+    """
+    d = np.asarray(d)
+    return np.diag(d) if d.ndim == 2 else d.ravel()
+
+
+def _optimize_task(rotor, task):
+    """Process wind speeds on a pool worker holding the rotor."""
+    optimizer, uinf, guesses, disk = task
+    optimizer.rotor = rotor
+    optimizer.cache = _worker_cache
+    _worker_cache.disk = disk
+    counts = (_worker_cache.hits, _worker_cache.misses, _worker_cache.disk_hits)
+    evaluator = rotor_evaluator(rotor)
+    before = evaluator.stats()
+    if optimizer.options.continuation:
+        results = optimizer.sweep(uinf, guesses)
+    else:
+        results = optimizer.solve_in_order(uinf, guesses)
+    loads = None
+    if optimizer.options.fused_loads:
+        # Blade loads at the optima, on the worker that found them
+        loads = [_worker_cache.loads(rotor, r[0], r[2], r[3]) for r in results]
+    cache_counts = tuple(
+        now - then
+        for now, then in zip(
+            (_worker_cache.hits, _worker_cache.misses, _worker_cache.disk_hits), counts
+        )
+    )
+    return results, loads, cache_counts, evaluator.stats_since(before)
+
+
+def _loads_task(rotor, task):
+    """Compute blade loads at (Uinf, Omega, pitch) points on a pool worker.
+
+    With a disk cache the loads are looked up there before solving.
+    """
+    points, disk = task
+    evaluator = rotor_evaluator(rotor)
+    before = evaluator.stats()
+    if disk is None:
+        loads = evaluator.loads(*zip(*points))
+    else:
+        _worker_cache.disk = disk
+        loads = [_worker_cache.loads(rotor, *point) for point in points]
+    return loads, evaluator.stats_since(before)
+
+
+def _point_key(Uinf, Omega, pitch):
+    return float(Uinf), float(Omega), float(pitch)
+
+
+def _interpolate_controls(results: OperatingPoints, Uinf: float, zones=None):
+    """Return the (Omega, pitch) of results interpolated to a wind speed.
+
+    With ``zones`` only the results in those regimes are used, when there are
+    any, so guesses do not mix regimes. In the mid regime Omega is
+    interpolated as Omega / Uinf, constant at the optimal tip speed ratio.
+    """
+    keep = np.ones(results.uinf.size, dtype=bool)
+    if zones is not None and np.isin(results.zone, zones).any():
+        keep = np.isin(results.zone, zones)
+    uinf, omega, pitch = results.uinf[keep], results.omega[keep], results.pitch[keep]
+    order = np.argsort(uinf, kind="stable")
+    uinf, omega, pitch = uinf[order], omega[order], pitch[order]
+    if zones == ("mid",):
+        Omega = Uinf * np.interp(Uinf, uinf, omega / uinf)
+    else:
+        Omega = np.interp(Uinf, uinf, omega)
+    return float(Omega), float(np.interp(Uinf, uinf, pitch))
+
 
 class ControlOptimize:
     """Optimize rotor control settings using gradient-based approach with 4 regimes."""
@@ -25,50 +114,143 @@ class ControlOptimize:
         rating: float,
         uinf: np.ndarray,
         workdir: Path,
-        serial: bool = False,
+        serial: Optional[bool] = None,
+        options: Optional[SolverOptions] = None,
+        cache: Optional[EvaluationCache] = None,
+        checkpoint: Optional[Path] = None,
     ):
-        """Initialize control optimizer with rotor parameters."""
+        """Initialize control optimizer with rotor parameters.
+
+        ``options`` are the solver settings, see SolverOptions. ``serial`` is
+        deprecated, it overrides ``options.serial``. Rotor evaluations go
+        through ``cache``, a fresh EvaluationCache by default. With a
+        ``checkpoint`` file solved wind speeds are streamed to it and reused
+        when resuming, see optimize_points.
+        """
         self.rotor = rotor
         self.max_tipspeed = max_tipspeed
         self.rating = rating
         self.uinf = uinf
         self.rtip = rtip
         self.workdir = workdir
-        self.serial = serial
+        self.options = options if options is not None else SolverOptions()
+        if serial is not None:
+            warnings.warn(
+                "ControlOptimize(serial=...) is deprecated, "
+                "pass options=SolverOptions(serial=...)",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            self.options = replace(self.options, serial=bool(serial))
+        if self.options.analytic_gradients and not getattr(rotor, "derivatives", False):
+            logger.warning("Rotor built without derivatives, using finite differences")
+            self.options = replace(self.options, analytic_gradients=False)
+        self.cache = cache if cache is not None else EvaluationCache()
+        self.table = None
+        self.point_loads = {}  # Blade loads per (Uinf, Omega, pitch)
+        self.checkpoint = None
+        if checkpoint is not None:
+            key = hashlib.sha1(
+                repr(
+                    (
+                        rotor_fingerprint(rotor),
+                        max_tipspeed,
+                        rtip,
+                        rating,
+                        self.options.key(),
+                    )
+                ).encode()
+            ).hexdigest()
+            self.checkpoint = Checkpoint(checkpoint, key)
         self.omega_min = 2  # RPM, adjust as needed
         self.omega_max = self.max_tipspeed * 60 / (2 * np.pi * self.rtip)  # RPM
         self.pitch_min = -1.5
         self.pitch_max = 80
+        self.ref_uinf = 6.0  # Wind speed of Omega_opt, which scales with it
         self.Omega_opt = 5.0  # Initial guess
         self.pitch_opt = 0.0  # Initial guess
         self.Uinf_low = None
         self.Uinf_high = None
         self.Uinf_switch = None
+        self.pitch_high = None  # Last rated-power pitch, starts the next search
 
-    def optimize_low(self, Uinf):
-        """Optimize for low wind speeds: fixed omega_min, optimize pitch."""
-        Omega = self.omega_min
-        initial_guess_pitch = [self.pitch_opt]
+    @property
+    def serial(self) -> bool:
+        """Whether wind speeds are solved in this process, see SolverOptions."""
+        return self.options.serial
+
+    def __getstate__(self):
+        """Pickle without rotor, cache and table, pool workers need only the rotor."""
+        state = self.__dict__.copy()
+        state["rotor"] = None
+        state["cache"] = None
+        state["table"] = None
+        state["point_loads"] = {}
+        state["checkpoint"] = None
+        return state
+
+    def _evaluate(self, Uinf, Omega, pitch, coefficients=False):
+        """Evaluate the rotor at one or many operating points through the cache."""
+        return self.cache.evaluate(self.rotor, Uinf, Omega, pitch, coefficients)
+
+    def _power(self, Uinf, Omega, pitch):
+        """Return power and its derivatives with respect to Omega and pitch."""
+        outputs, derivs = self._evaluate([Uinf], [Omega], [pitch])
+        dP = derivs["dP"]
+        return (
+            outputs["P"][0],
+            _scalar_derivative(dP["dOmega"])[0],
+            _scalar_derivative(dP["dpitch"])[0],
+        )
+
+    def _pitch_objective(self, Uinf, Omega):
+        """Return negative power over pitch at fixed Omega, and its jac flag."""
+        if self.options.analytic_gradients:
+
+            def obj(x):
+                P, _, dP_dpitch = self._power(Uinf, Omega, x[0])
+                return -P, np.array([-dP_dpitch])
+
+            return obj, True
 
         def obj(pitch):
-            with (
-                redirect_stdout(open(os.devnull, "w")),
-                redirect_stderr(open(os.devnull, "w")),
-            ):
-                outputs, _ = self.rotor.evaluate([Uinf], [Omega], [pitch])
+            outputs, _ = self._evaluate([Uinf], [Omega], [pitch])
             return -outputs["P"][0]
 
+        return obj, None
+
+    def _mid_objective(self, Uinf):
+        """Return negative power over (Omega, pitch), and its jac flag."""
+        if self.options.analytic_gradients:
+
+            def obj(x):
+                P, dP_dOmega, dP_dpitch = self._power(Uinf, x[0], x[1])
+                return -P, np.array([-dP_dOmega, -dP_dpitch])
+
+            return obj, True
+
+        def obj(x):
+            Omega, pitch = x
+            outputs, _ = self._evaluate([Uinf], [Omega], [pitch])
+            return -outputs["P"][0]
+
+        return obj, None
+
+    def optimize_low(self, Uinf, pitch0=None, maxiter=None):
+        """Optimize for low wind speeds: fixed omega_min, optimize pitch."""
+        Omega = self.omega_min
+        initial_guess_pitch = [self.pitch_opt if pitch0 is None else pitch0]
+        obj, jac = self._pitch_objective(Uinf, Omega)
         res = minimize(
-            obj, initial_guess_pitch, bounds=[(self.pitch_min, self.pitch_max)]
+            obj,
+            initial_guess_pitch,
+            jac=jac,
+            tol=self.options.tol,
+            bounds=[(self.pitch_min, self.pitch_max)],
+            options={} if maxiter is None else {"maxiter": maxiter},
         )
         pitch_opt_res = res.x[0]
-        with (
-            redirect_stdout(open(os.devnull, "w")),
-            redirect_stderr(open(os.devnull, "w")),
-        ):
-            outputs, _ = self.rotor.evaluate(
-                [Uinf], [Omega], [pitch_opt_res], coefficients=True
-            )
+        outputs, _ = self._evaluate([Uinf], [Omega], [pitch_opt_res], coefficients=True)
         P = outputs["P"][0]
         T = outputs["T"][0]
         CT = outputs["CT"][0]
@@ -76,33 +258,23 @@ class ControlOptimize:
         Mb = outputs["Mb"][0]
         return Omega, pitch_opt_res, P, T, CT, CP, Mb, res.nfev
 
-    def optimize_mid(self, Uinf):
+    def optimize_mid(self, Uinf, x0=None, maxiter=None):
         """Optimize for mid wind speeds: optimize omega and pitch."""
-        Omega_est = self.Omega_opt * (Uinf / 6.0)
-        initial_guess = [Omega_est, self.pitch_opt]
-
-        def obj(x):
-            Omega, pitch = x
-            with (
-                redirect_stdout(open(os.devnull, "w")),
-                redirect_stderr(open(os.devnull, "w")),
-            ):
-                outputs, _ = self.rotor.evaluate([Uinf], [Omega], [pitch])
-            return -outputs["P"][0]
-
+        Omega_est = self.Omega_opt * (Uinf / self.ref_uinf)
+        initial_guess = [Omega_est, self.pitch_opt] if x0 is None else list(x0)
+        obj, jac = self._mid_objective(Uinf)
         res = minimize(
             obj,
             initial_guess,
+            jac=jac,
+            tol=self.options.tol,
             bounds=[(self.omega_min, self.omega_max), (self.pitch_min, self.pitch_max)],
+            options={} if maxiter is None else {"maxiter": maxiter},
         )
         Omega_opt_res, pitch_opt_res = res.x
-        with (
-            redirect_stdout(open(os.devnull, "w")),
-            redirect_stderr(open(os.devnull, "w")),
-        ):
-            outputs, _ = self.rotor.evaluate(
-                [Uinf], [Omega_opt_res], [pitch_opt_res], coefficients=True
-            )
+        outputs, _ = self._evaluate(
+            [Uinf], [Omega_opt_res], [pitch_opt_res], coefficients=True
+        )
         P = outputs["P"][0]
         T = outputs["T"][0]
         CT = outputs["CT"][0]
@@ -110,30 +282,58 @@ class ControlOptimize:
         Mb = outputs["Mb"][0]
         return Omega_opt_res, pitch_opt_res, P, T, CT, CP, Mb, res.nfev
 
-    def optimize_upper(self, Uinf):
-        """Optimize for upper wind speeds: fixed omega_max, optimize pitch."""
-        Omega = self.omega_max
-        initial_guess_pitch = [self.pitch_opt]
+    def similar_mid(self, Uinf):
+        """Return the similarity solution at mid wind speeds and its acceptance.
 
-        def obj(pitch):
-            with (
-                redirect_stdout(open(os.devnull, "w")),
-                redirect_stderr(open(os.devnull, "w")),
-            ):
-                outputs, _ = self.rotor.evaluate([Uinf], [Omega], [pitch])
-            return -outputs["P"][0]
+        The optimum tip speed ratio and pitch found at the reference wind speed
+        ``ref_uinf`` give Omega scaling linearly with Uinf at constant pitch. A
+        point is accepted when the power sensitivity there, ``max(|Omega
+        dP/dOmega|, |dP/dpitch|) / P`` with pitch in degrees, is within the
+        similarity tolerance. Returns
+        Omega, pitch, the acceptance per point and the evaluations per point.
+        """
+        Uinf = np.atleast_1d(np.asarray(Uinf, dtype=float))
+        Omega = np.clip(
+            self.Omega_opt * (Uinf / self.ref_uinf), self.omega_min, self.omega_max
+        )
+        pitch = np.full(Uinf.size, float(self.pitch_opt))
+        P, grad = self._batched_power(Uinf, Omega, pitch, ("Omega", "pitch"))
+        sensitivity = np.maximum(np.abs(Omega * grad[:, 0]), np.abs(grad[:, 1]))
+        accepted = sensitivity <= self.options.similarity * np.abs(P)
+        return Omega, pitch, accepted, 1 if self.options.analytic_gradients else 3
+
+    def optimize_similar(self, Uinf):
+        """Optimize for mid wind speeds from the similarity solution.
 
+        The optimization only runs where similar_mid rejects the solution.
+        """
+        Omega, pitch, accepted, nfev = self.similar_mid(Uinf)
+        if not accepted[0]:
+            result = self.optimize_mid(Uinf, (Omega[0], pitch[0]))
+            return result[:-1] + (result[-1] + nfev,)
+        outputs, _ = self._evaluate(Uinf, Omega, pitch, coefficients=True)
+        P = outputs["P"][0]
+        T = outputs["T"][0]
+        CT = outputs["CT"][0]
+        CP = outputs["CP"][0]
+        Mb = outputs["Mb"][0]
+        return Omega[0], pitch[0], P, T, CT, CP, Mb, nfev
+
+    def optimize_upper(self, Uinf, pitch0=None, maxiter=None):
+        """Optimize for upper wind speeds: fixed omega_max, optimize pitch."""
+        Omega = self.omega_max
+        initial_guess_pitch = [self.pitch_opt if pitch0 is None else pitch0]
+        obj, jac = self._pitch_objective(Uinf, Omega)
         res = minimize(
-            obj, initial_guess_pitch, bounds=[(self.pitch_min, self.pitch_max)]
+            obj,
+            initial_guess_pitch,
+            jac=jac,
+            tol=self.options.tol,
+            bounds=[(self.pitch_min, self.pitch_max)],
+            options={} if maxiter is None else {"maxiter": maxiter},
         )
         pitch_opt_res = res.x[0]
-        with (
-            redirect_stdout(open(os.devnull, "w")),
-            redirect_stderr(open(os.devnull, "w")),
-        ):
-            outputs, _ = self.rotor.evaluate(
-                [Uinf], [Omega], [pitch_opt_res], coefficients=True
-            )
+        outputs, _ = self._evaluate([Uinf], [Omega], [pitch_opt_res], coefficients=True)
         P = outputs["P"][0]
         T = outputs["T"][0]
         CT = outputs["CT"][0]
@@ -141,46 +341,131 @@ class ControlOptimize:
         Mb = outputs["Mb"][0]
         return Omega, pitch_opt_res, P, T, CT, CP, Mb, res.nfev
 
-    def optimize_high(self, Uinf):
-        """Optimize for high wind speeds: fixed omega_max, find pitch for rated power."""
-        Omega = self.omega_max
-        initial_guess_pitch = [self.pitch_opt]
+    def _rated_pitch(self, Uinf, Omega, pitch0, ftol=None, xtol=None):
+        """Find the pitch giving rated power with a safeguarded Newton/secant.
+
+        A bracket with P >= rating below and P < rating above is grown from
+        pitch0 along the falling side of the power curve, then refined with
+        Newton steps on dP/dpitch (secant steps without analytic gradients),
+        falling back to bisection when a step leaves the bracket or stalls.
+        Returns the pitch and the number of evaluations; the pitch is None if
+        the search finds no pitch reaching rating. The tolerances on power,
+        relative to rating, and on pitch default to 1e-9 and 1e-8, or to the
+        optimizer's ``tol``.
+        """
+        tol = self.options.tol
+        if ftol is None:
+            ftol = 1e-9 if tol is None else tol
+        if xtol is None:
+            xtol = 1e-8 if tol is None else tol
+        nfev = 0
 
         def func(pitch):
-            with (
-                redirect_stdout(open(os.devnull, "w")),
-                redirect_stderr(open(os.devnull, "w")),
+            nonlocal nfev
+            nfev += 1
+            if self.options.analytic_gradients:
+                P, _, dP_dpitch = self._power(Uinf, Omega, pitch)
+                return P - self.rating, dP_dpitch
+            outputs, _ = self._evaluate([Uinf], [Omega], [pitch])
+            return outputs["P"][0] - self.rating, None
+
+        def slope(x, fx, gx, xp, fp):
+            if gx is not None:
+                return gx
+            if xp is None or x == xp:
+                return None
+            return (fx - fp) / (x - xp)
+
+        x = float(np.clip(pitch0, self.pitch_min, self.pitch_max))
+        fx, gx = func(x)
+        xp = fp = None
+        if abs(fx) <= ftol * self.rating:
+            return x, nfev
+        # Grow the bracket from the starting point
+        a, b = (x, None) if fx >= 0 else (None, x)
+        step = 1.0
+        while a is None or b is None:
+            direction = 1.0 if b is None else -1.0
+            limit = self.pitch_max if b is None else self.pitch_min
+            if x == limit:
+                # Rating exceeded even fully pitched, or not reached at pitch_min
+                return (x if b is None else None), nfev
+            m = slope(x, fx, gx, xp, fp)
+            if b is not None and m is not None and m > 0:
+                # Rising side of the power curve, rating is beyond its maximum
+                return None, nfev
+            dx = step
+            if m is not None and m < 0 and direction * (-fx / m) > 0:
+                # Newton/secant step, overshooting slightly to close the bracket
+                dx = min(1.1 * abs(fx / m), 4 * step)
+            x_new = float(np.clip(x + direction * dx, self.pitch_min, self.pitch_max))
+            step *= 2.0
+            xp, fp = x, fx
+            x = x_new
+            fx, gx = func(x)
+            if abs(fx) <= ftol * self.rating:
+                return x, nfev
+            if fx >= 0:
+                a = x
+            else:
+                b = x
+        # Safeguarded Newton/secant inside the bracket, bisecting when a step
+        # leaves it or is not less than half the step before last
+        dx_old = dx = 2 * (b - a)
+        while b - a > xtol:
+            m = slope(x, fx, gx, xp, fp)
+            newton = x - fx / m if m is not None and m != 0 else None
+            if (
+                newton is not None
+                and a < newton < b
+                and abs(newton - x) < 0.5 * abs(dx_old)
             ):
-                outputs, _ = self.rotor.evaluate([Uinf], [Omega], [pitch])
-            return outputs["P"][0] - self.rating
+                x_new = newton
+            else:
+                x_new = 0.5 * (a + b)
+            dx_old, dx = dx, x_new - x
+            xp, fp = x, fx
+            x = x_new
+            fx, gx = func(x)
+            if abs(fx) <= ftol * self.rating or abs(dx) <= xtol:
+                break
+            if fx >= 0:
+                a = x
+            else:
+                b = x
+        return x, nfev
 
-        try:
-            pitch_opt_res, r = brentq(
-                func, self.pitch_min, self.pitch_max, full_output=True
-            )
-            niter = r.iterations
-        except ValueError:
-            # If rating not reached, maximize P instead
-            def obj(pitch):
-                with (
-                    redirect_stdout(open(os.devnull, "w")),
-                    redirect_stderr(open(os.devnull, "w")),
-                ):
-                    outputs, _ = self.rotor.evaluate([Uinf], [Omega], [pitch])
-                return -outputs["P"][0]
+    def optimize_high(self, Uinf, pitch0=None):
+        """Optimize for high wind speeds: fixed omega_max, find pitch for rated power.
 
+        The rated-power pitch search starts from pitch0, by default the pitch
+        of the previous high wind speed solved by this optimizer. That pitch is
+        kept in pitch_high, also when rated power is not reachable.
+        """
+        Omega = self.omega_max
+        if pitch0 is None:
+            pitch0 = self.pitch_high if self.pitch_high is not None else self.pitch_opt
+        pitch_opt_res, niter = self._rated_pitch(Uinf, Omega, pitch0)
+        if pitch_opt_res is None:
+            # Rating not reached from the bracket search, maximize P instead
+            obj, jac = self._pitch_objective(Uinf, Omega)
             res = minimize(
-                obj, initial_guess_pitch, bounds=[(self.pitch_min, self.pitch_max)]
+                obj,
+                [pitch0],
+                jac=jac,
+                tol=self.options.tol,
+                bounds=[(self.pitch_min, self.pitch_max)],
             )
             pitch_opt_res = res.x[0]
-            niter = res.nfev
-        with (
-            redirect_stdout(open(os.devnull, "w")),
-            redirect_stderr(open(os.devnull, "w")),
-        ):
-            outputs, _ = self.rotor.evaluate(
-                [Uinf], [Omega], [pitch_opt_res], coefficients=True
-            )
+            niter += res.nfev
+            if -res.fun > self.rating:
+                # Rating reachable past the power maximum after all
+                pitch_opt_res, nfev = self._rated_pitch(Uinf, Omega, pitch_opt_res)
+                niter += nfev
+            else:
+                logger.info(f"Rated power not reachable at {Uinf} m/s")
+        self.pitch_high = pitch_opt_res
+        outputs, _ = self._evaluate([Uinf], [Omega], [pitch_opt_res], coefficients=True)
         P = outputs["P"][0]
         T = outputs["T"][0]
         CT = outputs["CT"][0]
@@ -188,26 +473,36 @@ class ControlOptimize:
         Mb = outputs["Mb"][0]
         return Omega, pitch_opt_res, P, T, CT, CP, Mb, niter
 
-    def initialize_optimal(self):
-        """Compute optimal at reference wind speed (6 m/s) to get initial estimates."""
+    def initialize_optimal(self, warm_start=None):
+        """Compute optimal at reference wind speed (6 m/s) to get initial estimates.
+
+        The wind speed of ``uinf`` closest to 6 m/s is used as ``ref_uinf``.
+
+        With ``warm_start`` results the reference optimization starts from
+        their (Omega, pitch) at the reference wind speed, for at most
+        ``polish_iter`` iterations when that is set.
+        """
         ref_uinf = 6.0
         if ref_uinf not in self.uinf:
             # Find closest
-            ref_uinf = self.uinf[np.argmin(np.abs(self.uinf - ref_uinf))]
-        self.Omega_opt, self.pitch_opt, _, _, _, _, _, _ = self.optimize_mid(ref_uinf)
+            ref_uinf = float(self.uinf[np.argmin(np.abs(self.uinf - ref_uinf))])
+        self.ref_uinf = ref_uinf
+        x0, maxiter = None, None
+        if warm_start is not None:
+            x0 = _interpolate_controls(warm_start, ref_uinf, ("mid",))
+            maxiter = self.options.polish_iter
+        self.Omega_opt, self.pitch_opt, _, _, _, _, _, _ = self.optimize_mid(
+            ref_uinf, x0, maxiter
+        )
         tsr_opt = self.Omega_opt * self.rtip / ref_uinf
         self.Uinf_low = self.omega_min * self.rtip / tsr_opt
         self.Uinf_high = self.omega_max * self.rtip / tsr_opt
 
         # Find Uinf_switch
         def P_at_max_omega_pitch0(Uinf):
-            with (
-                redirect_stdout(open(os.devnull, "w")),
-                redirect_stderr(open(os.devnull, "w")),
-            ):
-                outputs, _ = self.rotor.evaluate(
-                    [Uinf], [self.omega_max], [0], coefficients=True
-                )
+            outputs, _ = self._evaluate(
+                [Uinf], [self.omega_max], [0], coefficients=True
+            )
             return outputs["P"][0] - self.rating
 
         try:
@@ -217,81 +512,657 @@ class ControlOptimize:
         except ValueError:
             self.Uinf_switch = max(self.uinf)
 
-    def process_Uinf(self, Uinf):
-        """Process a single wind speed, assign zone and optimize."""
+    def initialize_table(self):
+        """Set the initial estimates and regime boundaries from a CP table.
+
+        The table is loaded from ``performance_table.npz`` next to the results
+        when it was computed for the same rotor and grid, otherwise it is
+        evaluated over the ``tsr`` and ``pitch`` grids ([min, max, n]) of the
+        lookup_table options and saved there.
+        """
+        options = self.options.lookup_table
+        uinf = np.asarray(self.uinf, dtype=float)
+        omega_min_rad = self.omega_min * RPM * self.rtip
+        tsr_grid = options.get(
+            "tsr",
+            [
+                max(1.0, omega_min_rad / uinf.max()),
+                max(omega_min_rad / uinf.min(), 15.0),
+                30,
+            ],
+        )
+        pitch_grid = options.get("pitch", [self.pitch_min, 40.0, 40])
+        tsr = np.linspace(*tsr_grid[:2], int(tsr_grid[2]))
+        pitch = np.linspace(*pitch_grid[:2], int(pitch_grid[2]))
+        path = self.workdir.parent / "performance_table.npz"
+        fingerprint = rotor_fingerprint(self.rotor)
+        self.table = None
+        if path.exists():
+            table = PerformanceTable.load(path)
+            if (
+                table.fingerprint == fingerprint
+                and np.array_equal(table.tsr, tsr)
+                and np.array_equal(table.pitch, pitch)
+            ):
+                logger.info(f"Reusing performance table {path}")
+                self.table = table
+        if self.table is None:
+            self.table = PerformanceTable.compute(
+                self._evaluate, self.rtip, tsr, pitch, fingerprint=fingerprint
+            )
+            self.table.save(path)
+        tsr_opt, self.pitch_opt = self.table.optimum()
+        self.ref_uinf = 6.0
+        self.Omega_opt = tsr_opt * self.ref_uinf / self.rtip / RPM
+        tsr_opt = self.Omega_opt * self.rtip / self.ref_uinf
+        self.Uinf_low = self.omega_min * self.rtip / tsr_opt
+        self.Uinf_high = self.omega_max * self.rtip / tsr_opt
+
+        def P_at_max_omega_pitch0(Uinf):
+            return self.table.power(Uinf, self.omega_max, 0.0) - self.rating
+
+        try:
+            self.Uinf_switch = brentq(P_at_max_omega_pitch0, self.Uinf_high, uinf.max())
+        except ValueError:
+            self.Uinf_switch = uinf.max()
+
+    def table_guesses(self, uinf):
+        """Return zones and (Omega, pitch) guesses interpolated from the CP table."""
+        uinf = np.asarray(uinf, dtype=float)
+        zone = np.full(uinf.size, "mid", dtype=object)
+        zone[uinf < self.Uinf_low] = "low"
+        above = uinf > self.Uinf_high
+        P0 = self.table.power(uinf[above], self.omega_max, 0.0)
+        zone[above] = np.where(P0 > self.rating, "high", "upper")
+        Omega = np.clip(
+            self.Omega_opt * uinf / self.ref_uinf, self.omega_min, self.omega_max
+        )
+        pitch = np.full(uinf.size, float(self.pitch_opt))
+        low = zone == "low"
+        pitch[low] = self.table.pitch_for(uinf[low], self.omega_min)
+        pitch[above] = self.table.pitch_for(
+            uinf[above], self.omega_max, rating=self.rating
+        )
+        return zone, list(zip(Omega, pitch))
+
+    def table_results(self, uinf, zone, guesses):
+        """Return results at the table guesses, from one vectorized evaluation."""
+        Omega, pitch = (np.array(v) for v in zip(*guesses))
+        outputs, _ = self._evaluate(uinf, Omega, pitch, coefficients=True)
+        return [
+            (
+                uinf[i],
+                zone[i],
+                Omega[i],
+                pitch[i],
+                outputs["P"][i],
+                outputs["T"][i],
+                outputs["CT"][i],
+                outputs["CP"][i],
+                outputs["Mb"][i],
+                1,
+            )
+            for i in range(len(uinf))
+        ]
+
+    def _zones(self, Uinf):
+        """Return the regimes a wind speed may fall in, from the boundaries."""
+        if Uinf < self.Uinf_low:
+            return ("low",)
+        if Uinf <= self.Uinf_high:
+            return ("mid",)
+        return ("upper", "high")
+
+    def process_Uinf(self, Uinf, guess=None):
+        """Process a single wind speed, assign zone and optimize.
+
+        An optional (Omega, pitch) guess warm-starts the optimization, which
+        then runs at most ``polish_iter`` iterations when that is set.
+        """
+        pitch0 = None if guess is None else guess[1]
+        maxiter = None if guess is None else self.options.polish_iter
         if Uinf < self.Uinf_low:
             zone = "low"
-            Omega, pitch, P, T, CT, CP, Mb, niter = self.optimize_low(Uinf)
+            Omega, pitch, P, T, CT, CP, Mb, niter = self.optimize_low(
+                Uinf, pitch0, maxiter
+            )
         elif Uinf <= self.Uinf_high:
             zone = "mid"
-            Omega, pitch, P, T, CT, CP, Mb, niter = self.optimize_mid(Uinf)
+            if self.options.similarity is not None:
+                Omega, pitch, P, T, CT, CP, Mb, niter = self.optimize_similar(Uinf)
+            else:
+                Omega, pitch, P, T, CT, CP, Mb, niter = self.optimize_mid(
+                    Uinf, guess, maxiter
+                )
         else:
             # Check if P at omega_max with pitch=0 > rating
-            with (
-                redirect_stdout(open(os.devnull, "w")),
-                redirect_stderr(open(os.devnull, "w")),
-            ):
-                outputs, _ = self.rotor.evaluate(
-                    [Uinf], [self.omega_max], [0], coefficients=True
-                )
+            outputs, _ = self._evaluate(
+                [Uinf], [self.omega_max], [0], coefficients=True
+            )
             if outputs["P"][0] > self.rating:
                 zone = "high"
-                Omega, pitch, P, T, CT, CP, Mb, niter = self.optimize_high(Uinf)
+                Omega, pitch, P, T, CT, CP, Mb, niter = self.optimize_high(Uinf, pitch0)
             else:
                 zone = "upper"
-                Omega, pitch, P, T, CT, CP, Mb, niter = self.optimize_upper(Uinf)
+                Omega, pitch, P, T, CT, CP, Mb, niter = self.optimize_upper(
+                    Uinf, pitch0, maxiter
+                )
         return Uinf, zone, Omega, pitch, P, T, CT, CP, Mb, niter
 
-    def optimize_all(self):
-        """Run optimization for all wind speeds using multiprocessing or serial."""
-        self.initialize_optimal()
-        if self.serial:
-            results = [self.process_Uinf(u) for u in self.uinf]
-        else:
-            with Progress() as progress:
-                task = progress.add_task(
-                    "Optimizing operating points...", total=len(self.uinf)
+    def _batched_power(self, Uinf, Omega, pitch, free):
+        """Return power and its gradient over the free variables at many points.
+
+        Without analytic gradients the forward-difference points are stacked
+        into the same rotor evaluation.
+        """
+        if self.options.analytic_gradients:
+            outputs, derivs = self._evaluate(Uinf, Omega, pitch)
+            dP = derivs["dP"]
+            grads = {
+                "Omega": _scalar_derivative(dP["dOmega"]),
+                "pitch": _scalar_derivative(dP["dpitch"]),
+            }
+            return outputs["P"], np.column_stack([grads[v] for v in free])
+        x = {"Omega": Omega, "pitch": pitch}
+        upper = {"Omega": self.omega_max, "pitch": self.pitch_max}
+        steps = []
+        Omegas, pitches = [Omega], [pitch]
+        for v in free:
+            h = np.sqrt(np.finfo(float).eps) * np.maximum(1.0, np.abs(x[v]))
+            h = np.where(x[v] + h > upper[v], -h, h)
+            steps.append(h)
+            Omegas.append(Omega + h if v == "Omega" else Omega)
+            pitches.append(pitch + h if v == "pitch" else pitch)
+        outputs, _ = self._evaluate(
+            np.tile(Uinf, len(free) + 1),
+            np.concatenate(Omegas),
+            np.concatenate(pitches),
+        )
+        P = np.asarray(outputs["P"]).reshape(len(free) + 1, len(Uinf))
+        grad = (P[1:] - P[0]) / np.array(steps)
+        return P[0], grad.T
+
+    def _batched_optimize(self, Uinf, Omega, pitch, free, maxiter=None):
+        """Maximize power over the free variables for many wind speeds."""
+        Omega, pitch = Omega.astype(float), pitch.astype(float)
+        bounds = {
+            "Omega": (self.omega_min, self.omega_max),
+            "pitch": (self.pitch_min, self.pitch_max),
+        }
+        lower = np.array([bounds[v][0] for v in free])
+        upper = np.array([bounds[v][1] for v in free])
+
+        def fun(idx, x):
+            Om, th = Omega[idx].copy(), pitch[idx].copy()
+            for j, v in enumerate(free):
+                if v == "Omega":
+                    Om = x[:, j]
+                else:
+                    th = x[:, j]
+            return self._batched_power(Uinf[idx], Om, th, free)
+
+        x0 = np.column_stack([Omega if v == "Omega" else pitch for v in free])
+        tol = self.options.tol
+        tolerances = {} if tol is None else {"ftol": tol, "xtol": tol}
+        if maxiter is not None:
+            tolerances["maxiter"] = maxiter
+        x, nfev = batched_maximize(fun, x0, lower, upper, **tolerances)
+        for j, v in enumerate(free):
+            if v == "Omega":
+                Omega = x[:, j]
+            else:
+                pitch = x[:, j]
+        if not self.options.analytic_gradients:
+            nfev = nfev * (len(free) + 1)
+        return Omega, pitch, nfev
+
+    def _batched_rated_pitch(self, Uinf, pitch0=None):
+        """Find the pitch giving rated power at omega_max for many wind speeds.
+
+        As in _rated_pitch a bracket on the falling side of the power curve is
+        grown from pitch0, where finite, or from the previous rated pitch or
+        pitch_opt, with secant (or Newton) steps: toward feather while power
+        exceeds rating, toward pitch_min while it is below. Only points where
+        that fails start over from their pitch of maximum power, found with
+        the batched maximizer. Where the maximum power is below rating its
+        pitch is kept, and where rating is exceeded even at pitch_max that
+        pitch is kept.
+        """
+        n = len(Uinf)
+        Omega = np.full(n, self.omega_max)
+
+        def excess(idx, x):
+            if self.options.analytic_gradients:
+                P, grad = self._batched_power(Uinf[idx], Omega[idx], x, ("pitch",))
+                return np.asarray(P) - self.rating, grad[:, 0]
+            outputs, _ = self._evaluate(Uinf[idx], Omega[idx], x)
+            return np.asarray(outputs["P"]) - self.rating, np.full(idx.size, np.nan)
+
+        start = self.pitch_high if self.pitch_high is not None else self.pitch_opt
+        x0 = np.full(n, float(start))
+        if pitch0 is not None:
+            pitch0 = np.asarray(pitch0, dtype=float)
+            x0 = np.where(np.isfinite(pitch0), pitch0, x0)
+        x0 = np.clip(x0, self.pitch_min, self.pitch_max)
+        pitch = x0.copy()
+        a, fa = np.full(n, np.nan), np.full(n, np.nan)
+        b, fb = np.full(n, np.nan), np.full(n, np.nan)
+        # Last point of every search with its excess power and slope
+        x, fx, gx = x0.copy(), *excess(np.arange(n), x0)
+        niter = np.ones(n, dtype=int)
+        xp, fp = np.full(n, np.nan), np.full(n, np.nan)
+        step = np.ones(n)
+        reach = np.ones(n, dtype=bool)
+        failed = np.zeros(n, dtype=bool)
+
+        def start_at(idx):
+            above = fx[idx] >= 0
+            a[idx[above]], fa[idx[above]] = x[idx[above]], fx[idx[above]]
+            b[idx[~above]], fb[idx[~above]] = x[idx[~above]], fx[idx[~above]]
+            xp[idx], fp[idx], step[idx] = np.nan, np.nan, 1.0
+
+        def grow():
+            while True:
+                idx = np.flatnonzero(reach & ~failed & (np.isnan(a) | np.isnan(b)))
+                if idx.size == 0:
+                    return
+                up = np.isnan(b[idx])
+                direction = np.where(up, 1.0, -1.0)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    secant = (fx[idx] - fp[idx]) / (x[idx] - xp[idx])
+                    slope = np.where(np.isfinite(gx[idx]), gx[idx], secant)
+                    newton = -fx[idx] / slope
+                # Secant/Newton step toward the root, overshooting slightly to
+                # close the bracket, a doubling step otherwise
+                dx = np.where(
+                    (slope < 0) & (direction * newton > 0),
+                    np.minimum(1.1 * np.abs(newton), 4 * step[idx]),
+                    step[idx],
                 )
-                results = []
-                with mp.Pool() as pool:
-                    for result in pool.imap(self.process_Uinf, self.uinf):
-                        results.append(result)
-                        progress.update(task, advance=1)
+                x_new = np.clip(x[idx] + direction * dx, self.pitch_min, self.pitch_max)
+                f_new, g_new = excess(idx, x_new)
+                niter[idx] += 1
+                step[idx] *= 2.0
+                xp[idx], fp[idx] = x[idx], fx[idx]
+                x[idx], fx[idx], gx[idx] = x_new, f_new, g_new
+                above = f_new >= 0
+                closed = up & ~above
+                b[idx[closed]], fb[idx[closed]] = x_new[closed], f_new[closed]
+                a[idx[above]], fa[idx[above]] = x_new[above], f_new[above]
+                # Rating exceeded even fully pitched
+                feathered = idx[up & above & (x_new >= self.pitch_max)]
+                pitch[feathered] = self.pitch_max
+                reach[feathered] = False
+                # Toward pitch_min power must rise until it reaches rating,
+                # otherwise the search is on the rising side of the curve
+                down = ~up & ~above
+                stalled = (f_new <= fp[idx]) | (x_new <= self.pitch_min)
+                failed[idx[down & stalled]] = True
+                b[idx[down]], fb[idx[down]] = x_new[down], f_new[down]
+
+        start_at(np.arange(n))
+        grow()
+        idx = np.flatnonzero(failed)
+        if idx.size:
+            _, pmax, nit = self._batched_optimize(
+                Uinf[idx],
+                Omega[idx],
+                np.full(idx.size, float(self.pitch_opt)),
+                ("pitch",),
+            )
+            f, g = excess(idx, pmax)
+            niter[idx] += nit + 1
+            x[idx], fx[idx], gx[idx], pitch[idx] = pmax, f, g, pmax
+            a[idx] = b[idx] = np.nan
+            low = idx[f <= 0]
+            if low.size:
+                logger.info(f"Rated power not reachable at {Uinf[low]} m/s")
+            reach[low] = False
+            failed[idx] = False
+            # From the maximum only the falling side toward feather remains
+            start_at(idx[f > 0])
+            grow()
+        idx = np.flatnonzero(reach)
+        if idx.size:
+            tol = self.options.tol
+
+            def fun(sub, x):
+                return excess(idx[sub], x)[0]
+
+            pitch[idx], nit = batched_root(
+                fun,
+                a[idx],
+                b[idx],
+                fa[idx],
+                fb[idx],
+                **({} if tol is None else {"xtol": tol, "rtol": tol}),
+            )
+            niter[idx] += nit
+        return Omega, pitch, niter
+
+    def optimize_batched(self, Uinf=None, guesses=None):
+        """Optimize wind speeds, by default all, regime by regime in lock-step.
+
+        Optional (Omega, pitch) guesses per wind speed start the optimizations
+        and narrow the rated-pitch brackets, as in process_Uinf.
+        """
+        Uinf = self.uinf if Uinf is None else Uinf
+        uinf = np.asarray(Uinf, dtype=float)
+        n = uinf.size
+        zone = np.full(n, "mid", dtype=object)
+        zone[uinf < self.Uinf_low] = "low"
+        above = np.flatnonzero(uinf > self.Uinf_high)
+        if above.size:
+            # Check if P at omega_max with pitch=0 > rating
+            outputs, _ = self._evaluate(
+                uinf[above], np.full(above.size, self.omega_max), np.zeros(above.size)
+            )
+            zone[above] = np.where(outputs["P"] > self.rating, "high", "upper")
+        Omega = np.where(zone == "low", self.omega_min, self.omega_max)
+        Omega = np.where(zone == "mid", self.Omega_opt * (uinf / self.ref_uinf), Omega)
+        pitch = np.full(n, float(self.pitch_opt))
+        seeds = np.full((n, 2), np.nan)
+        if guesses is not None:
+            for i, guess in enumerate(guesses):
+                if guess is not None:
+                    seeds[i] = guess
+        seeded = ~np.isnan(seeds[:, 1])
+        Omega = np.where(seeded & (zone == "mid"), seeds[:, 0], Omega)
+        pitch = np.where(seeded, seeds[:, 1], pitch)
+        niter = np.zeros(n, dtype=int)
+        if self.options.similarity is not None:
+            # Only mid wind speeds rejected by the similarity check are optimized
+            idx = np.flatnonzero(zone == "mid")
+            if idx.size:
+                Omega[idx], pitch[idx], accepted, niter[idx] = self.similar_mid(
+                    uinf[idx]
+                )
+                zone[idx[accepted]] = "similar"
+        for name, free in (
+            ("low", ("pitch",)),
+            ("mid", ("Omega", "pitch")),
+            ("upper", ("pitch",)),
+        ):
+            # Seeded wind speeds run at most polish_iter iterations
+            for idx, maxiter in (
+                (np.flatnonzero((zone == name) & seeded), self.options.polish_iter),
+                (np.flatnonzero((zone == name) & ~seeded), None),
+            ):
+                if idx.size:
+                    Omega[idx], pitch[idx], nfev = self._batched_optimize(
+                        uinf[idx], Omega[idx], pitch[idx], free, maxiter
+                    )
+                    niter[idx] += nfev
+        idx = np.flatnonzero(zone == "high")
+        if idx.size:
+            Omega[idx], pitch[idx], niter[idx] = self._batched_rated_pitch(
+                uinf[idx], seeds[idx, 1]
+            )
+        zone[zone == "similar"] = "mid"
+        outputs, _ = self._evaluate(uinf, Omega, pitch, coefficients=True)
+        return [
+            (
+                Uinf[i],
+                zone[i],
+                Omega[i],
+                pitch[i],
+                outputs["P"][i],
+                outputs["T"][i],
+                outputs["CT"][i],
+                outputs["CP"][i],
+                outputs["Mb"][i],
+                niter[i],
+            )
+            for i in range(n)
+        ]
+
+    def optimize_points(self, uinf, guesses=None):
+        """Optimize the given wind speeds, warm-started from optional guesses.
+
+        With a checkpoint, wind speeds stored in it for this rotor, rating and
+        solver options are taken from it, and the others are appended to it as they
+        are solved.
+        """
+        if self.checkpoint is None:
+            return self._solve_points(uinf, guesses)
+        stored = self.checkpoint.load()
+        results = [stored.get(float(u)) for u in uinf]
+        todo = [i for i, result in enumerate(results) if result is None]
+        if len(todo) < len(uinf):
+            logger.info(
+                f"Resuming {len(uinf) - len(todo)} wind speeds from "
+                f"{self.checkpoint.path}"
+            )
+        if todo:
+            solved = self._solve_points(
+                np.asarray(uinf)[todo],
+                None if guesses is None else [guesses[i] for i in todo],
+            )
+            for i, result in zip(todo, solved):
+                results[i] = result
         return results
 
-    def compute_bladeloads(self, results):
-        """Compute and return blade loads and moments data."""
-        loads_list = []
-        uinf_list = []
-        flapwise_moments = []
-        edgewise_moments = []
-        r = self.rotor.r
-        for uinf, _, omega, pitch, _, _, _, _, _, _ in results:
-            with (
-                redirect_stdout(open(os.devnull, "w")),
-                redirect_stderr(open(os.devnull, "w")),
+    def _store(self, results):
+        """Append results to the checkpoint, if any, and return them."""
+        if self.checkpoint is not None:
+            self.checkpoint.append(results)
+        return results
+
+    def _solve_points(self, uinf, guesses=None):
+        if guesses is None:
+            guesses = [None] * len(uinf)
+        if self.table is not None:
+            zone, table_guesses = self.table_guesses(uinf)
+            if not self.options.lookup_table.get("polish", True):
+                return self._store(self.table_results(uinf, zone, table_guesses))
+            guesses = [t if g is None else g for g, t in zip(guesses, table_guesses)]
+        if self.options.batched:
+            return self._store(self.optimize_batched(uinf, guesses))
+        if self.options.serial:
+            if self.options.continuation:
+                return self.sweep(uinf, guesses)
+            return self.solve_in_order(uinf, guesses)
+        results = [None] * len(uinf)
+        with Progress() as progress:
+            task = progress.add_task("Optimizing operating points...", total=len(uinf))
+            pool = get_pool(self.rotor)
+            order = np.argsort(uinf, kind="stable")
+            if self.options.continuation:
+                # Contiguous chunks of the curve keep the warm starts on one worker
+                chunks = [c for c in np.array_split(order, pool.processes) if c.size]
+            else:
+                # Wind speeds above the mid regime go in contiguous chunks of at
+                # least two, seeded from their neighbour's rated pitch, see
+                # solve_in_order
+                high = order[np.asarray(uinf)[order] > self.Uinf_high]
+                n_chunks = max(1, min(pool.processes, high.size // 2))
+                rest = np.setdiff1d(order, high)
+                chunks = [[i] for i in rest] + [
+                    c for c in np.array_split(high, n_chunks) if c.size
+                ]
+            tasks = (
+                (self, [uinf[i] for i in c], [guesses[i] for i in c], self.cache.disk)
+                for c in chunks
+            )
+            evaluator = rotor_evaluator(self.rotor)
+            for chunk, (chunk_results, loads, cache_counts, counters) in zip(
+                chunks, pool.imap(_optimize_task, tasks)
             ):
-                loads, _ = self.rotor.distributedAeroLoads(uinf, omega, pitch, 0)
-            loads_list.append(loads)
-            uinf_list.append(uinf)
-            # Compute moments
-            Np = loads["Np"]
-            Tp = loads["Tp"]
-            moment_flap = np.trapezoid(Np * r, r)
-            moment_edge = np.trapezoid(Tp * r, r)
-            flapwise_moments.append(moment_flap)
-            edgewise_moments.append(moment_edge)
-        combined_rms = np.sqrt(
-            np.array(flapwise_moments) ** 2 + np.array(edgewise_moments) ** 2
+                for i, result in zip(chunk, chunk_results):
+                    results[i] = result
+                self._store(chunk_results)
+                for result, point_loads in zip(chunk_results, loads or []):
+                    self.point_loads[_point_key(result[0], *result[2:4])] = point_loads
+                self.cache.record(*cache_counts)
+                evaluator.record(counters)
+                progress.update(task, advance=len(chunk))
+        return results
+
+    def solve_in_order(self, uinf, guesses=None):
+        """Optimize wind speeds in increasing order, results in the order of uinf.
+
+        A high wind speed without a guess starts its rated-pitch search from
+        the solution at the previous high wind speed, passed as its guess.
+        """
+        if guesses is None:
+            guesses = [None] * len(uinf)
+        results = [None] * len(uinf)
+        previous = None
+        for i in np.argsort(uinf, kind="stable"):
+            guess = guesses[i]
+            if guess is None and previous is not None and uinf[i] > self.Uinf_high:
+                guess = previous
+            results[i] = self.process_Uinf(uinf[i], guess)
+            self._store([results[i]])
+            if results[i][1] == "high":
+                previous = results[i][2:4]
+        return results
+
+    def _continue(self, solved, Uinf):
+        """Return the (Omega, pitch) guess at Uinf continuing the solved curve.
+
+        The last solution is linearly extrapolated from the one before when
+        both share a regime. No guess is returned when Uinf lies in another
+        regime than the last solution, except across upper and high, nor in
+        the mid regime, which already starts from the scaled reference optimum.
+        """
+
+        def regime(u, zone=None):
+            if zone in ("upper", "high") or u > self.Uinf_high:
+                return "above"
+            return zone or ("low" if u < self.Uinf_low else "mid")
+
+        u1, zone1, Omega, pitch = solved[-1][:4]
+        if regime(Uinf) == "mid" or regime(Uinf) != regime(u1, zone1):
+            return None
+        if len(solved) > 1:
+            u0, zone0, Omega0, pitch0 = solved[-2][:4]
+            if regime(u0, zone0) == regime(u1, zone1) and u1 != u0:
+                t = (Uinf - u1) / (u1 - u0)
+                Omega, pitch = (
+                    Omega + t * (Omega - Omega0),
+                    pitch + t * (pitch - pitch0),
+                )
+        return (
+            float(np.clip(Omega, self.omega_min, self.omega_max)),
+            float(np.clip(pitch, self.pitch_min, self.pitch_max)),
+        )
+
+    def sweep(self, uinf, guesses=None):
+        """Optimize wind speeds in increasing order, continuing along the curve.
+
+        Each wind speed starts from the solutions at the previous ones, see
+        _continue, and from its guess when there is none. Results are in the
+        order of uinf.
+        """
+        if guesses is None:
+            guesses = [None] * len(uinf)
+        results = [None] * len(uinf)
+        solved = []
+        for i in np.argsort(uinf, kind="stable"):
+            guess = self._continue(solved, uinf[i]) if solved else None
+            results[i] = self.process_Uinf(
+                uinf[i], guesses[i] if guess is None else guess
+            )
+            self._store([results[i]])
+            solved.append(results[i])
+        return results
+
+    def refine(self, results):
+        """Insert wind speeds where the curves or the regime change quickly.
+
+        An interval is bisected when its ends lie in different regimes, or when
+        an interior point of power or thrust deviates from the chord through its
+        neighbours by more than ``tol`` (default 0.01) of the curve's range.
+        New wind speeds are warm-started from the mean of their neighbours.
+        Refinement stops at intervals of ``min_step`` (default 0.1 m/s) or once
+        ``max_points`` (default three times the initial count) are solved.
+        """
+        options = self.options.adaptive
+        tol = options.get("tol", 0.01)
+        min_step = options.get("min_step", 0.1)
+        max_points = options.get("max_points", 3 * len(results))
+        results = sorted(results, key=lambda r: r[0])
+        while len(results) < max_points:
+            uinf = np.array([r[0] for r in results], dtype=float)
+            zone = np.array([r[1] for r in results], dtype=object)
+            flagged = zone[:-1] != zone[1:]
+            w = (uinf[1:-1] - uinf[:-2]) / (uinf[2:] - uinf[:-2])
+            for k in (4, 5):
+                y = np.array([r[k] for r in results], dtype=float)
+                scale = max(np.ptp(y), np.finfo(float).tiny)
+                chord = y[:-2] + w * (y[2:] - y[:-2])
+                bent = np.abs(y[1:-1] - chord) > tol * scale
+                flagged[:-1] |= bent
+                flagged[1:] |= bent
+            flagged &= np.diff(uinf) >= 2 * min_step
+            idx = np.flatnonzero(flagged)[: max_points - len(results)]
+            if idx.size == 0:
+                break
+            new_uinf = 0.5 * (uinf[idx] + uinf[idx + 1])
+            guesses = [
+                (
+                    0.5 * (results[i][2] + results[i + 1][2]),
+                    0.5 * (results[i][3] + results[i + 1][3]),
+                )
+                for i in idx
+            ]
+            logger.info(f"Refining {idx.size} wind speeds")
+            results = sorted(
+                results + self.optimize_points(new_uinf, guesses), key=lambda r: r[0]
+            )
+        self.uinf = np.array([r[0] for r in results])
+        return results
+
+    def optimize_all(self, warm_start: Optional[OperatingPoints] = None):
+        """Run optimization for all wind speeds using multiprocessing or serial.
+
+        Returns the results as OperatingPoints. With ``adaptive`` options the
+        wind speeds are refined afterwards, see refine. ``warm_start`` results,
+        typically of a coarser rotor, give the starting (Omega, pitch) of the
+        reference optimum and of every wind speed, interpolated to it, so those
+        optimizations only polish them, see polish_iter.
+        """
+        guesses = None
+        if self.options.lookup_table is not None:
+            self.initialize_table()
+        else:
+            self.initialize_optimal(warm_start)
+        if warm_start is not None:
+            guesses = [
+                _interpolate_controls(warm_start, u, self._zones(u)) for u in self.uinf
+            ]
+        results = self.optimize_points(self.uinf, guesses)
+        if self.options.adaptive is not None:
+            results = self.refine(results)
+        return OperatingPoints.from_rows(results, rtip=self.rtip)
+
+    def compute_bladeloads(self, results):
+        """Compute the blade loads at the results as BladeLoads.
+
+        Loads already returned by the workers with fused_loads are reused, the
+        others are spread over the worker pool unless running serial or
+        batched.
+        """
+        if not isinstance(results, OperatingPoints):
+            results = OperatingPoints.from_rows(results, rtip=self.rtip)
+        points = list(map(_point_key, results.uinf, results.omega, results.pitch))
+        missing = list(dict.fromkeys(p for p in points if p not in self.point_loads))
+        if self.options.serial or self.options.batched or len(missing) < 2:
+            for point in missing:
+                self.point_loads[point] = self.cache.loads(self.rotor, *point)
+        else:
+            pool = get_pool(self.rotor)
+            chunks = [
+                [missing[i] for i in c]
+                for c in np.array_split(np.arange(len(missing)), pool.processes)
+                if c.size
+            ]
+            evaluator = rotor_evaluator(self.rotor)
+            tasks = ((chunk, self.cache.disk) for chunk in chunks)
+            for chunk, (loads, counters) in zip(chunks, pool.imap(_loads_task, tasks)):
+                self.point_loads.update(zip(chunk, loads))
+                evaluator.record(counters)
+        return BladeLoads.from_loads(
+            self.rotor.r, results.uinf, [self.point_loads[point] for point in points]
         )
-        blade_data = {
-            "r": r.tolist(),
-            "loads_list": [
-                {k: v.tolist() for k, v in load.items()} for load in loads_list
-            ],
-            "uinf_list": uinf_list,
-            "flapwise_moments": [float(m) for m in flapwise_moments],
-            "edgewise_moments": [float(m) for m in edgewise_moments],
-            "combined_rms": combined_rms.tolist(),
-        }
-        return blade_data
@@ -0,0 +1,124 @@
+# Solver options of optimal runs for b3_bem.
+
+import json
+from dataclasses import asdict, dataclass, fields
+from typing import Optional
+
+# Options that change how the work is spread, not the results
+_EXECUTION = ("serial", "fused_loads")
+# Optimizer iterations polishing a lookup table solution by default
+_TABLE_POLISH_ITER = 1
+
+
+@dataclass(frozen=True)
+class SolverOptions:
+    """Settings of the control optimization of an optimal run.
+
+    ``serial`` solves in this process instead of the worker pool.
+    ``analytic_gradients`` passes the CCBlade derivatives to the optimizers
+    instead of finite differences. ``batched`` optimizes all wind speeds of a
+    regime together in vectorized rotor evaluations. ``lookup_table`` options
+    interpolate the solutions from a CP table, see
+    ControlOptimize.initialize_table. A ``similarity`` tolerance lets mid wind
+    speeds reuse the reference optimum. ``adaptive`` options insert wind
+    speeds where the curves bend, see ControlOptimize.refine. ``continuation``
+    solves wind speeds in order from their neighbours' solutions.
+    ``fused_loads`` has pool workers compute the blade loads at the optima.
+    ``tol`` sets the tolerance of every optimization and rated-pitch search,
+    the solver defaults are used when it is None. ``polish_iter`` caps the
+    optimizer iterations at wind speeds started from a guess, such as the
+    lookup table or a coarse solution, so they only polish it.
+    """
+
+    serial: bool = False
+    analytic_gradients: bool = False
+    batched: bool = False
+    lookup_table: Optional[dict] = None
+    similarity: Optional[float] = None
+    adaptive: Optional[dict] = None
+    continuation: bool = False
+    fused_loads: bool = False
+    tol: Optional[float] = None
+    polish_iter: Optional[int] = None
+
+    def __post_init__(self):
+        """Reject option combinations where one would be silently ignored."""
+        if self.tol is not None and not self.tol > 0:
+            raise ValueError(f"tol must be positive, got {self.tol}")
+        if self.similarity is not None and not self.similarity > 0:
+            raise ValueError(f"similarity must be positive, got {self.similarity}")
+        if self.polish_iter is not None and not self.polish_iter > 0:
+            raise ValueError(f"polish_iter must be positive, got {self.polish_iter}")
+        conflicts = []
+        if self.batched:
+            conflicts += [
+                ("batched", name)
+                for name in ("continuation", "fused_loads")
+                if getattr(self, name)
+            ]
+        if self.serial and self.fused_loads:
+            conflicts.append(("serial", "fused_loads"))
+        if self.lookup_table is not None and not self.lookup_table.get("polish", True):
+            conflicts += [
+                ("lookup_table without polish", name)
+                for name in (
+                    "batched",
+                    "continuation",
+                    "similarity",
+                    "tol",
+                    "polish_iter",
+                )
+                if getattr(self, name) not in (None, False)
+            ]
+        if conflicts:
+            raise ValueError(
+                "Conflicting solver options: "
+                + ", ".join(f"{a} ignores {b}" for a, b in conflicts)
+            )
+
+    @classmethod
+    def from_config(cls, run_config: dict) -> "SolverOptions":
+        """Return the options of an optimal run config.
+
+        ``lookup_table`` and ``adaptive`` may be given as True for their
+        defaults, and ``similarity`` as True for a tolerance of 1e-3. A
+        polished lookup table caps the polish at ``_TABLE_POLISH_ITER``
+        iterations unless ``polish_iter`` is given. Other keys of the run
+        config are ignored.
+        """
+        values = {
+            f.name: run_config[f.name] for f in fields(cls) if f.name in run_config
+        }
+        for name in ("lookup_table", "adaptive"):
+            if values.get(name) is False:
+                values[name] = None
+            elif values.get(name) is True:
+                values[name] = {}
+        similarity = values.get("similarity")
+        if similarity is False:
+            values["similarity"] = None
+        elif similarity is not None:
+            values["similarity"] = 1e-3 if similarity is True else float(similarity)
+        if values.get("tol") is not None:
+            values["tol"] = float(values["tol"])
+        table = values.get("lookup_table")
+        if table is not None and table.get("polish", True):
+            values.setdefault("polish_iter", _TABLE_POLISH_ITER)
+        if values.get("polish_iter") is not None:
+            values["polish_iter"] = int(values["polish_iter"])
+        for name in (
+            "serial",
+            "analytic_gradients",
+            "batched",
+            "continuation",
+            "fused_loads",
+        ):
+            values[name] = bool(values.get(name, False))
+        return cls(**values)
+
+    def key(self) -> str:
+        """Return a stable string of the options that affect the results."""
+        return json.dumps(
+            {k: v for k, v in asdict(self).items() if k not in _EXECUTION},
+            sort_keys=True,
+        )
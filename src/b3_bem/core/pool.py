@@ -0,0 +1,120 @@
+# Persistent rotor worker pool for b3_bem.
+
+import atexit
+import hashlib
+import logging
+import multiprocessing as mp
+import pickle
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .cache import remember_fingerprint, rotor_fingerprint
+from .evaluator import silence_process
+
+logger = logging.getLogger(__name__)
+
+# Rotor held by each worker process
+_rotor = None
+# Persistent pool of the parent process
+_shared = None
+
+
+def _init_worker(rotor_bytes: bytes, fingerprint: str) -> None:
+    """Unpickle the rotor and silence output once per worker process.
+
+    The worker's rotor takes the fingerprint of the parent's, which does not
+    depend on state the rotor picked up before it was sent.
+    """
+    global _rotor
+    _rotor = pickle.loads(rotor_bytes)
+    remember_fingerprint(_rotor, fingerprint)
+    silence_process()
+
+
+def _call(task):
+    """Run a task against the worker's rotor."""
+    func, arg = task
+    return func(_rotor, arg)
+
+
+class RotorPool:
+    """Process pool whose workers receive the rotor once through an initializer.
+
+    Tasks are ``func(rotor, arg)`` with a module-level ``func``, so only the
+    small per-task argument is pickled, never the rotor.
+    """
+
+    def __init__(
+        self,
+        rotor,
+        processes: Optional[int] = None,
+        rotor_bytes: Optional[bytes] = None,
+    ):
+        """Start the workers for a rotor."""
+        if rotor_bytes is None:
+            rotor_bytes = pickle.dumps(rotor)
+        self.rotor = rotor
+        self.key = hashlib.sha1(rotor_bytes).hexdigest()
+        self.processes = processes or mp.cpu_count()
+        self._pool = mp.Pool(
+            self.processes,
+            initializer=_init_worker,
+            initargs=(rotor_bytes, rotor_fingerprint(rotor)),
+        )
+        logger.info(f"Started {self.processes} rotor workers")
+
+    def imap(
+        self, func: Callable[[Any, Any], Any], iterable: Iterable, chunksize: int = 1
+    ) -> Iterator:
+        """Apply ``func(rotor, arg)`` to every arg on the workers, in order."""
+        return self._pool.imap(_call, ((func, arg) for arg in iterable), chunksize)
+
+    def imap_bounded(
+        self, func: Callable[[Any, Any], Any], iterable: Iterable, max_pending: int
+    ) -> Iterator:
+        """Like imap, but read at most max_pending args ahead of the results.
+
+        Pool.imap consumes its iterable eagerly, this keeps a lazily read
+        iterable, such as chunks of a large file, bounded in memory.
+        """
+        pending = deque()
+        for arg in iterable:
+            pending.append(self._pool.apply_async(_call, ((func, arg),)))
+            if len(pending) >= max_pending:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+    def close(self) -> None:
+        """Stop the workers."""
+        self._pool.terminate()
+        self._pool.join()
+
+
+def get_pool(rotor, processes: Optional[int] = None) -> RotorPool:
+    """Return the persistent pool for a rotor.
+
+    The pool is reused across runs and invocations as long as the rotor
+    pickles to the same bytes, and restarted for a different rotor.
+    """
+    global _shared
+    if _shared is not None and _shared.rotor is rotor:
+        return _shared
+    rotor_bytes = pickle.dumps(rotor)
+    if _shared is not None and _shared.key == hashlib.sha1(rotor_bytes).hexdigest():
+        _shared.rotor = rotor
+        return _shared
+    shutdown_pool()
+    _shared = RotorPool(rotor, processes, rotor_bytes=rotor_bytes)
+    return _shared
+
+
+def shutdown_pool() -> None:
+    """Stop the persistent pool, if any."""
+    global _shared
+    if _shared is not None:
+        _shared.close()
+        _shared = None
+
+
+atexit.register(shutdown_pool)
@@ -0,0 +1,174 @@
+# Columnar result containers for b3_bem.
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .moments import sectional_moments
+from .table import RPM
+
+# Columns of a result row (Uinf, zone, Omega, pitch, P, T, CT, CP, Mb, niter)
+RESULT_COLUMNS = ("uinf", "zone", "omega", "pitch", "P", "T", "CT", "CP", "Mb", "niter")
+# Serialized blade load entries and the BladeLoads attributes holding them
+_SUMMARY_KEYS = {
+    "r": "r",
+    "uinf_list": "uinf",
+    "flapwise_moments": "flapwise_moments",
+    "edgewise_moments": "edgewise_moments",
+    "combined_rms": "combined_rms",
+}
+
+
+@dataclass
+class OperatingPoints:
+    """Performance of a run as one array per column.
+
+    String keys return columns. Integer indexing and iteration return
+    (Uinf, zone, Omega, pitch, P, T, CT, CP, Mb, niter) rows, the form the
+    optimizer produces per wind speed. With rtip set, to_dict adds the tip
+    speed ratio and tip speed.
+    """
+
+    uinf: np.ndarray
+    zone: np.ndarray
+    omega: np.ndarray
+    pitch: np.ndarray
+    P: np.ndarray
+    T: np.ndarray
+    CT: np.ndarray
+    CP: np.ndarray
+    Mb: np.ndarray
+    niter: np.ndarray
+    rtip: Optional[float] = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple], rtip: Optional[float] = None):
+        """Build the columns from result rows."""
+        rows = list(rows)
+        columns = list(zip(*rows)) if rows else [()] * len(RESULT_COLUMNS)
+        dtypes = {"zone": str, "niter": int}
+        arrays = {
+            key: np.asarray(column, dtype=dtypes.get(key, float))
+            for key, column in zip(RESULT_COLUMNS, columns)
+        }
+        return cls(**arrays, rtip=rtip)
+
+    def __len__(self) -> int:
+        return len(self.uinf)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple(getattr(self, k)[key].item() for k in RESULT_COLUMNS)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def tsr(self) -> np.ndarray:
+        """Return the tip speed ratio at every point."""
+        return self.tip_speed() / self.uinf
+
+    def tip_speed(self) -> np.ndarray:
+        """Return the tip speed at every point."""
+        return self.omega * RPM * self.rtip
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Return the columns by name."""
+        columns = {key: getattr(self, key) for key in RESULT_COLUMNS}
+        if self.rtip is not None:
+            columns["tsr"] = self.tsr()
+            columns["tip_speed"] = self.tip_speed()
+        return columns
+
+
+@dataclass
+class BladeLoads:
+    """Distributed blade loads of a run, one (n_points, n_span) array per field.
+
+    String keys give the entries of the serialized form, so ``loads_list``
+    returns per-point dicts of views into the field arrays.
+    """
+
+    r: np.ndarray
+    uinf: np.ndarray
+    fields: Dict[str, np.ndarray]
+    sectional: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_loads(cls, r, uinf, loads_list: List[Dict[str, np.ndarray]]):
+        """Stack per-point load dicts into field arrays."""
+        names = list(loads_list[0]) if loads_list else ["Np", "Tp"]
+        fields = {
+            name: np.array([loads[name] for loads in loads_list], dtype=float).reshape(
+                len(loads_list), len(r)
+            )
+            for name in names
+        }
+        return cls(np.asarray(r, dtype=float), np.asarray(uinf, dtype=float), fields)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Rebuild blade loads from their serialized form."""
+        blade_loads = cls.from_loads(data["r"], data["uinf_list"], data["loads_list"])
+        for name in ("sectional_flapwise", "sectional_edgewise"):
+            if name in data:
+                blade_loads.sectional[name] = np.asarray(data[name], dtype=float)
+        return blade_loads
+
+    @property
+    def flapwise_moments(self) -> np.ndarray:
+        """Root flapwise moment at every point."""
+        return np.trapezoid(self.fields["Np"] * self.r, self.r, axis=1)
+
+    @property
+    def edgewise_moments(self) -> np.ndarray:
+        """Root edgewise moment at every point."""
+        return np.trapezoid(self.fields["Tp"] * self.r, self.r, axis=1)
+
+    @property
+    def combined_rms(self) -> np.ndarray:
+        """Root of the summed squared root moments at every point."""
+        return np.sqrt(self.flapwise_moments**2 + self.edgewise_moments**2)
+
+    def add_sectional_moments(self) -> "BladeLoads":
+        """Compute the flapwise and edgewise sectional moment distributions."""
+        self.sectional["sectional_flapwise"] = sectional_moments(
+            self.r, self.fields["Np"]
+        )
+        self.sectional["sectional_edgewise"] = sectional_moments(
+            self.r, self.fields["Tp"]
+        )
+        return self
+
+    def loads_list(self) -> List[Dict[str, np.ndarray]]:
+        """Return the loads of every point as a dict of field views."""
+        return [
+            {name: values[i] for name, values in self.fields.items()}
+            for i in range(len(self.uinf))
+        ]
+
+    def dense(self) -> np.ndarray:
+        """Return the loads as one (n_points, n_fields, n_span) array."""
+        return np.stack(list(self.fields.values()), axis=1)
+
+    def summary(self) -> Dict[str, np.ndarray]:
+        """Return every entry of the serialized form except the loads."""
+        summary = {key: getattr(self, name) for key, name in _SUMMARY_KEYS.items()}
+        return {**summary, **self.sectional}
+
+    def to_dict(self) -> dict:
+        """Return the serialized form, with the loads as a list of dicts."""
+        return {"loads_list": self.loads_list(), **self.summary()}
+
+    def __getitem__(self, key: str):
+        if key == "loads_list":
+            return self.loads_list()
+        if key in self.sectional:
+            return self.sectional[key]
+        if key not in _SUMMARY_KEYS:
+            raise KeyError(key)
+        return getattr(self, _SUMMARY_KEYS[key])
+
+    def __contains__(self, key: str) -> bool:
+        return key == "loads_list" or key in self.sectional or key in _SUMMARY_KEYS
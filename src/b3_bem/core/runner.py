@@ -1,24 +1,39 @@
 # Runner class for b3_bem.
 
+from dataclasses import replace
 from pathlib import Path
 import numpy as np
 import pandas as pd
 import json
 from ccblade.ccblade import CCBlade
 import logging
+from typing import Dict, List, Optional, Tuple
 from scipy.interpolate import PchipInterpolator
 
-from ..utils.utils import load_polar, interpolate_polars
+from ..utils.utils import alpha_grid, load_polars, interpolate_polars
 from ..plots.plots import plot_planform
+from .cache import EvaluationCache, rotor_fingerprint
+from .disk_cache import DiskCache
+from .evaluator import rotor_evaluator
 from .optimizer import ControlOptimize
-from .fixed import FixedRun
+from .options import SolverOptions
+from .fixed import FixedRun, stream_setpoints
+from .pool import get_pool
+from .results import BladeLoads, OperatingPoints
+from .span import converged_span, span_stations
+from .store import ResultsStore, save_arrays, split_run_arrays
 
 logger = logging.getLogger(__name__)
 
+# Optimizer iterations polishing a coarse solution by default
+_COARSE_POLISH_ITER = 2
+
 
 def convert_to_serializable(obj):
     """Convert numpy types to Python serializable types."""
-    if isinstance(obj, np.ndarray):
+    if isinstance(obj, (OperatingPoints, BladeLoads)):
+        return convert_to_serializable(obj.to_dict())
+    elif isinstance(obj, np.ndarray):
         return obj.tolist()
     elif isinstance(obj, (np.integer, np.floating)):
         return obj.item()
@@ -49,49 +64,64 @@ class B3BemRun:
         planform = self.config["geometry"]["planform"]
 
         # Interpolate planform control points using PCHIP
-        n_span = 50
-        s_span = np.linspace(0, 1, n_span)
-
-        # Chord interpolation
-        s_chord = np.array([p[0] for p in planform["chord"]])
-        chord_vals = np.array([p[1] for p in planform["chord"]])
-        interp_chord = PchipInterpolator(s_chord, chord_vals)
-        chord = interp_chord(s_span)
-
-        # Twist interpolation
-        s_twist = np.array([p[0] for p in planform["twist"]])
-        twist_vals = np.array([p[1] for p in planform["twist"]])
-        interp_twist = PchipInterpolator(s_twist, twist_vals)
-        twist = interp_twist(s_span)
-
-        # Thickness interpolation
-        s_thickness = np.array([p[0] for p in planform["thickness"]])
-        thickness_vals = np.array([p[1] for p in planform["thickness"]])
-        interp_thickness = PchipInterpolator(s_thickness, thickness_vals)
-        relative_thickness = interp_thickness(s_span)
-
-        # z interpolation for radius
-        s_z = np.array([p[0] for p in planform["z"]])
-        z_vals = np.array([p[1] for p in planform["z"]])
-        interp_z = PchipInterpolator(s_z, z_vals)
-        z = interp_z(s_span)
-
-        # Radial position
-        r = np.abs(z)
-        rhub = r[0]
-        rtip = r[-1]
+        self.planform_points = {
+            key: (
+                np.array([p[0] for p in planform[key]]),
+                np.array([p[1] for p in planform[key]]),
+            )
+            for key in ("chord", "twist", "thickness", "z")
+        }
+        self.planform_interp = {
+            key: PchipInterpolator(s, values)
+            for key, (s, values) in self.planform_points.items()
+        }
+        self.rtip = float(np.abs(self.planform_interp["z"](1.0)))
+
+        if bem["polars"] is None:
+            exit("no polars in blade file")
+        polar_cache = bem.get("polar_cache", True)
+        if polar_cache is True:
+            polar_cache = self.workdir.parent / "polar_cache"
+        elif polar_cache:
+            polar_cache = yml_dir / Path(polar_cache)
+        self.polar_cache = polar_cache or None
+        self.polars = self.load_polars(alpha_grid(**(bem.get("alpha_grid") or {})))
+
+        # Span stations, fixed or the smallest count that converges
+        span = bem.get("span") or {}
+        if not isinstance(span, dict):
+            span = {"n": span}
+        spacing = span.get("spacing", "uniform")
+        n_span = span.get("n", 50)
+        self.span_info = {"spacing": spacing}
+        if n_span == "auto":
+            n_span, errors, converged = converged_span(
+                self.build_rotor,
+                self.rtip,
+                spacing=spacing,
+                **{
+                    key: span[key]
+                    for key in ("tolerance", "reference", "candidates", "uinf", "tsr")
+                    if key in span
+                },
+            )
+            self.span_info["errors"] = errors
+            self.span_info["converged"] = converged
+            if converged:
+                logger.info(f"Converged on {n_span} {spacing} span stations: {errors}")
+        self.span_info["n"] = int(n_span)
+        s_span = span_stations(int(n_span), spacing)
+        r, chord, twist, relative_thickness = self.planform(s_span)
 
         # Control points for plotting
-        r_chord = np.abs(interp_z(s_chord))
-        r_twist = np.abs(interp_z(s_twist))
-        r_thickness = np.abs(interp_z(s_thickness))
-        r_z = np.abs(z_vals)
+        interp_z = self.planform_interp["z"]
+        r_z = np.abs(self.planform_points["z"][1])
         control_points = {
-            "chord": (r_chord, chord_vals),
-            "twist": (r_twist, twist_vals),
-            "thickness": (r_thickness, thickness_vals),
-            "r": (r_z, r_z),
+            key: (np.abs(interp_z(s)), values)
+            for key, (s, values) in self.planform_points.items()
+            if key != "z"
         }
+        control_points["r"] = (r_z, r_z)
 
         # Store planform data for output
         self.planform_data = {
@@ -101,32 +131,79 @@ class B3BemRun:
             "thickness": relative_thickness.tolist(),
         }
 
-        # Plot planform
-        plot_planform(
-            r,
-            chord,
-            twist,
-            relative_thickness,
-            self.workdir.parent / "ccblade_planform.png",
-            control_points,
+        # Plot planform and polars, unless disabled for quick runs
+        diagnostic_plots = bem.get("diagnostic_plots", True)
+        if diagnostic_plots:
+            plot_planform(
+                r,
+                chord,
+                twist,
+                relative_thickness,
+                self.workdir.parent / "ccblade_planform.png",
+                control_points,
+            )
+
+        self.rotor = self.build_rotor(
+            s_span,
+            of=self.workdir.parent / "polars.png" if diagnostic_plots else None,
         )
+        logger.info(f"Rotor from {r[0]} to {r[-1]} with {len(r)} stations")
+        disk = None
+        disk_options = self._feature_options(bem, "disk_cache")
+        if disk_options is not None:
+            disk_path = Path(
+                disk_options.get(
+                    "path", self.workdir.parent / "evaluation_cache.sqlite"
+                )
+            )
+            if not disk_path.is_absolute():
+                disk_path = self.yml_dir / disk_path
+            disk = DiskCache(disk_path, int(disk_options.get("max_mb", 256) * 2**20))
+            # Fingerprint the rotor as built, before evaluations touch its state
+            rotor_fingerprint(self.rotor)
+        self.cache = EvaluationCache(bem.get("cache_size", 4096), disk=disk)
 
-        if bem["polars"] is None:
-            exit("no polars in blade file")
-        plrs = sorted(
-            [(i["key"], load_polar(yml_dir / Path(i["file"]))) for i in bem["polars"]],
-            reverse=True,
+    def load_polars(self, alpha: np.ndarray) -> List[tuple]:
+        """Return the configured polars resampled to alpha, thickest first."""
+        polars = self.config["bem"]["polars"]
+        loaded = load_polars(
+            [self.yml_dir / Path(i["file"]) for i in polars],
+            cache_dir=self.polar_cache,
+            alpha=alpha,
         )
+        return sorted(zip([i["key"] for i in polars], loaded), reverse=True)
+
+    def planform(self, s_span: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Return radius, chord, twist and relative thickness at span fractions."""
+        r = np.abs(self.planform_interp["z"](s_span))
+        chord = self.planform_interp["chord"](s_span)
+        twist = self.planform_interp["twist"](s_span)
+        relative_thickness = self.planform_interp["thickness"](s_span)
+        return r, chord, twist, relative_thickness
+
+    def build_rotor(
+        self,
+        s_span: np.ndarray,
+        polars: Optional[List[tuple]] = None,
+        of: Optional[Path] = None,
+    ) -> CCBlade:
+        """Build a rotor with stations at span fractions s_span.
+
+        The polars default to the ones loaded at initialization, ``of`` plots
+        the interpolated polars.
+        """
+        bem = self.config["bem"]
+        r, chord, twist, relative_thickness = self.planform(s_span)
         iplr = interpolate_polars(
-            plrs, relative_thickness, of=self.workdir.parent / "polars.png"
+            self.polars if polars is None else polars, relative_thickness, of=of
         )
-        self.rotor = CCBlade(
+        return CCBlade(
             r - r[0],
             chord,
             twist,
             iplr,
-            rhub,
-            rtip,
+            r[0],
+            r[-1],
             B=bem["B"],
             rho=bem["rho"],
             mu=bem["mu"],
@@ -137,58 +214,159 @@ class B3BemRun:
             hubHt=bem["hubHt"],
             derivatives=True,
         )
-        logger.info(f"Rotor from {rhub} to {rtip}")
-        self.copt = ControlOptimize(
-            self.rotor,
+
+    def _control_optimizer(
+        self,
+        rotor: CCBlade,
+        run_config: dict,
+        checkpoint: Optional[Path] = None,
+        warm_started: bool = False,
+    ) -> ControlOptimize:
+        """Return the optimizer of an optimal run for a rotor.
+
+        Other rotors than the run's, such as the coarse rotor of
+        _coarse_solution, are solved in this process without a lookup table,
+        which keeps the worker pool and ``performance_table.npz`` to the run's
+        rotor. They are batched unless the run is serial. A ``warm_started``
+        run polishes for at most ``_COARSE_POLISH_ITER`` iterations unless
+        ``polish_iter`` is given.
+        """
+        bem = self.config["bem"]
+        options = SolverOptions.from_config(run_config)
+        if rotor is not self.rotor:
+            batched = options.batched or not options.serial
+            options = replace(
+                options,
+                serial=True,
+                batched=batched,
+                continuation=options.continuation and not batched,
+                fused_loads=False,
+                lookup_table=None,
+                polish_iter=None,
+            )
+        elif warm_started and options.polish_iter is None:
+            options = replace(options, polish_iter=_COARSE_POLISH_ITER)
+        return ControlOptimize(
+            rotor,
             bem["max_tipspeed"],
-            rtip,
+            self.rtip,
             bem["rated_power"],
             uinf=np.array(bem["uinf"]),
             workdir=self.workdir,
+            options=options,
+            cache=self.cache,
+            checkpoint=checkpoint,
+        )
+
+    def _coarse_solution(
+        self, run_config: dict, options: dict
+    ) -> Tuple[OperatingPoints, dict]:
+        """Solve an optimal run on a coarse rotor built from the same planform.
+
+        The rotor has ``n_span`` stations (default a quarter of the run's, at
+        least 8) with the run's spacing, and polars on a coarser alpha grid,
+        ``alpha_grid`` options as for bem.alpha_grid. It is solved in this
+        process, batched unless the run is serial. Returns the results and the metadata
+        of the coarse solve.
+        """
+        table = SolverOptions.from_config(run_config).lookup_table
+        if table is not None and not table.get("polish", True):
+            raise ValueError(
+                "multi_fidelity has no effect with lookup_table polish off"
+            )
+        n_span = int(options.get("n_span", max(8, self.span_info["n"] // 4)))
+        alpha = alpha_grid(**options.get("alpha_grid", {"n_tail": 13}))
+        rotor = self.build_rotor(
+            span_stations(n_span, self.span_info["spacing"]),
+            polars=self.load_polars(alpha),
+        )
+        evaluator = rotor_evaluator(rotor)
+        results = self._control_optimizer(rotor, run_config).optimize_all()
+        logger.info(
+            f"Solved {len(results)} wind speeds on a {n_span} station rotor, "
+            "polishing on the full rotor"
         )
-        self.rtip = rtip
+        return results, {
+            "n_span": n_span,
+            "n_alpha": len(alpha),
+            "niter_list": results.niter.tolist(),
+            "rotor_evaluator": evaluator.stats(),
+        }
+
+    @staticmethod
+    def _feature_options(section: dict, key: str):
+        """Return the options dict of a feature in a config section.
+
+        ``section`` is the ``bem`` section or one of its runs. A feature set
+        to true gives an empty dict, one unset or false gives None.
+        """
+        options = section.get(key)
+        if options is None or options is False:
+            return None
+        return {} if options is True else options
+
+    def run(
+        self,
+        cached: Optional[dict] = None,
+        hashes: Optional[Dict[str, str]] = None,
+        force: bool = False,
+    ) -> None:
+        """Execute the B3 BEM analysis.
 
-    def run(self) -> None:
-        """Execute the B3 BEM analysis."""
+        Runs in ``cached`` are not run again, their previous results are
+        written back as they are. ``hashes`` gives the input hash stored in
+        the metadata of each run, see step.input_hashes. With ``force`` the
+        checkpoints of optimal runs are deleted instead of resumed.
+        """
+        cached = cached or {}
+        hashes = hashes or {}
         bem = self.config["bem"]
         runs = bem.get("runs", {"default": {"type": "optimal"}})
+        results_format = bem.get("results_format", "json")
+        if results_format not in ("json", "npz"):
+            raise ValueError(f"Unknown results format: {results_format}")
         results_data = {
             "config": self.config,
             "planform": self.planform_data,
+            "span": self.span_info,
             "runs": {},
         }
+        evaluator = rotor_evaluator(self.rotor)
         for run_name, run_config in runs.items():
+            if run_name in cached:
+                logger.info(f"Run {run_name} is up to date, reusing its results")
+                results_data["runs"][run_name] = cached[run_name]
+                continue
+            evaluator_before = evaluator.stats()
             if run_config["type"] == "optimal":
-                results = self.copt.optimize_all()
+                cache_before = self.cache.stats()
+                fidelity = self._feature_options(run_config, "multi_fidelity")
+                coarse = None
+                if fidelity is not None:
+                    coarse = self._coarse_solution(run_config, fidelity)
+                checkpoint = None
+                if run_config.get("checkpoint", False):
+                    checkpoint = self.workdir / f"{run_name}_checkpoint.jsonl"
+                    if force and checkpoint.exists():
+                        logger.info(f"Deleting checkpoint {checkpoint}")
+                        checkpoint.unlink()
+                self.copt = self._control_optimizer(
+                    self.rotor,
+                    run_config,
+                    checkpoint=checkpoint,
+                    warm_started=coarse is not None,
+                )
+                results = self.copt.optimize_all(
+                    warm_start=None if coarse is None else coarse[0]
+                )
                 blade_data = self.copt.compute_bladeloads(results)
-                # Prepare output dict
-                output = {
-                    "uinf": [r[0] for r in results],
-                    "zone": [r[1] for r in results],
-                    "omega": [r[2] for r in results],
-                    "pitch": [r[3] for r in results],
-                    "P": [r[4] for r in results],
-                    "T": [r[5] for r in results],
-                    "CT": [r[6] for r in results],
-                    "CP": [r[7] for r in results],
-                    "Mb": [r[8] for r in results],
-                    "niter": [r[9] for r in results],
-                }
-                # Add TSR
-                output["tsr"] = [
-                    (omega * 2 * np.pi / 60) * self.rtip / uinf
-                    for omega, uinf in zip(output["omega"], output["uinf"])
-                ]
-                # Add tip speed
-                output["tip_speed"] = [
-                    omega * 2 * np.pi / 60 * self.rtip for omega in output["omega"]
-                ]
+                blade_data.add_sectional_moments()
                 run_data = {
-                    "performance": output,
+                    "performance": results,
                     "blade_loads": blade_data,
                     "metadata": {
                         "timestamp": str(pd.Timestamp.now()),
-                        "niter_list": [int(r[9]) for r in results],
+                        "niter_list": results.niter.tolist(),
                         "Uinf_low": float(self.copt.Uinf_low)
                         if self.copt.Uinf_low is not None
                         else None,
@@ -198,56 +376,98 @@ class B3BemRun:
                         "Uinf_switch": float(self.copt.Uinf_switch)
                         if self.copt.Uinf_switch is not None
                         else None,
+                        "evaluation_cache": {
+                            k: v - cache_before[k] if k != "size" else v
+                            for k, v in self.cache.stats().items()
+                        },
+                        "rotor_evaluator": evaluator.stats_since(evaluator_before),
+                    },
+                }
+                if coarse is not None:
+                    run_data["metadata"]["multi_fidelity"] = coarse[1]
+            elif (
+                run_config["type"] == "fixed_setpoints"
+                and "setpoints_file" in run_config
+            ):
+                output_path = self.workdir.parent / f"{run_name}.csv"
+                n_points = stream_setpoints(
+                    self.rotor,
+                    self.yml_dir / Path(run_config["setpoints_file"]),
+                    output_path,
+                    self.rtip,
+                    chunk_size=run_config.get("chunk_size", 4096),
+                    blade_loads=run_config.get("blade_loads", False),
+                    pool=None if run_config.get("serial") else get_pool(self.rotor),
+                )
+                run_data = {
+                    "performance_file": str(output_path),
+                    "metadata": {
+                        "timestamp": str(pd.Timestamp.now()),
+                        "n_points": n_points,
+                        "rotor_evaluator": evaluator.stats_since(evaluator_before),
                     },
                 }
             elif run_config["type"] == "fixed_setpoints":
                 setpoints = run_config["setpoints"]
-                operation = [
-                    {"uinf": s["wind_speed"], "omega": s["rpm"], "pitch": s["pitch"]}
-                    for s in setpoints
-                ]
-                fixed_run = FixedRun(self.rotor, operation, self.rtip)
+                operation = {
+                    "uinf": [s["wind_speed"] for s in setpoints],
+                    "omega": [s["rpm"] for s in setpoints],
+                    "pitch": [s["pitch"] for s in setpoints],
+                }
+                fixed_run = FixedRun(
+                    self.rotor,
+                    operation,
+                    self.rtip,
+                    chunk_size=run_config.get("chunk_size", 256),
+                    cache=self.cache if self.cache.disk is not None else None,
+                )
                 results = fixed_run.run()
                 blade_data = fixed_run.compute_bladeloads(results)
-                # Prepare output dict
-                output = {
-                    "uinf": [r[0] for r in results],
-                    "zone": [r[1] for r in results],
-                    "omega": [r[2] for r in results],
-                    "pitch": [r[3] for r in results],
-                    "P": [r[4] for r in results],
-                    "T": [r[5] for r in results],
-                    "CT": [r[6] for r in results],
-                    "CP": [r[7] for r in results],
-                    "Mb": [r[8] for r in results],
-                    "niter": [r[9] for r in results],
-                }
-                # Add TSR
-                output["tsr"] = [
-                    (omega * 2 * np.pi / 60) * self.rtip / uinf
-                    for omega, uinf in zip(output["omega"], output["uinf"])
-                ]
-                # Add tip speed
-                output["tip_speed"] = [
-                    omega * 2 * np.pi / 60 * self.rtip for omega in output["omega"]
-                ]
+                blade_data.add_sectional_moments()
                 run_data = {
-                    "performance": output,
+                    "performance": results,
                     "blade_loads": blade_data,
                     "metadata": {
                         "timestamp": str(pd.Timestamp.now()),
-                        "niter_list": [int(r[9]) for r in results],
+                        "niter_list": results.niter.tolist(),
+                        "rotor_evaluator": evaluator.stats_since(evaluator_before),
                     },
                 }
             else:
                 raise ValueError(f"Unknown run type: {run_config['type']}")
+            if run_name in hashes:
+                run_data["metadata"]["input_hash"] = hashes[run_name]
             results_data["runs"][run_name] = run_data
 
+        # Move the bulk arrays to a binary store, keeping metadata in JSON
+        if results_format == "npz":
+            arrays = {}
+            arrays_path = self.workdir.parent / "results.npz"
+            previous = ResultsStore(arrays_path) if cached else None
+            for run_name, run_data in results_data["runs"].items():
+                if run_name in cached:
+                    prefix = f"runs/{run_name}"
+                    arrays.update(
+                        {
+                            f"{prefix}/{key}": previous[f"{prefix}/{key}"]
+                            for key in previous.keys_under(prefix)
+                        }
+                    )
+                elif "performance" in run_data:
+                    run_data, run_arrays = split_run_arrays(
+                        f"runs/{run_name}", run_data
+                    )
+                    results_data["runs"][run_name] = run_data
+                    arrays.update(run_arrays)
+            save_arrays(arrays_path, arrays)
+            results_data["arrays"] = arrays_path.name
+            logger.info(f"Saved result arrays to {arrays_path}")
+
         # Convert to serializable
         results_data = convert_to_serializable(results_data)
 
         # Save to JSON
         output_path = self.workdir.parent / "results.json"
         with open(output_path, "w") as f:
-            json.dump(results_data, f, indent=4)
+            json.dump(results_data, f, indent=bem.get("json_indent", 4))
         logger.info(f"Saved results to {output_path}")
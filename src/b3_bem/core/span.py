@@ -0,0 +1,87 @@
+# Spanwise discretization for b3_bem.
+
+import logging
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+
+from .evaluator import rotor_evaluator
+from .table import RPM
+
+logger = logging.getLogger(__name__)
+
+SPACINGS = ("uniform", "cosine", "tip")
+# Station counts tried by converged_span, smallest first
+DEFAULT_CANDIDATES = (12, 16, 20, 25, 30, 40, 50, 60, 80, 100, 120, 150)
+
+
+def span_stations(n: int, spacing: str = "uniform") -> np.ndarray:
+    """Return n span fractions from root (0) to tip (1).
+
+    ``uniform`` spaces them evenly, ``cosine`` clusters them at the root and
+    the tip and ``tip`` clusters them at the tip only, where loads change
+    fastest.
+    """
+    if n < 2:
+        raise ValueError(f"Need at least 2 span stations, got {n}")
+    u = np.linspace(0, 1, n)
+    if spacing == "uniform":
+        return u
+    if spacing == "cosine":
+        return 0.5 * (1 - np.cos(np.pi * u))
+    if spacing == "tip":
+        return np.sin(0.5 * np.pi * u)
+    raise ValueError(f"Unknown span spacing: {spacing}, use one of {SPACINGS}")
+
+
+def rotor_metrics(
+    rotor, Uinf: float, Omega: float, pitch: float
+) -> Tuple[float, float]:
+    """Return the power coefficient and root flapwise moment at a point."""
+    evaluator = rotor_evaluator(rotor)
+    outputs, _ = evaluator.evaluate([Uinf], [Omega], [pitch], coefficients=True)
+    loads = evaluator.loads(Uinf, Omega, pitch)[0]
+    moment = np.trapezoid(loads["Np"] * rotor.r, rotor.r)
+    return float(np.ravel(outputs["CP"])[0]), float(moment)
+
+
+def converged_span(
+    build: Callable[[np.ndarray], object],
+    rtip: float,
+    spacing: str = "uniform",
+    tolerance: float = 0.005,
+    reference: int = 200,
+    candidates: Sequence[int] = DEFAULT_CANDIDATES,
+    uinf: float = 8.0,
+    tsr: float = 8.0,
+    pitch: float = 0.0,
+) -> Tuple[int, Dict[str, float], bool]:
+    """Return the smallest station count that matches a refined rotor.
+
+    ``build`` returns a rotor for given span fractions. Rotors with the
+    candidate counts are compared with one of ``reference`` stations at
+    wind speed ``uinf`` and tip speed ratio ``tsr``, and the first whose
+    power coefficient and root flapwise moment are both within the relative
+    ``tolerance`` is returned along with its errors and True. When none is,
+    the largest candidate is returned with its errors and False, or the
+    reference count with no errors when there is no candidate below it.
+    """
+    Omega = tsr * uinf / rtip / RPM
+    cp_ref, moment_ref = rotor_metrics(
+        build(span_stations(reference, spacing)), uinf, Omega, pitch
+    )
+    n, errors = reference, {}
+    for n in sorted(c for c in candidates if c < reference):
+        cp, moment = rotor_metrics(build(span_stations(n, spacing)), uinf, Omega, pitch)
+        errors = {
+            "cp": abs(cp - cp_ref) / max(abs(cp_ref), 1e-12),
+            "root_moment": abs(moment - moment_ref) / max(abs(moment_ref), 1e-12),
+        }
+        logger.debug(f"{n} span stations: {errors}")
+        if max(errors.values()) <= tolerance:
+            return n, errors, True
+    logger.warning(
+        f"No span station count below {reference} within tolerance {tolerance}, "
+        f"using {n} with errors {errors}"
+    )
+    return n, errors, False
@@ -1,32 +1,144 @@
 #!/usr/bin/env python3
 """Statesman step for running B3 BEM analysis."""
 
+import hashlib
+import json
 import logging
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
+from typing import Dict, Optional
 from .runner import B3BemRun
+from .tiers import apply_tier
 from ..cli.yml_portable import yaml_make_portable
 
 logger = logging.getLogger(__name__)
 
+# Settings that change how a run is executed but not its results
+_EXECUTION_KEYS = {
+    "bem": ("cache_size", "disk_cache"),
+    "run": ("serial", "chunk_size", "fused_loads", "checkpoint"),
+}
+
+
+def _package_version() -> str:
+    try:
+        return version("b3_bem")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _file_digest(path: Path) -> str:
+    """Return the sha1 of a file's contents, read in blocks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def input_hashes(config: dict, yml_dir: Path) -> Dict[str, str]:
+    """Return a hash of the inputs of every run, by run name.
+
+    A run's hash covers the package version, the config outside
+    ``bem.runs``, the contents of the polar files, the run's own config and
+    the contents of its setpoints file, so editing one run leaves the hashes
+    of the others unchanged. Execution settings such as ``serial`` or
+    ``chunk_size`` are left out, as they do not change the results.
+    """
+    bem = config.get("bem", {})
+    runs = bem.get("runs", {"default": {"type": "optimal"}})
+    shared = {
+        "version": _package_version(),
+        "config": {k: v for k, v in config.items() if k != "bem"},
+        "bem": {
+            k: v
+            for k, v in bem.items()
+            if k != "runs" and k not in _EXECUTION_KEYS["bem"]
+        },
+        "polars": [
+            _file_digest(yml_dir / Path(polar["file"]))
+            for polar in bem.get("polars") or []
+        ],
+    }
+    hashes = {}
+    for run_name, run_config in runs.items():
+        run = {k: v for k, v in run_config.items() if k not in _EXECUTION_KEYS["run"]}
+        inputs = {"shared": shared, "run": run}
+        if "setpoints_file" in run_config:
+            inputs["setpoints"] = _file_digest(
+                yml_dir / Path(run_config["setpoints_file"])
+            )
+        hashes[run_name] = hashlib.sha1(
+            json.dumps(inputs, sort_keys=True, default=str).encode()
+        ).hexdigest()
+    return hashes
+
 
 class B3BemStep:
-    """Step for running B3 BEM analysis."""
+    """Step for running B3 BEM analysis.
+
+    Runs whose input hash matches the one stored with their results in
+    ``results.json`` are not run again, unless ``force`` is set, which also
+    discards the checkpoints of interrupted optimal runs. A ``tier``
+    applies the settings of an accuracy tier to the config, see
+    tiers.apply_tier.
+    """
 
-    def __init__(self, config_path, force=False):
+    def __init__(self, config_path, force=False, tier="standard"):
         self.config_path = config_path
         self.force = force
+        self.tier = tier
+
+    def _previous_results(self) -> Optional[dict]:
+        results_path = self.workdir / "results.json"
+        if self.force or not results_path.exists():
+            return None
+        try:
+            with open(results_path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            logger.warning(f"Ignoring unreadable {results_path}")
+            return None
+
+    def _cached_runs(self, previous: dict, hashes: Dict[str, str]) -> dict:
+        """Return the previous results of the runs whose inputs are unchanged."""
+        if "arrays" in previous and not (self.workdir / previous["arrays"]).exists():
+            return {}
+        cached = {}
+        for run_name, run_data in previous.get("runs", {}).items():
+            metadata = run_data.get("metadata", {})
+            if metadata.get("input_hash") != hashes.get(run_name):
+                continue
+            if "performance_file" in run_data and not (
+                Path(run_data["performance_file"]).exists()
+            ):
+                continue
+            cached[run_name] = run_data
+        return cached
 
     def run(self):
         """Execute the B3 BEM analysis step."""
         # Load config using custom loader
         config_data = yaml_make_portable(Path(self.config_path))
-        self.config = config_data.model_dump()
+        self.config = apply_tier(config_data.model_dump(), self.tier)
 
         # Set workdir relative to YAML file
         self.workdir = Path(self.config_path).parent / self.config["workdir"]
         self.workdir.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
 
+        yml_dir = Path(self.config_path).parent
+        hashes = input_hashes(self.config, yml_dir)
+        previous = self._previous_results()
+        cached = {} if previous is None else self._cached_runs(previous, hashes)
+        if previous is not None and (
+            cached.keys() == hashes.keys() == previous.get("runs", {}).keys()
+        ):
+            logger.info(
+                f"B3 BEM results in {self.workdir} are up to date, use --force to rerun"
+            )
+            return
+
         # Run B3 BEM analysis
-        ccblade = B3BemRun(self.config, Path(self.config_path).parent)
-        ccblade.run()
+        ccblade = B3BemRun(self.config, yml_dir)
+        ccblade.run(cached=cached, hashes=hashes, force=self.force)
         logger.info(f"B3 BEM analysis completed and saved to {self.workdir}")
@@ -0,0 +1,113 @@
+# Binary columnar results store for b3_bem.
+
+import os
+import struct
+import zipfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+# Size of the fixed part of a ZIP local file header
+_LOCAL_HEADER = 30
+
+
+def split_run_arrays(prefix: str, run_data: dict) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """Split the performance and blade loads of a run off into arrays.
+
+    The run holds OperatingPoints as performance and BladeLoads as
+    blade_loads. Returns the run data left for JSON and the arrays keyed by
+    ``<prefix>/performance/<column>`` and ``<prefix>/blade_loads/<name>``. The
+    loads become one dense (n_points, n_fields, n_span) array ``loads`` whose
+    field order is kept in the JSON as ``blade_loads.load_fields``.
+    """
+    arrays = {}
+    json_data = {
+        k: v for k, v in run_data.items() if k not in ("performance", "blade_loads")
+    }
+    for key, column in run_data["performance"].to_dict().items():
+        arrays[f"{prefix}/performance/{key}"] = np.asarray(column)
+    if "blade_loads" in run_data:
+        blade_loads = run_data["blade_loads"]
+        arrays[f"{prefix}/blade_loads/loads"] = blade_loads.dense()
+        for key, value in blade_loads.summary().items():
+            arrays[f"{prefix}/blade_loads/{key}"] = np.asarray(value, dtype=float)
+        json_data["blade_loads"] = {"load_fields": list(blade_loads.fields)}
+    return json_data, arrays
+
+
+def save_arrays(path: Path, arrays: Dict[str, np.ndarray]) -> None:
+    """Write arrays to an uncompressed NPZ file that ResultsStore can map.
+
+    The file is written next to path and moved over it, so stores still
+    mapping the previous file stay valid.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.stem}.tmp.npz")
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+
+class ResultsStore(Mapping):
+    """Read-only view of the arrays of an NPZ results file.
+
+    Arrays are memory-mapped from the file on first access, so only the
+    parts a caller indexes are read from disk.
+    """
+
+    def __init__(self, path: Path):
+        """Index the members of the NPZ file at path."""
+        self.path = Path(path)
+        with zipfile.ZipFile(self.path) as archive:
+            self._members = {
+                info.filename[: -len(".npy")]: info
+                for info in archive.infolist()
+                if info.filename.endswith(".npy")
+            }
+        self._arrays = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = self._map(self._members[name])
+        return self._arrays[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def keys_under(self, prefix: str) -> List[str]:
+        """Return the names below a prefix, without the prefix."""
+        prefix = prefix.rstrip("/") + "/"
+        return [
+            name[len(prefix) :] for name in self._members if name.startswith(prefix)
+        ]
+
+    def _map(self, info: zipfile.ZipInfo) -> np.ndarray:
+        if info.compress_type != zipfile.ZIP_STORED:
+            with np.load(self.path) as npz:
+                return npz[info.filename[: -len(".npy")]]
+        with open(self.path, "rb") as f:
+            f.seek(info.header_offset)
+            header = f.read(_LOCAL_HEADER)
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + _LOCAL_HEADER + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+        if dtype.hasobject or 0 in shape:
+            with np.load(self.path, allow_pickle=False) as npz:
+                return npz[info.filename[: -len(".npy")]]
+        return np.memmap(
+            self.path,
+            dtype=dtype,
+            mode="r",
+            offset=offset,
+            shape=shape,
+            order="F" if fortran_order else "C",
+        )
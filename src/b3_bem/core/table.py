@@ -0,0 +1,162 @@
+# Rotor performance lookup table for b3_bem.
+
+from pathlib import Path
+import numpy as np
+import logging
+from scipy.interpolate import RectBivariateSpline
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RPM = 2 * np.pi / 60  # rad/s per RPM
+
+
+class PerformanceTable:
+    """Non-dimensional rotor performance over a (tip speed ratio, pitch) grid.
+
+    Without Reynolds effects CP, CT and CQ depend only on the tip speed ratio
+    and pitch, so one table evaluated at a reference wind speed gives the
+    power at any operating point as ``P = q_ref * (Uinf / U_ref)**3 * CP``.
+    """
+
+    def __init__(
+        self,
+        tsr: np.ndarray,
+        pitch: np.ndarray,
+        CP: np.ndarray,
+        CT: np.ndarray,
+        CQ: np.ndarray,
+        rtip: float,
+        U_ref: float,
+        q_ref: float,
+        fingerprint: str = "",
+    ):
+        """Initialize from coefficient arrays of shape (len(tsr), len(pitch))."""
+        self.tsr = np.asarray(tsr, dtype=float)
+        self.pitch = np.asarray(pitch, dtype=float)
+        self.CP = np.asarray(CP, dtype=float)
+        self.CT = np.asarray(CT, dtype=float)
+        self.CQ = np.asarray(CQ, dtype=float)
+        self.rtip = rtip
+        self.U_ref = U_ref
+        self.q_ref = q_ref
+        self.fingerprint = fingerprint
+        self._cp = RectBivariateSpline(self.tsr, self.pitch, self.CP)
+
+    @classmethod
+    def compute(
+        cls,
+        evaluate: Callable,
+        rtip: float,
+        tsr: np.ndarray,
+        pitch: np.ndarray,
+        U_ref: float = 8.0,
+        fingerprint: str = "",
+    ) -> "PerformanceTable":
+        """Evaluate the table with one vectorized call of ``evaluate``."""
+        tt, pp = np.meshgrid(tsr, pitch, indexing="ij")
+        Omega = tt.ravel() * U_ref / rtip / RPM
+        outputs, _ = evaluate(
+            np.full(Omega.size, U_ref), Omega, pp.ravel(), coefficients=True
+        )
+        shape = tt.shape
+        CP = np.asarray(outputs["CP"]).reshape(shape)
+        P = np.asarray(outputs["P"]).reshape(shape)
+        # P / CP is the dynamic power 0.5 rho A U^3, the same at every point
+        k = np.unravel_index(np.argmax(np.abs(CP)), shape)
+        q_ref = float(P[k] / CP[k])
+        logger.info(f"Computed performance table with {Omega.size} points")
+        return cls(
+            tsr,
+            pitch,
+            CP,
+            np.asarray(outputs["CT"]).reshape(shape),
+            np.asarray(outputs["CQ"]).reshape(shape),
+            rtip,
+            U_ref,
+            q_ref,
+            fingerprint,
+        )
+
+    def save(self, path: Path) -> None:
+        """Save the table as NPZ."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            tsr=self.tsr,
+            pitch=self.pitch,
+            CP=self.CP,
+            CT=self.CT,
+            CQ=self.CQ,
+            rtip=self.rtip,
+            U_ref=self.U_ref,
+            q_ref=self.q_ref,
+            fingerprint=self.fingerprint,
+        )
+        logger.info(f"Saved performance table to {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> "PerformanceTable":
+        """Load a table saved with save."""
+        with np.load(path) as data:
+            return cls(
+                data["tsr"],
+                data["pitch"],
+                data["CP"],
+                data["CT"],
+                data["CQ"],
+                float(data["rtip"]),
+                float(data["U_ref"]),
+                float(data["q_ref"]),
+                str(data["fingerprint"]),
+            )
+
+    def tip_speed_ratio(self, Uinf, Omega) -> np.ndarray:
+        """Return the tip speed ratio of Omega (RPM) at Uinf."""
+        return np.asarray(Omega) * RPM * self.rtip / np.asarray(Uinf)
+
+    def power(self, Uinf, Omega, pitch) -> np.ndarray:
+        """Interpolate the rotor power at operating points."""
+        Uinf = np.asarray(Uinf, dtype=float)
+        tsr = np.clip(self.tip_speed_ratio(Uinf, Omega), self.tsr[0], self.tsr[-1])
+        pitch = np.clip(pitch, self.pitch[0], self.pitch[-1])
+        cp = self._cp.ev(tsr, pitch)
+        return self.q_ref * (Uinf / self.U_ref) ** 3 * cp
+
+    def optimum(self, n: int = 200) -> Tuple[float, float]:
+        """Return the (tip speed ratio, pitch) of maximum CP."""
+        tsr = np.linspace(self.tsr[0], self.tsr[-1], n)
+        pitch = np.linspace(self.pitch[0], self.pitch[-1], n)
+        cp = self._cp(tsr, pitch)
+        i, j = np.unravel_index(np.argmax(cp), cp.shape)
+        return float(tsr[i]), float(pitch[j])
+
+    def pitch_for(
+        self,
+        Uinf: np.ndarray,
+        Omega: np.ndarray,
+        rating: Optional[float] = None,
+        resolution: float = 0.01,
+    ) -> np.ndarray:
+        """Return the pitch of maximum power at fixed Omega for every Uinf.
+
+        With a rating, return instead the pitch past the power maximum where
+        power falls to rating, or the maximum when rating is not reached.
+        """
+        Uinf = np.atleast_1d(np.asarray(Uinf, dtype=float))
+        Omega = np.broadcast_to(Omega, Uinf.shape)
+        pitch = np.arange(self.pitch[0], self.pitch[-1] + resolution, resolution)
+        P = self.power(Uinf[:, None], Omega[:, None], pitch[None, :])
+        best = np.argmax(P, axis=1)
+        result = pitch[best]
+        if rating is None:
+            return result
+        for i, k in enumerate(best):
+            below = np.flatnonzero(P[i, k:] <= rating)
+            if P[i, k] <= rating or below.size == 0:
+                continue
+            j = k + below[0]
+            # Linear interpolation between the samples around rating
+            p0, p1 = P[i, j - 1], P[i, j]
+            result[i] = pitch[j - 1] + (p0 - rating) / (p0 - p1) * resolution
+        return result
@@ -0,0 +1,71 @@
+# Accuracy tiers for b3_bem runs.
+
+import copy
+from dataclasses import replace
+
+from .options import SolverOptions
+
+TIERS = ("draft", "standard", "final")
+
+# Settings of each tier, merged over bem and over every optimal run
+_BEM = {
+    "draft": {
+        "span": {"n": 15, "spacing": "cosine"},
+        "alpha_grid": {"n_tail": 9},
+        "diagnostic_plots": False,
+        "json_indent": None,
+    },
+    "standard": {},
+    "final": {
+        "span": {"n": "auto", "spacing": "cosine", "tolerance": 1e-3},
+        "alpha_grid": {"n_attached": 40, "n_stall": 25},
+    },
+}
+# SolverOptions fields overridden in every optimal run, runs solved from the
+# lookup table alone are left as they are
+_OPTIMAL = {
+    "draft": {
+        "tol": 1e-3,
+        "batched": True,
+        "analytic_gradients": True,
+        "continuation": False,
+        "fused_loads": False,
+    },
+    "standard": {},
+    "final": {},
+}
+
+
+def apply_tier(config: dict, tier: str) -> dict:
+    """Return a copy of config with the settings of an accuracy tier.
+
+    ``draft`` uses 15 cosine-spaced span stations, a coarser alpha grid,
+    every other wind speed, batched optimization with analytic gradients and
+    loose tolerances, with the solver options that conflict with batching
+    turned off, and skips the planform and polar plots and the JSON
+    indentation. ``standard`` leaves the config as it is. ``final`` picks the
+    span station count by convergence, see span.converged_span, and adds alpha
+    points around stall. Tier settings take precedence over the config.
+    """
+    if tier not in TIERS:
+        raise ValueError(f"Unknown tier: {tier}, use one of {TIERS}")
+    if tier == "standard":
+        return config
+    config = copy.deepcopy(config)
+    bem = config.setdefault("bem", {})
+    bem.update(copy.deepcopy(_BEM[tier]))
+    bem["tier"] = tier
+    if tier == "draft" and bem.get("uinf") is not None:
+        uinf = list(bem["uinf"])
+        bem["uinf"] = uinf[::2] + ([uinf[-1]] if len(uinf) % 2 == 0 else [])
+    runs = bem.setdefault("runs", {"default": {"type": "optimal"}})
+    for run_config in runs.values():
+        if run_config.get("type") != "optimal":
+            continue
+        options = SolverOptions.from_config(run_config)
+        table = options.lookup_table
+        if table is not None and not table.get("polish", True):
+            continue
+        options = replace(options, **_OPTIMAL[tier])
+        run_config.update({name: getattr(options, name) for name in _OPTIMAL[tier]})
+    return config
@@ -7,6 +7,8 @@ import math
 import logging
 from typing import List, Tuple, Dict, Optional, Any
 
+from ..core.moments import sectional_moments
+
 logger = logging.getLogger(__name__)
 
 
@@ -142,22 +144,21 @@ def plot_moments(
     moments_dict: Dict[str, np.ndarray],
     of: Path = Path("moments.png"),
 ) -> None:
-    """Plot sectional moment distributions and root moments."""
+    """Plot sectional moment distributions and root moments.
+
+    Sectional distributions are taken from the sectional_flapwise and
+    sectional_edgewise entries of moments_dict when present, and computed
+    from the loads otherwise.
+    """
     fig, axs = plt.subplots(3, 1, figsize=(15, 20))
-    # Compute sectional moments for each load
-    sectional_flap_list = []
-    sectional_edge_list = []
-    for loads in loads_list:
-        Np = loads["Np"]
-        Tp = loads["Tp"]
-        sectional_flap = np.array(
-            [np.trapezoid(Np[i:] * (r[i:] - r[i]), r[i:]) for i in range(len(r))]
-        )
-        sectional_edge = np.array(
-            [np.trapezoid(Tp[i:] * (r[i:] - r[i]), r[i:]) for i in range(len(r))]
-        )
-        sectional_flap_list.append(sectional_flap)
-        sectional_edge_list.append(sectional_edge)
+    sectional_flap_list = moments_dict.get("sectional_flapwise")
+    if sectional_flap_list is None:
+        Np = np.array([loads["Np"] for loads in loads_list]).reshape(-1, len(r))
+        sectional_flap_list = sectional_moments(r, Np)
+    sectional_edge_list = moments_dict.get("sectional_edgewise")
+    if sectional_edge_list is None:
+        Tp = np.array([loads["Tp"] for loads in loads_list]).reshape(-1, len(r))
+        sectional_edge_list = sectional_moments(r, Tp)
     # Flapwise sectional distribution
     for i, sec in enumerate(sectional_flap_list):
         axs[0].plot(r, sec, label=f"uinf={uinf_list[i]:.1f}")
@@ -2,15 +2,31 @@
 
 from pathlib import Path
 import json
+import logging
 import numpy as np
+import pandas as pd
+from ..core.results import BladeLoads
+from ..core.store import ResultsStore
 from .plots import plot_planform, rotorplot, plot_bladeloads, plot_moments
 
+logger = logging.getLogger(__name__)
+
+# Columns of streamed setpoint results renamed to the performance keys
+_STREAMED_COLUMNS = {"wind_speed": "uinf", "rpm": "omega"}
+
 
 class B3BemPlotter:
     """Plotter for B3 BEM results from JSON."""
 
     def __init__(self, results_path: Path, run_name: str = None):
-        """Load results from JSON file."""
+        """Load results from JSON file.
+
+        When the JSON points to a binary array store (``arrays``), the
+        performance and blade loads are memory-mapped from it and only read
+        by the plots that need them. Streamed fixed runs are read from their
+        ``performance_file`` and have no blade load plots.
+        """
+        self.results_dir = Path(results_path).parent
         with open(results_path, "r") as f:
             self.data = json.load(f)
         if "runs" in self.data:
@@ -20,38 +36,50 @@ class B3BemPlotter:
         else:
             # Backward compatibility
             self.run_data = self.data
-        # Convert lists back to arrays
-        self.run_data["planform"]["r"] = np.array(self.run_data["planform"]["r"])
-        self.run_data["planform"]["chord"] = np.array(
-            self.run_data["planform"]["chord"]
-        )
-        self.run_data["planform"]["twist"] = np.array(
-            self.run_data["planform"]["twist"]
-        )
-        self.run_data["planform"]["thickness"] = np.array(
-            self.run_data["planform"]["thickness"]
-        )
-        self.run_data["performance"]["uinf"] = np.array(
-            self.run_data["performance"]["uinf"]
-        )
-        self.run_data["blade_loads"]["r"] = np.array(self.run_data["blade_loads"]["r"])
-        self.run_data["blade_loads"]["combined_rms"] = np.array(
-            self.run_data["blade_loads"]["combined_rms"]
-        )
-        # Convert loads_list back to dicts with arrays
-        self.run_data["blade_loads"]["loads_list"] = [
-            {k: np.array(v) for k, v in load.items()}
-            for load in self.run_data["blade_loads"]["loads_list"]
+        self.prefix = f"runs/{run_name}"
+        self.arrays = None
+        if "arrays" in self.data:
+            self.arrays = ResultsStore(Path(results_path).parent / self.data["arrays"])
+
+    def _planform(self) -> dict:
+        pf = self.run_data.get("planform", self.data.get("planform"))
+        return {k: np.asarray(v) for k, v in pf.items()}
+
+    def _performance(self) -> dict:
+        if "performance_file" in self.run_data:
+            path = Path(self.run_data["performance_file"])
+            if not path.exists():
+                # Moved along with results.json
+                path = self.results_dir / path.name
+            frame = pd.read_csv(path).rename(columns=_STREAMED_COLUMNS)
+            return {k: frame[k].to_numpy() for k in frame.columns}
+        if self.arrays is None:
+            return {k: np.asarray(v) for k, v in self.run_data["performance"].items()}
+        prefix = f"{self.prefix}/performance"
+        return {k: self.arrays[f"{prefix}/{k}"] for k in self.arrays.keys_under(prefix)}
+
+    def _blade_loads(self) -> dict:
+        if self.arrays is None:
+            return BladeLoads.from_dict(self.run_data["blade_loads"])
+        prefix = f"{self.prefix}/blade_loads"
+        bl = {k: self.arrays[f"{prefix}/{k}"] for k in self.arrays.keys_under(prefix)}
+        # Per-point views into the dense (n_points, n_fields, n_span) array
+        loads = bl.pop("loads")
+        fields = self.run_data["blade_loads"]["load_fields"]
+        bl["loads_list"] = [
+            {field: loads[i, j] for j, field in enumerate(fields)}
+            for i in range(loads.shape[0])
         ]
+        return bl
 
     def plot_planform(self, of: Path = Path("ccblade_planform.png")):
         """Plot planform."""
-        pf = self.run_data["planform"]
+        pf = self._planform()
         plot_planform(pf["r"], pf["chord"], pf["twist"], pf["thickness"], of)
 
     def plot_rotor_performance(self, of: Path = Path("ccblade_out.png")):
         """Plot rotor performance."""
-        perf = self.run_data["performance"]
+        perf = self._performance()
         meta = self.run_data.get("metadata", {})
         rotorplot(
             perf,
@@ -65,17 +93,26 @@ class B3BemPlotter:
 
     def plot_bladeloads(self, of: Path = Path("ccblade_bladeloads.png")):
         """Plot blade loads."""
-        bl = self.run_data["blade_loads"]
+        if "blade_loads" not in self.run_data:
+            logger.info(f"No blade loads in {self.prefix}, skipping {of}")
+            return
+        bl = self._blade_loads()
         plot_bladeloads(bl["r"], bl["loads_list"], bl["uinf_list"], of)
 
     def plot_moments(self, of: Path = Path("ccblade_moments.png")):
         """Plot moments."""
-        bl = self.run_data["blade_loads"]
+        if "blade_loads" not in self.run_data:
+            logger.info(f"No blade loads in {self.prefix}, skipping {of}")
+            return
+        bl = self._blade_loads()
         moments_dict = {
-            "flapwise": np.array(bl["flapwise_moments"]),
-            "edgewise": np.array(bl["edgewise_moments"]),
+            "flapwise": bl["flapwise_moments"],
+            "edgewise": bl["edgewise_moments"],
             "combined_rms": bl["combined_rms"],
         }
+        for name in ("sectional_flapwise", "sectional_edgewise"):
+            if name in bl:
+                moments_dict[name] = bl[name]
         plot_moments(bl["r"], bl["loads_list"], bl["uinf_list"], moments_dict, of)
 
     def plot_all(self, output_dir: Path = Path(".")):
@@ -3,75 +3,195 @@
 from pathlib import Path
 import numpy as np
 from ccblade.ccblade import CCAirfoil
+import hashlib
 import os
+import pickle
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# Fitted airfoils by (polar set hash, thickness), shared by all rotors built
+AIRFOIL_CACHE_SIZE = 1024
+_airfoil_cache: "OrderedDict[Tuple[str, float], CCAirfoil]" = OrderedDict()
 
-def load_polar(pname: Path) -> Tuple[List[float], np.ndarray, np.ndarray, np.ndarray]:
-    """Load and interpolate a polar by name to a set alpha range."""
-    logger.info(f"loading polar {pname}")
-    if not os.path.isfile(pname):
-        raise IOError(f"Polar {pname} not found")
-
-    with open(pname, "r") as f:
-        lines = f.readlines()
 
+def _parse_polar(text: str) -> np.ndarray:
+    """Return the rows of a polar table, from the -180 line up to EOT."""
+    lines = text.splitlines()
     read_start_index = next(
         i for i, line in enumerate(lines) if line.startswith("-180")
     )
     read_end_index = next((i for i, line in enumerate(lines) if "EOT" in line), None)
+    rows = lines[read_start_index:read_end_index]
+    ncols = len(rows[0].split())
+    return np.array(" ".join(rows).split(), dtype=float).reshape(-1, ncols)
 
-    lst = [
-        [float(j) for j in line.split()]
-        for line in lines[read_start_index:read_end_index]
-    ]
-    g = list(zip(*lst))
-    alpha_new = (
-        list(np.linspace(-180, -20, 25))
-        + list(np.linspace(-19, 20, 29))
-        + list(np.linspace(21, 180, 25))
+
+def _read_polar_table(pname: Path, cache_dir: Optional[Path] = None) -> np.ndarray:
+    """Return the parsed table of a polar file, through the cache if given.
+
+    Cache entries are pickle files named after the resolved path. An entry is
+    used as is while the file's mtime and size are unchanged, and after a
+    change when the content hash still matches, so only edited files are
+    parsed again.
+    """
+    if cache_dir is None:
+        return _parse_polar(Path(pname).read_text())
+    path = Path(pname).resolve()
+    stat = path.stat()
+    entry = Path(cache_dir) / f"{hashlib.sha1(str(path).encode()).hexdigest()}.pkl"
+    cached = None
+    if entry.exists():
+        try:
+            with open(entry, "rb") as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            logger.warning(f"Ignoring unreadable polar cache entry {entry}")
+    if (
+        cached is not None
+        and cached["mtime_ns"] == stat.st_mtime_ns
+        and cached["size"] == stat.st_size
+    ):
+        return cached["table"]
+    content = path.read_bytes()
+    digest = hashlib.sha1(content).hexdigest()
+    if cached is not None and cached["digest"] == digest:
+        table = cached["table"]
+    else:
+        table = _parse_polar(content.decode())
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp_entry = entry.with_name(f"{entry.stem}.{os.getpid()}.tmp")
+    with open(tmp_entry, "wb") as f:
+        pickle.dump(
+            {
+                "table": table,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": digest,
+            },
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(tmp_entry, entry)
+    return table
+
+
+def alpha_grid(
+    n_tail: int = 25,
+    n_attached: int = 29,
+    n_stall: int = 0,
+    stall: Tuple[float, float] = (8.0, 20.0),
+) -> np.ndarray:
+    """Return the angles of attack polars are resampled to, in degrees.
+
+    The defaults give the 79-point grid of n_tail points over each of
+    [-180, -20] and [21, 180] and n_attached points over [-19, 20]. With
+    n_stall set, that many points over the stall range and as many over
+    its mirror at negative alpha are merged in.
+    """
+    alpha = np.concatenate(
+        [
+            np.linspace(-180, -20, n_tail),
+            np.linspace(-19, 20, n_attached),
+            np.linspace(21, 180, n_tail),
+        ]
     )
-    cl = np.interp(alpha_new, g[0], g[1])
-    cd = np.interp(alpha_new, g[0], g[2])
-    cm = np.interp(alpha_new, g[0], g[3])
+    if n_stall > 0:
+        dense = np.linspace(*stall, n_stall)
+        alpha = np.union1d(alpha, np.concatenate([-dense, dense]))
+    return alpha
+
+
+def load_polar(
+    pname: Path, cache_dir: Optional[Path] = None, alpha: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Load and interpolate a polar by name to a set alpha range.
+
+    The polar is resampled to alpha, by default alpha_grid(). With a
+    cache_dir the parsed table is cached there, see _read_polar_table.
+    """
+    logger.info(f"loading polar {pname}")
+    if not os.path.isfile(pname):
+        raise IOError(f"Polar {pname} not found")
+
+    table = _read_polar_table(pname, cache_dir)
+    alpha_new = alpha_grid() if alpha is None else np.asarray(alpha, dtype=float)
+    cl = np.interp(alpha_new, table[:, 0], table[:, 1])
+    cd = np.interp(alpha_new, table[:, 0], table[:, 2])
+    cm = np.interp(alpha_new, table[:, 0], table[:, 3])
     return [alpha_new, cl, cd, cm]
 
 
+def load_polars(
+    pnames: List[Path],
+    cache_dir: Optional[Path] = None,
+    max_workers: int = 8,
+    alpha: Optional[np.ndarray] = None,
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """Load several polars concurrently, see load_polar, in the given order."""
+    if len(pnames) < 2:
+        return [load_polar(pname, cache_dir, alpha) for pname in pnames]
+    with ThreadPoolExecutor(min(max_workers, len(pnames))) as executor:
+        return list(
+            executor.map(lambda pname: load_polar(pname, cache_dir, alpha), pnames)
+        )
+
+
 def interpolate_polars(
     polars: List[tuple], tnew: np.ndarray, of: Optional[Path] = None
 ) -> List[CCAirfoil]:
-    """Interpolate polars to new thickness values and return CCAirfoil objects."""
-    indices = range(len(polars[0][1][0]))
-    t = [polar[0] for polar in polars]
-    data = np.array(
-        [
-            [
-                np.interp(
-                    np.flip(tnew),
-                    np.flip(t),
-                    np.flip([polar[1][i][idx] for polar in polars]),
-                )
-                for idx in indices
-            ]
-            for i in range(4)
-        ]
-    )
-    output_polars = [
-        CCAirfoil(
-            Re=[1e6],
-            alpha=data[0, :, i],
-            cl=data[1, :, i],
-            cd=data[2, :, i],
-            cm=data[3, :, i],
+    """Interpolate polars to new thickness values and return CCAirfoil objects.
+
+    The polars are (thickness, (alpha, cl, cd, cm)) pairs on a shared alpha
+    grid. All fields at all alphas are interpolated linearly in thickness at
+    once, clamped to the thinnest and thickest polar as np.interp does.
+    Stations with the same clamped thickness share one CCAirfoil, and fitted
+    airfoils are kept per (polar set, thickness) for later calls.
+    """
+    t = np.array([polar[0] for polar in polars], dtype=float)
+    table = np.array([polar[1] for polar in polars], dtype=float)
+    order = np.argsort(t, kind="stable")
+    t, table = t[order], table[order]
+    x = np.clip(np.asarray(tnew, dtype=float), t[0], t[-1])
+    x_unique, inverse = np.unique(x, return_inverse=True)
+    if len(t) == 1:
+        stations = np.repeat(table, len(x_unique), axis=0)
+    else:
+        hi = np.clip(np.searchsorted(t, x_unique, side="right"), 1, len(t) - 1)
+        lo = hi - 1
+        span = t[hi] - t[lo]
+        w = np.divide(
+            x_unique - t[lo], span, out=np.zeros_like(x_unique), where=span > 0
         )
-        for i in reversed(range(len(tnew)))
+        w = w[:, None, None]
+        stations = (1 - w) * table[lo] + w * table[hi]
+    polar_set = hashlib.sha1(t.tobytes() + table.tobytes()).hexdigest()
+    airfoils = [
+        _cached_airfoil((polar_set, thickness), fields)
+        for thickness, fields in zip(x_unique.tolist(), stations)
     ]
+    output_polars = [airfoils[i] for i in inverse.ravel()]
     if of:
         from ..plots.plots import plot_polars, plot_interpolated_polars
 
+        # (field, alpha, station), with stations in the order of tnew
+        data = stations[inverse.ravel()].transpose(1, 2, 0)
         plot_polars(polars, of=of.with_name(of.stem + "_in" + of.suffix))
         plot_interpolated_polars(tnew, data, of=of)
     return output_polars
+
+
+def _cached_airfoil(key: Tuple[str, float], fields: np.ndarray) -> CCAirfoil:
+    """Return the CCAirfoil of interpolated (alpha, cl, cd, cm) fields by key."""
+    if key in _airfoil_cache:
+        _airfoil_cache.move_to_end(key)
+        return _airfoil_cache[key]
+    alpha, cl, cd, cm = fields
+    airfoil = CCAirfoil(Re=[1e6], alpha=alpha, cl=cl, cd=cd, cm=cm)
+    _airfoil_cache[key] = airfoil
+    if len(_airfoil_cache) > AIRFOIL_CACHE_SIZE:
+        _airfoil_cache.popitem(last=False)
+    return airfoil
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+
+class PowerRotor:
+    """Picklable rotor with a power maximum at 2 degrees pitch.
+
+    Power grows with Uinf**3 independently of Omega and falls off in pitch
+    over ``width`` squared degrees. Calls to evaluate are counted.
+    """
+
+    r = np.linspace(0, 60, 5)
+
+    def __init__(self, width=50.0):
+        self.width = width
+        self.calls = 0
+
+    def evaluate(self, Uinf, Omega, pitch, coefficients=False):
+        self.calls += 1
+        Uinf, pitch = np.asarray(Uinf, dtype=float), np.asarray(pitch, dtype=float)
+        P = 1e5 * Uinf**3 * np.exp(-((pitch - 2.0) ** 2) / self.width)
+        return {"P": P, "T": P / Uinf, "CT": 0 * P, "CP": 0 * P, "Mb": 0 * P}, None
+
+    def distributedAeroLoads(self, Uinf, Omega, pitch, azimuth):
+        return {"Np": np.full(5, Uinf), "Tp": np.full(5, pitch)}, None
+
+
+class TsrRotor:
+    """Rotor with a power maximum at tip speed ratio 8 and pitch ``pitch_opt``."""
+
+    r = np.linspace(0, 60, 5)
+
+    def __init__(self, pitch_opt=2.0):
+        self.pitch_opt = pitch_opt
+
+    def evaluate(self, Uinf, Omega, pitch, coefficients=False):
+        Uinf, Omega = np.asarray(Uinf, dtype=float), np.asarray(Omega, dtype=float)
+        tsr = Omega * 2 * np.pi / 60 * 60 / Uinf
+        P = (
+            1e5
+            * Uinf**3
+            * np.exp(-((tsr - 8.0) ** 2) / 8.0)
+            * np.exp(-((np.asarray(pitch) - self.pitch_opt) ** 2) / 50.0)
+        )
+        return {"P": P, "T": P / Uinf, "CT": 0 * P, "CP": 0 * P, "Mb": 0 * P}, None
+
+
+@pytest.fixture
+def power_rotor():
+    """Return the PowerRotor class, called with the pitch width of a test."""
+    return PowerRotor
+
+
+@pytest.fixture
+def tsr_rotor():
+    """Return the TsrRotor class, called with the optimum pitch of a test."""
+    return TsrRotor
@@ -0,0 +1,37 @@
+import numpy as np
+from b3_bem.core.batched import batched_maximize, batched_root
+
+
+def test_batched_maximize():
+    """Test lock-step maximization of independent bounded quadratics."""
+    centers = np.array([[1.0, 2.0], [3.0, -1.0], [9.0, 0.5]])
+    calls = []
+
+    def fun(idx, x):
+        calls.append(len(idx))
+        dx = x - centers[idx]
+        return -np.sum(dx**2 * [1.0, 4.0], axis=1), -2 * dx * [1.0, 4.0]
+
+    x, niter = batched_maximize(
+        fun, np.zeros((3, 2)), np.array([-5.0, -5.0]), np.array([5.0, 5.0])
+    )
+    np.testing.assert_allclose(x[:2], centers[:2], atol=1e-4)
+    # Third optimum clipped to the upper bound
+    np.testing.assert_allclose(x[2], [5.0, 0.5], atol=1e-4)
+    assert len(niter) == 3
+    assert len(calls) == niter.max()
+
+
+def test_batched_root():
+    """Test lock-step bracketed root finding."""
+    targets = np.array([0.5, 2.0, 7.5])
+
+    def fun(idx, x):
+        return x**3 - targets[idx] ** 3
+
+    lower, upper = np.zeros(3), np.full(3, 10.0)
+    x, niter = batched_root(
+        fun, lower, upper, fun(np.arange(3), lower), fun(np.arange(3), upper)
+    )
+    np.testing.assert_allclose(x, targets, atol=1e-6)
+    assert (niter > 0).all()
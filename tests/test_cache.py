@@ -0,0 +1,63 @@
+import numpy as np
+from unittest.mock import Mock
+from b3_bem.core.cache import EvaluationCache
+from ccblade.ccblade import CCBlade
+
+
+def _rotor():
+    """Mock rotor whose power depends on the operating point."""
+    rotor = Mock(spec=CCBlade)
+
+    def evaluate(Uinf, Omega, pitch, coefficients=False):
+        P = np.asarray(Uinf) * 1e5 + np.asarray(Omega) * 1e3 + np.asarray(pitch)
+        return {"P": P, "CP": P / 1e7}, None
+
+    rotor.evaluate.side_effect = evaluate
+    rotor.distributedAeroLoads.return_value = ({"Np": np.ones(3)}, None)
+    return rotor
+
+
+def test_evaluate_cache():
+    """Test repeated operating points are not re-solved."""
+    rotor = _rotor()
+    cache = EvaluationCache()
+    outputs, derivs = cache.evaluate(rotor, [5.0, 6.0], [3.0, 4.0], [0.0, 1.0])
+    assert derivs is None
+    np.testing.assert_allclose(outputs["P"], [503000.0, 604001.0])
+    outputs, _ = cache.evaluate(rotor, [6.0, 7.0], [4.0, 4.0], [1.0, 1.0])
+    np.testing.assert_allclose(outputs["P"], [604001.0, 704001.0])
+    # Only the new point was passed to the rotor
+    np.testing.assert_allclose(rotor.evaluate.call_args.args[0], [7.0])
+    assert cache.stats() == {"hits": 1, "misses": 3, "size": 3}
+
+
+def test_cache_rotor_identity():
+    """Test entries of different rotors do not mix."""
+    cache = EvaluationCache()
+    rotor1, rotor2 = _rotor(), _rotor()
+    cache.evaluate(rotor1, [5.0], [3.0], [0.0])
+    cache.evaluate(rotor2, [5.0], [3.0], [0.0])
+    assert rotor2.evaluate.call_count == 1
+    assert cache.stats()["hits"] == 0
+
+
+def test_cache_lru_eviction():
+    """Test the cache keeps at most maxsize entries, least recent first out."""
+    rotor = _rotor()
+    cache = EvaluationCache(maxsize=2)
+    for u in (5.0, 6.0, 5.0, 7.0):
+        cache.evaluate(rotor, [u], [3.0], [0.0])
+    assert cache.stats()["size"] == 2
+    cache.evaluate(rotor, [5.0], [3.0], [0.0])
+    cache.evaluate(rotor, [6.0], [3.0], [0.0])
+    assert cache.stats() == {"hits": 2, "misses": 4, "size": 2}
+
+
+def test_loads_cache():
+    """Test distributed loads are cached per operating point."""
+    rotor = _rotor()
+    cache = EvaluationCache()
+    cache.loads(rotor, 6.0, 5.0, 0.0)
+    loads = cache.loads(rotor, 6.0, 5.0, 0.0)
+    assert rotor.distributedAeroLoads.call_count == 1
+    np.testing.assert_allclose(loads["Np"], np.ones(3))
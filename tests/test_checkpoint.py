@@ -0,0 +1,19 @@
+import numpy as np
+from b3_bem.core.checkpoint import Checkpoint
+
+
+def test_checkpoint_append_load(tmp_path):
+    """Test rows round-trip per key and survive a line cut short."""
+    path = tmp_path / "checkpoint.jsonl"
+    checkpoint = Checkpoint(path, "a")
+    row = (np.float64(6.0), "mid", np.float64(5.0), 0.0, 1e6, 1e5, 0.5, 0.4, 1e6, 3)
+    checkpoint.append([row])
+    Checkpoint(path, "b").append([(7.0, "low", 2.0, 0.0, 0, 0, 0, 0, 0, 1)])
+    # An interrupted write leaves a partial line
+    with open(path, "a") as f:
+        f.write('{"key": "a", "row": [8.0, "mi')
+    checkpoint.append([(9.0, "high", 7.0, 9.0, 0, 0, 0, 0, 0, 2)])
+    rows = checkpoint.load()
+    assert sorted(rows) == [6.0, 9.0]
+    assert rows[6.0] == (6.0, "mid", 5.0, 0.0, 1e6, 1e5, 0.5, 0.4, 1e6, 3)
+    assert Checkpoint(tmp_path / "missing.jsonl", "a").load() == {}
@@ -23,7 +23,9 @@ def test_run_b3bem_callback():
         mock_plotter_instance = Mock()
         mock_plotter.return_value = mock_plotter_instance
         run_b3bem_callback(Path("test.yml"), force=True, plot=True)
-        mock_step.assert_called_once_with(str(Path("test.yml")), force=True)
+        mock_step.assert_called_once_with(
+            str(Path("test.yml")), force=True, tier="standard"
+        )
         mock_step_instance.run.assert_called_once()
         mock_plotter.assert_called_once_with(Path("temp") / "results.json")
         mock_plotter_instance.plot_all.assert_called_once_with(Path("temp"))
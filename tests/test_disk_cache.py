@@ -0,0 +1,109 @@
+import pickle
+import sqlite3
+import numpy as np
+from b3_bem.core.cache import EvaluationCache
+from b3_bem.core.disk_cache import DiskCache
+from b3_bem.core.fixed import FixedRun
+
+
+class CountingRotor:
+    """Picklable rotor counting its evaluations."""
+
+    r = np.linspace(0, 60, 4)
+
+    def __init__(self, scale=1e5):
+        self.scale = scale
+        self.points = 0
+
+    def evaluate(self, Uinf, Omega, pitch, coefficients=False):
+        self.points += np.size(Uinf)
+        P = np.asarray(Uinf) * self.scale + np.asarray(pitch)
+        return {k: P for k in ("P", "T", "CT", "CP", "Mb")}, None
+
+    def distributedAeroLoads(self, Uinf, Omega, pitch, azimuth):
+        self.points += 1
+        return {"Np": np.full(4, Uinf), "Tp": np.full(4, pitch)}, None
+
+    def __getstate__(self):
+        return {"scale": self.scale, "points": 0}
+
+
+def test_disk_cache_eviction(tmp_path):
+    """Test stored values round-trip and old entries are evicted first."""
+    disk = DiskCache(tmp_path / "cache.sqlite", max_bytes=2000)
+    keys = [("evaluate", "abc", float(u), 1.0, 0.0, 0.0) for u in range(10)]
+    for key in keys:
+        disk.put_many([(key, np.arange(20.0))])
+        disk.get_many([keys[0]])  # Keep the first entry recent
+    assert disk.stats()["bytes"] <= 2000
+    values = disk.get_many(keys)
+    np.testing.assert_array_equal(values[0], np.arange(20.0))
+    assert values[1] is None
+    assert values[-1] is not None
+    # Unpickled copies share the connection of this process
+    clone = pickle.loads(pickle.dumps(disk))
+    assert clone.connection is disk.connection
+    assert clone.stats() == disk.stats()
+    stored = disk.connection.execute("SELECT SUM(size) FROM entries").fetchone()[0]
+    assert disk.stats()["bytes"] == stored
+
+
+def test_disk_cache_reads_without_lock(tmp_path):
+    """Test hits are read while another connection holds the write lock."""
+    disk = DiskCache(tmp_path / "cache.sqlite")
+    key = ("evaluate", "abc", 5.0, 1.0, 0.0, 0.0)
+    disk.put_many([(key, 1.0)])
+    query = "SELECT accessed FROM entries WHERE uinf=5.0"
+    stored = disk.connection.execute(query).fetchone()[0]
+    writer = sqlite3.connect(tmp_path / "cache.sqlite", isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        disk.connection.execute("PRAGMA busy_timeout=0")
+        assert disk.get_many([key]) == [1.0]
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+    # The access time is written with the next stored values
+    assert disk.connection.execute(query).fetchone()[0] == stored
+    disk.put_many([(("evaluate", "abc", 6.0, 1.0, 0.0, 0.0), 2.0)])
+    assert disk.connection.execute(query).fetchone()[0] > stored
+    disk.close()
+
+
+def test_evaluation_cache_disk(tmp_path):
+    """Test evaluations and loads persist across caches by rotor content."""
+    disk = DiskCache(tmp_path / "cache.sqlite")
+    rotor = CountingRotor()
+    cache = EvaluationCache(disk=disk)
+    cache.evaluate(rotor, [5.0, 6.0], [3.0, 3.0], [0.0, 1.0])
+    cache.loads(rotor, 5.0, 3.0, 0.0)
+    assert rotor.points == 3
+    # A fresh cache and an identically built rotor reuse the stored entries
+    rotor = CountingRotor()
+    cache = EvaluationCache(disk=disk)
+    outputs, _ = cache.evaluate(rotor, [6.0, 7.0], [3.0, 3.0], [1.0, 1.0])
+    np.testing.assert_allclose(outputs["P"], [600001.0, 700001.0])
+    np.testing.assert_allclose(cache.loads(rotor, 5.0, 3.0, 0.0)["Np"], 5.0)
+    assert rotor.points == 1
+    assert cache.stats() == {"hits": 0, "misses": 3, "size": 3, "disk_hits": 2}
+    # A different rotor does not
+    other = CountingRotor(scale=2e5)
+    cache.evaluate(other, [6.0], [3.0], [1.0])
+    assert other.points == 1
+
+
+def test_fixed_run_disk_cache(tmp_path):
+    """Test fixed runs read evaluations and loads from the cache."""
+    disk = DiskCache(tmp_path / "cache.sqlite")
+    operation = {"uinf": [5.0, 6.0], "omega": [3.0, 3.0], "pitch": [0.0, 1.0]}
+    FixedRun(
+        CountingRotor(), operation, 60, cache=EvaluationCache(disk=disk)
+    ).compute_bladeloads(operation)
+    rotor = CountingRotor()
+    fixed_run = FixedRun(rotor, operation, 60, cache=EvaluationCache(disk=disk))
+    fixed_run.run()
+    blade_loads = fixed_run.compute_bladeloads(
+        {k: np.asarray(v) for k, v in operation.items()}
+    )
+    assert rotor.points == 2
+    np.testing.assert_allclose(blade_loads.fields["Np"][:, 0], [5.0, 6.0])
@@ -0,0 +1,61 @@
+import os
+import numpy as np
+from unittest.mock import Mock
+from b3_bem.core.evaluator import quiet, rotor_evaluator
+from ccblade.ccblade import CCBlade
+
+
+def _rotor():
+    """Mock rotor writing to the stdout and stderr descriptors."""
+    rotor = Mock(spec=CCBlade)
+
+    def evaluate(Uinf, Omega, pitch, coefficients=False):
+        os.write(1, b"evaluate\n")
+        os.write(2, b"warning\n")
+        return {"P": np.asarray(Uinf) * 1e5}, None
+
+    def distributedAeroLoads(Uinf, Omega, pitch, azimuth):
+        os.write(1, b"loads\n")
+        return {"Np": np.full(3, Uinf)}, None
+
+    rotor.evaluate.side_effect = evaluate
+    rotor.distributedAeroLoads.side_effect = distributedAeroLoads
+    return rotor
+
+
+def test_quiet(capfd):
+    """Test output is silenced at the descriptor level and restored after."""
+    with quiet():
+        os.write(1, b"hidden\n")
+    os.write(1, b"shown\n")
+    out, _err = capfd.readouterr()
+    assert out == "shown\n"
+
+
+def test_rotor_evaluator(capfd):
+    """Test batched evaluations are silenced and counted."""
+    rotor = _rotor()
+    evaluator = rotor_evaluator(rotor)
+    assert rotor_evaluator(rotor) is evaluator
+    outputs, _ = evaluator.evaluate([5.0, 6.0], [3.0, 4.0], [0.0, 0.0])
+    np.testing.assert_allclose(outputs["P"], [5e5, 6e5])
+    loads = evaluator.loads([5.0, 6.0], [3.0, 4.0], 0.0)
+    assert [load["Np"][0] for load in loads] == [5.0, 6.0]
+    assert capfd.readouterr() == ("", "")
+    stats = evaluator.stats()
+    assert stats["evaluate"]["calls"] == 1
+    assert stats["evaluate"]["points"] == 2
+    assert stats["loads"]["points"] == 2
+    evaluator.evaluate([7.0], [5.0], [0.0])
+    assert evaluator.stats_since(stats)["evaluate"]["points"] == 1
+
+
+def test_quiet_no_descriptor_leak():
+    """Test repeated silencing leaves no descriptors open."""
+    with quiet():
+        pass
+    before = len(os.listdir("/proc/self/fd"))
+    for _ in range(100):
+        with quiet():
+            pass
+    assert len(os.listdir("/proc/self/fd")) == before
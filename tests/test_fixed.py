@@ -1,6 +1,10 @@
+import sys
 import numpy as np
-from unittest.mock import Mock
-from b3_bem.core.fixed import FixedRun
+import pandas as pd
+import pytest
+from unittest.mock import Mock, patch
+from b3_bem.core.fixed import FixedRun, read_setpoints, stream_setpoints
+from b3_bem.core.pool import RotorPool
 from ccblade.ccblade import CCBlade
 
 
@@ -21,17 +25,40 @@ def test_fixed_run():
     operation = [{"uinf": 6, "omega": 5, "pitch": 0}]
     fixed_run = FixedRun(rotor, operation, 60)
     results = fixed_run.run()
-    assert len(results) == 1
-    assert results[0][0] == 6  # uinf
-    assert results[0][1] == "fixed"
-    assert results[0][2] == 5  # omega
-    assert results[0][3] == 0  # pitch
-    assert results[0][4] == 1e7  # P
-    assert results[0][5] == 1e5  # T
-    assert results[0][6] == 0.5  # CT
-    assert results[0][7] == 0.4  # CP
-    assert results[0][8] == 1e6  # Mb
-    assert results[0][9] == 1  # niter
+    assert len(results["uinf"]) == 1
+    assert results["uinf"][0] == 6
+    assert results["zone"][0] == "fixed"
+    assert results["omega"][0] == 5
+    assert results["pitch"][0] == 0
+    assert results["P"][0] == 1e7
+    assert results["T"][0] == 1e5
+    assert results["CT"][0] == 0.5
+    assert results["CP"][0] == 0.4
+    assert results["Mb"][0] == 1e6
+    assert results["niter"][0] == 1
+
+
+def test_fixed_run_chunks():
+    """Test setpoints are evaluated in batched chunks."""
+    rotor = Mock(spec=CCBlade)
+
+    def evaluate(Uinf, Omega, pitch, coefficients=False):
+        P = np.asarray(Uinf) * 1e5 + np.asarray(pitch)
+        return {k: P for k in ("P", "T", "CT", "CP", "Mb")}, None
+
+    rotor.evaluate.side_effect = evaluate
+    operation = {
+        "uinf": np.arange(5.0, 15.0),
+        "omega": np.full(10, 7.0),
+        "pitch": np.arange(10.0),
+    }
+    fixed_run = FixedRun(rotor, operation, 60, chunk_size=4)
+    results = fixed_run.run()
+    assert rotor.evaluate.call_count == 3
+    assert [len(c.args[0]) for c in rotor.evaluate.call_args_list] == [4, 4, 2]
+    np.testing.assert_allclose(
+        results["P"], operation["uinf"] * 1e5 + operation["pitch"]
+    )
 
 
 def test_fixed_compute_bladeloads():
@@ -47,7 +74,7 @@ def test_fixed_compute_bladeloads():
     )
     operation = [{"uinf": 6, "omega": 5, "pitch": 0}]
     fixed_run = FixedRun(rotor, operation, 60)
-    results = [(6, "fixed", 5, 0, 1e7, 1e5, 0.5, 0.4, 1e6, 1)]
+    results = {"uinf": np.array([6.0]), "omega": np.array([5.0]), "pitch": np.zeros(1)}
     blade_data = fixed_run.compute_bladeloads(results)
     assert "r" in blade_data
     assert "loads_list" in blade_data
@@ -58,3 +85,64 @@ def test_fixed_compute_bladeloads():
     assert blade_data["flapwise_moments"][0] == 1800.0
     assert blade_data["edgewise_moments"][0] == 1800.0
     assert blade_data["combined_rms"][0] == 1800.0 * np.sqrt(2)
+
+
+class LinearRotor:
+    """Picklable rotor with power linear in the setpoint."""
+
+    r = np.linspace(0, 60, 5)
+
+    def evaluate(self, Uinf, Omega, pitch, coefficients=False):
+        P = np.asarray(Uinf) * 1e5 + np.asarray(Omega) * 1e3 + np.asarray(pitch)
+        return {k: P for k in ("P", "T", "CT", "CP", "Mb")}, None
+
+    def distributedAeroLoads(self, Uinf, Omega, pitch, azimuth):
+        return {"Np": np.full(5, Uinf), "Tp": np.zeros(5)}, None
+
+
+def test_read_setpoints(tmp_path):
+    """Test CSV and NPY setpoint files are read in chunks."""
+    table = np.column_stack([np.arange(5.0, 12.0), np.full(7, 8.0), np.arange(7.0)])
+    pd.DataFrame(table, columns=["wind_speed", "rpm", "pitch"]).to_csv(
+        tmp_path / "setpoints.csv", index=False
+    )
+    np.save(tmp_path / "setpoints.npy", table)
+    for name in ("setpoints.csv", "setpoints.npy"):
+        chunks = list(read_setpoints(tmp_path / name, 3))
+        assert [len(c["uinf"]) for c in chunks] == [3, 3, 1]
+        np.testing.assert_allclose(
+            np.concatenate([c["pitch"] for c in chunks]), table[:, 2]
+        )
+    # Parquet without pyarrow names the extra to install
+    with (
+        patch.dict(sys.modules, {"pyarrow": None, "pyarrow.parquet": None}),
+        pytest.raises(ImportError, match=r"b3_bem\[parquet\]"),
+    ):
+        next(read_setpoints(tmp_path / "setpoints.parquet", 3))
+
+
+def test_stream_setpoints(tmp_path):
+    """Test streamed results are appended chunk by chunk, serial and pooled."""
+    table = np.column_stack([np.arange(5.0, 15.0), np.full(10, 8.0), np.arange(10.0)])
+    np.save(tmp_path / "setpoints.npy", table)
+    expected = table[:, 0] * 1e5 + table[:, 1] * 1e3 + table[:, 2]
+    pool = RotorPool(LinearRotor(), processes=2)
+    try:
+        for run_pool in (None, pool):
+            output = tmp_path / "fixed.csv"
+            n = stream_setpoints(
+                LinearRotor(),
+                tmp_path / "setpoints.npy",
+                output,
+                60,
+                chunk_size=4,
+                blade_loads=True,
+                pool=run_pool,
+            )
+            assert n == 10
+            results = pd.read_csv(output)
+            np.testing.assert_allclose(results["wind_speed"], table[:, 0])
+            np.testing.assert_allclose(results["P"], expected)
+            np.testing.assert_allclose(results["flapwise_moment"], table[:, 0] * 1800)
+    finally:
+        pool.close()
@@ -0,0 +1,30 @@
+import numpy as np
+from b3_bem.core.moments import sectional_moments
+from b3_bem.core.results import BladeLoads
+
+
+def test_sectional_moments():
+    """Test cumulative sectional moments against one integral per station."""
+    r = np.array([0.0, 0.5, 2.0, 3.0, 4.5, 6.0])
+    q = np.random.default_rng(0).random((4, r.size))
+    expected = np.array(
+        [
+            [np.trapezoid(row[i:] * (r[i:] - r[i]), r[i:]) for i in range(r.size)]
+            for row in q
+        ]
+    )
+    np.testing.assert_allclose(sectional_moments(r, q), expected, atol=1e-12)
+    np.testing.assert_allclose(sectional_moments(r, q[0]), expected[0], atol=1e-12)
+    np.testing.assert_allclose(
+        sectional_moments(r, q)[:, 0], np.trapezoid(q * r, r, axis=1)
+    )
+
+
+def test_add_sectional_moments():
+    """Test flapwise and edgewise distributions are added to blade loads."""
+    blade_loads = BladeLoads.from_loads(
+        [0.0, 1.0, 2.0], [8.0], [{"Np": [1.0, 1.0, 1.0], "Tp": [0.0, 2.0, 2.0]}]
+    )
+    blade_loads.add_sectional_moments()
+    np.testing.assert_allclose(blade_loads["sectional_flapwise"], [[2.0, 0.5, 0.0]])
+    np.testing.assert_allclose(blade_loads["sectional_edgewise"], [[4.0, 1.0, 0.0]])
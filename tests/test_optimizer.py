@@ -1,6 +1,9 @@
 import numpy as np
+import pytest
 from unittest.mock import Mock
+from b3_bem.core.options import SolverOptions
 from b3_bem.core.optimizer import ControlOptimize
+from b3_bem.core.pool import get_pool, shutdown_pool
 from ccblade.ccblade import CCBlade
 from pathlib import Path
 
@@ -44,7 +47,13 @@ def test_optimize_all():
     )
     rotor.r = np.linspace(0, 60, 50)
     optimizer = ControlOptimize(
-        rotor, 95, 60, 1e7, np.array([5, 10]), Path("/tmp"), serial=True
+        rotor,
+        95,
+        60,
+        1e7,
+        np.array([5, 10]),
+        Path("/tmp"),
+        options=SolverOptions(serial=True),
     )
     results = optimizer.optimize_all()
     assert len(results) == 2
@@ -52,6 +61,25 @@ def test_optimize_all():
     assert results[1][0] == 10
 
 
+def test_serial_deprecated():
+    """Test the serial keyword still maps into the solver options."""
+    rotor = Mock(spec=CCBlade)
+    rotor.r = np.linspace(0, 60, 50)
+    with pytest.warns(DeprecationWarning, match="serial"):
+        optimizer = ControlOptimize(
+            rotor,
+            95,
+            60,
+            1e7,
+            np.array([5]),
+            Path("/tmp"),
+            serial=True,
+            options=SolverOptions(tol=1e-3),
+        )
+    assert optimizer.options == SolverOptions(serial=True, tol=1e-3)
+    assert optimizer.serial
+
+
 def test_optimize_low():
     """Test optimize_low method."""
     rotor = Mock(spec=CCBlade)
@@ -155,6 +183,7 @@ def test_optimize_high_except():
     result = optimizer.optimize_high(20.0)
     assert len(result) == 8
     assert result[0] == optimizer.omega_max
+    assert optimizer.pitch_high == result[1]
 
 
 def test_initialize_optimal():
@@ -253,3 +282,423 @@ def test_compute_bladeloads():
     assert "loads_list" in blade_data
     assert "uinf_list" in blade_data
     assert len(blade_data["flapwise_moments"]) == 1
+
+
+def test_optimize_mid_analytic_gradients():
+    """Test optimize_mid feeds CCBlade derivatives as the Jacobian."""
+    rotor = Mock(spec=CCBlade)
+    rotor.derivatives = True
+    rotor.evaluate.return_value = (
+        {
+            "P": np.array([1e7]),
+            "T": np.array([1e5]),
+            "CT": np.array([0.5]),
+            "CP": np.array([0.4]),
+            "Mb": np.array([1e6]),
+        },
+        {"dP": {"dOmega": np.array([[0.0]]), "dpitch": np.array([[0.0]])}},
+    )
+    rotor.r = np.linspace(0, 60, 50)
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        1e7,
+        np.array([6]),
+        Path("/tmp"),
+        options=SolverOptions(analytic_gradients=True),
+    )
+    assert optimizer.options.analytic_gradients
+    optimizer.Omega_opt = 5.0
+    optimizer.pitch_opt = 0.0
+    result = optimizer.optimize_mid(6.0)
+    assert len(result) == 8
+    # Zero gradient: converged at the initial guess without finite differences,
+    # the final coefficients evaluation is served by the cache
+    assert result[7] == 1
+    assert rotor.evaluate.call_count == 1
+
+
+def test_analytic_gradients_without_derivatives():
+    """Test fallback to finite differences when the rotor has no derivatives."""
+    rotor = Mock(spec=CCBlade)
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        1e7,
+        np.array([6]),
+        Path("/tmp"),
+        options=SolverOptions(analytic_gradients=True),
+    )
+    assert not optimizer.options.analytic_gradients
+
+
+def test_optimize_all_batched(power_rotor):
+    """Test batched optimize_all issues vectorized rotor evaluations."""
+    # Power falls below rating toward pitch_min as well as toward feather
+    rotor = power_rotor(width=4.0)
+    uinf = np.array([5.0, 10.0, 15.0, 20.0])
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        1e8,
+        uinf,
+        Path("/tmp"),
+        options=SolverOptions(serial=True, batched=True),
+    )
+    optimizer.Uinf_low, optimizer.Uinf_high = 0.0, 8.0
+    results = optimizer.optimize_batched()
+    assert [r[1] for r in results] == ["mid", "upper", "high", "high"]
+    np.testing.assert_allclose(results[1][3], 2.0, atol=1e-3)
+    np.testing.assert_allclose([r[4] for r in results[2:]], 1e8, rtol=1e-6)
+    assert all(r[4] <= 1e8 * (1 + 1e-6) for r in results)
+    assert all(r[3] > 2.0 for r in results[2:])
+    assert rotor.calls < sum(r[9] for r in results)
+    # Guesses at the solution shorten the rated-pitch search
+    guesses = [None, None] + [(r[2], r[3] + 1e-3) for r in results[2:]]
+    seeded = optimizer.optimize_batched(uinf, guesses)
+    np.testing.assert_allclose([r[3] for r in seeded], [r[3] for r in results])
+    assert sum(r[9] for r in seeded[2:]) < sum(r[9] for r in results[2:])
+    # Without maximizing first, as cheap as the serial search
+    serial = [optimizer.optimize_high(u, optimizer.pitch_opt) for u in uinf[2:]]
+    assert all(r[9] <= h[7] + 2 for r, h in zip(results[2:], serial))
+    # Seeds on the rising side below rating fall back to the power maximum
+    rising = optimizer.optimize_batched(uinf, [None, None] + [(0, -1.5)] * 2)
+    np.testing.assert_allclose([r[3] for r in rising], [r[3] for r in results])
+
+
+def test_optimize_high_newton():
+    """Test the rated-power pitch solver with analytic derivatives."""
+    rotor = Mock(spec=CCBlade)
+    rotor.derivatives = True
+
+    def evaluate(Uinf, Omega, pitch, coefficients=False):
+        pitch = np.asarray(pitch, dtype=float)
+        P = 2e7 * np.exp(-pitch / 15.0)
+        return (
+            {"P": P, "T": 0 * P, "CT": 0 * P, "CP": 0 * P, "Mb": 0 * P},
+            {"dP": {"dOmega": np.diag(0 * P), "dpitch": np.diag(-P / 15.0)}},
+        )
+
+    rotor.evaluate.side_effect = evaluate
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        1e7,
+        np.array([20]),
+        Path("/tmp"),
+        options=SolverOptions(analytic_gradients=True),
+    )
+    result = optimizer.optimize_high(20.0, pitch0=0.0)
+    np.testing.assert_allclose(result[1], 15.0 * np.log(2.0), rtol=1e-8)
+    np.testing.assert_allclose(result[2], 1e7, rtol=1e-8)
+    assert result[7] < 10
+    assert optimizer.pitch_high == result[1]
+
+
+def test_optimize_similar():
+    """Test mid wind speeds reuse the reference optimum unless it moved."""
+    rotor = Mock(spec=CCBlade)
+
+    def evaluate(Uinf, Omega, pitch, coefficients=False):
+        Uinf = np.asarray(Uinf, dtype=float)
+        Omega, pitch = np.asarray(Omega, dtype=float), np.asarray(pitch, dtype=float)
+        # The optimum pitch moves by 2 degrees above 9 m/s
+        pitch_best = np.where(Uinf > 9.0, 3.0, 1.0)
+        P = (
+            1e5
+            * Uinf**3
+            * np.exp(-((Omega / Uinf - 0.8) ** 2) - (pitch - pitch_best) ** 2 / 50.0)
+        )
+        return (
+            {"P": P, "T": 0 * P, "CT": 0 * P, "CP": 0 * P, "Mb": 0 * P},
+            None,
+        )
+
+    rotor.evaluate.side_effect = evaluate
+    uinf = np.array([6.0, 8.0, 10.0])
+    for batched in (False, True):
+        optimizer = ControlOptimize(
+            rotor,
+            95,
+            60,
+            1e8,
+            uinf,
+            Path("/tmp"),
+            options=SolverOptions(serial=True, batched=batched, similarity=1e-3),
+        )
+        optimizer.Omega_opt, optimizer.pitch_opt = 4.8, 1.0
+        optimizer.Uinf_low, optimizer.Uinf_high = 0.0, 12.0
+        if batched:
+            results = optimizer.optimize_batched()
+        else:
+            results = [optimizer.process_Uinf(u) for u in uinf]
+        assert [r[1] for r in results] == ["mid", "mid", "mid"]
+        # Similar points cost one evaluation and two finite differences
+        assert [r[9] for r in results[:2]] == [3, 3]
+        np.testing.assert_allclose(results[1][2:4], [6.4, 1.0])
+        assert results[2][9] > 3
+        np.testing.assert_allclose(results[2][3], 3.0, atol=1e-2)
+
+
+def test_optimize_similar_reference():
+    """Test similarity scales from the reference wind speed when 6 m/s is missing."""
+    rotor = Mock(spec=CCBlade)
+
+    def evaluate(Uinf, Omega, pitch, coefficients=False):
+        Uinf = np.asarray(Uinf, dtype=float)
+        Omega, pitch = np.asarray(Omega, dtype=float), np.asarray(pitch, dtype=float)
+        P = 1e5 * Uinf**3 * np.exp(-((Omega / Uinf - 0.8) ** 2) - (pitch - 1.0) ** 2)
+        return ({"P": P, "T": 0 * P, "CT": 0 * P, "CP": 0 * P, "Mb": 0 * P}, None)
+
+    rotor.evaluate.side_effect = evaluate
+    uinf = np.array([5.0, 7.5, 8.5])
+    for batched in (False, True):
+        optimizer = ControlOptimize(
+            rotor,
+            95,
+            60,
+            1e8,
+            uinf,
+            Path("/tmp"),
+            options=SolverOptions(serial=True, batched=batched, similarity=1e-3),
+        )
+        optimizer.initialize_optimal()
+        assert optimizer.ref_uinf == 5.0
+        if batched:
+            results = optimizer.optimize_batched()
+        else:
+            results = [optimizer.process_Uinf(u) for u in uinf]
+        assert [r[1] for r in results] == ["mid", "mid", "mid"]
+        # Accepted from the similarity solution, one evaluation and two differences
+        assert [r[9] for r in results[1:]] == [3, 3]
+        np.testing.assert_allclose([r[2] for r in results[1:]], [6.0, 6.8], rtol=1e-3)
+
+
+def test_refine(power_rotor):
+    """Test adaptive refinement closes in on the rated wind speed."""
+    rotor = power_rotor()
+    uinf = np.array([4.0, 8.0, 12.0, 16.0, 20.0])
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        1e8,
+        uinf,
+        Path("/tmp"),
+        options=SolverOptions(
+            serial=True, adaptive={"tol": 0.05, "min_step": 0.25, "max_points": 20}
+        ),
+    )
+    optimizer.Uinf_low, optimizer.Uinf_high = 0.0, 9.0
+    results = optimizer.refine(optimizer.optimize_points(uinf))
+    refined = [r[0] for r in results]
+    assert refined == sorted(refined)
+    assert 5 < len(results) <= 20
+    np.testing.assert_allclose(optimizer.uinf, refined)
+    zone = [r[1] for r in results]
+    # Upper and high meet where P at pitch 0 reaches rating, within 2 * min_step
+    switch = (1e3 * np.exp(4.0 / 50.0)) ** (1 / 3)
+    k = zone.index("high")
+    assert zone[k - 1] == "upper"
+    assert switch - 0.5 <= refined[k - 1] < switch < refined[k] <= switch + 0.5
+
+
+def test_sweep_continuation(power_rotor):
+    """Test the continuation sweep seeds wind speeds from their neighbours."""
+    rotor = power_rotor()
+    uinf = np.array([20.0, 12.0, 14.0, 16.0, 18.0])
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        1e8,
+        uinf,
+        Path("/tmp"),
+        options=SolverOptions(serial=True, continuation=True),
+    )
+    optimizer.Uinf_low, optimizer.Uinf_high = 0.0, 9.0
+    results = optimizer.optimize_points(uinf)
+    # Results come back in the order of uinf
+    assert [r[0] for r in results] == list(uinf)
+    np.testing.assert_allclose([r[4] for r in results], 1e8, rtol=1e-6)
+    solved = sorted(results, key=lambda r: r[0])[:2]
+    Omega, pitch = optimizer._continue(solved, 16.0)
+    assert Omega == optimizer.omega_max
+    np.testing.assert_allclose(pitch, 2 * solved[1][3] - solved[0][3])
+    # No guess across the mid and high regimes
+    assert optimizer._continue(solved, 8.0) is None
+
+
+def test_fused_bladeloads(power_rotor):
+    """Test blade loads come back from the pool workers with the optima."""
+    rotor = power_rotor()
+    uinf = np.array([6.0, 8.0, 12.0, 16.0])
+    try:
+        get_pool(rotor, processes=2)
+        for fused in (True, False):
+            optimizer = ControlOptimize(
+                rotor,
+                95,
+                60,
+                1e8,
+                uinf,
+                Path("/tmp"),
+                options=SolverOptions(fused_loads=fused),
+            )
+            optimizer.initialize_optimal()
+            results = optimizer.optimize_points(uinf)
+            assert len(optimizer.point_loads) == (4 if fused else 0)
+            blade_data = optimizer.compute_bladeloads(results)
+            assert len(optimizer.point_loads) == 4
+            np.testing.assert_allclose(blade_data["flapwise_moments"], uinf * 1800)
+            np.testing.assert_allclose(
+                blade_data["edgewise_moments"], [r[3] * 1800 for r in results]
+            )
+    finally:
+        shutdown_pool()
+
+
+def test_checkpoint_resume(tmp_path, power_rotor):
+    """Test solved wind speeds are checkpointed and skipped when resuming."""
+    rotor = power_rotor()
+    path = tmp_path / "opt_checkpoint.jsonl"
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        1e8,
+        np.array([6.0, 8.0]),
+        tmp_path,
+        checkpoint=path,
+        options=SolverOptions(serial=True),
+    )
+    first = optimizer.optimize_all()
+    assert len(path.read_text().splitlines()) == 2
+    uinf = np.array([6.0, 8.0, 12.0])
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        1e8,
+        uinf,
+        tmp_path,
+        checkpoint=path,
+        options=SolverOptions(serial=True),
+    )
+    optimizer.initialize_optimal()
+    optimizer.process_Uinf = Mock(wraps=optimizer.process_Uinf)
+    results = optimizer.optimize_points(uinf)
+    assert [c.args[0] for c in optimizer.process_Uinf.call_args_list] == [12.0]
+    assert results[:2] == list(first)
+    assert len(path.read_text().splitlines()) == 3
+    # Another rating is another key, nothing is reused
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        2e8,
+        uinf,
+        tmp_path,
+        checkpoint=path,
+        options=SolverOptions(serial=True),
+    )
+    optimizer.initialize_optimal()
+    assert optimizer.checkpoint.load() == {}
+    # So are other solver options
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        1e8,
+        uinf,
+        tmp_path,
+        checkpoint=path,
+        options=SolverOptions(serial=True, lookup_table={"polish": False}),
+    )
+    assert optimizer.checkpoint.load() == {}
+
+
+def test_optimize_all_warm_start(tsr_rotor):
+    """Test a coarse solution warm-starts and shortens every wind speed."""
+    uinf = np.array([6.0, 8.0, 14.0, 18.0, 22.0])
+    coarse = ControlOptimize(
+        tsr_rotor(2.3),
+        95,
+        60,
+        1e8,
+        uinf[::2],
+        Path("/tmp"),
+        options=SolverOptions(serial=True),
+    ).optimize_all()
+    cold = ControlOptimize(
+        tsr_rotor(), 95, 60, 1e8, uinf, Path("/tmp"), options=SolverOptions(serial=True)
+    ).optimize_all()
+    optimizer = ControlOptimize(
+        tsr_rotor(),
+        95,
+        60,
+        1e8,
+        uinf,
+        Path("/tmp"),
+        options=SolverOptions(serial=True, polish_iter=2),
+    )
+    optimizer.process_Uinf = Mock(wraps=optimizer.process_Uinf)
+    warm = optimizer.optimize_all(warm_start=coarse)
+    guesses = [c.args[1] for c in optimizer.process_Uinf.call_args_list]
+    assert list(warm.zone) == ["mid", "mid", "high", "high", "high"]
+    # The tip speed ratio and pitch of the coarse mid wind speed 6 m/s, and
+    # interpolated from the coarse high wind speeds 14 and 22 m/s
+    np.testing.assert_allclose(guesses[1], (coarse[0][2] * 8.0 / 6.0, coarse[0][3]))
+    np.testing.assert_allclose(
+        guesses[3], 0.5 * (np.array(coarse[1][2:4]) + coarse[2][2:4])
+    )
+    np.testing.assert_allclose(warm.P, cold.P, rtol=1e-6)
+    assert np.all(warm.niter <= cold.niter)
+    assert warm.niter.sum() < cold.niter.sum()
+
+
+def test_optimize_all_tol(tsr_rotor):
+    """Test a loose tolerance takes fewer iterations for nearly the same curve."""
+    uinf = np.array([5.0, 14.0, 18.0])
+    for batched in (False, True):
+        tight, loose = (
+            ControlOptimize(
+                tsr_rotor(),
+                95,
+                60,
+                1e8,
+                uinf,
+                Path("/tmp"),
+                options=SolverOptions(serial=True, batched=batched, tol=tol),
+            ).optimize_all()
+            for tol in (None, 1e-3)
+        )
+        assert loose.niter.sum() < tight.niter.sum()
+        np.testing.assert_allclose(loose.P, tight.P, rtol=1e-2)
+
+
+def test_high_seeded_from_neighbour(tsr_rotor):
+    """Test high wind speeds start from their neighbour's rated pitch in the pool."""
+    rotor = tsr_rotor()
+    uinf = np.array([6.0, 14.0, 16.0, 18.0, 20.0])
+    try:
+        get_pool(rotor, processes=2)
+        optimizer = ControlOptimize(rotor, 95, 60, 1e8, uinf, Path("/tmp"))
+        optimizer.initialize_optimal()
+        assert optimizer.Uinf_high < 14.0
+        results = optimizer.optimize_points(uinf)
+    finally:
+        shutdown_pool()
+    assert [r[1] for r in results] == ["mid"] + ["high"] * 4
+    unseeded = []
+    for u in uinf[1:]:
+        optimizer.pitch_high = None
+        unseeded.append(optimizer.process_Uinf(u))
+    np.testing.assert_allclose(
+        [r[3] for r in results[1:]], [r[3] for r in unseeded], rtol=1e-6
+    )
+    assert sum(r[9] for r in results[1:]) < sum(r[9] for r in unseeded)
@@ -0,0 +1,40 @@
+import pytest
+from b3_bem.core.options import SolverOptions
+
+
+def test_solver_options_from_config():
+    """Test run config values are normalized and conflicts rejected."""
+    options = SolverOptions.from_config(
+        {
+            "type": "optimal",
+            "lookup_table": True,
+            "similarity": True,
+            "adaptive": False,
+            "tol": "1e-4",
+        }
+    )
+    assert options.lookup_table == {}
+    assert options.similarity == 1e-3
+    assert options.adaptive is None
+    assert options.tol == 1e-4
+    assert SolverOptions.from_config({"type": "optimal"}) == SolverOptions()
+    # A polished table is capped at one iteration unless given
+    assert SolverOptions.from_config({"lookup_table": True}).polish_iter == 1
+    assert SolverOptions.from_config({"lookup_table": {}, "polish_iter": "3"}) == (
+        SolverOptions(lookup_table={}, polish_iter=3)
+    )
+    # Execution options leave the key unchanged
+    assert SolverOptions(serial=True).key() == SolverOptions().key()
+    assert SolverOptions(tol=1e-3).key() != SolverOptions().key()
+    with pytest.raises(ValueError, match="batched ignores continuation"):
+        SolverOptions(batched=True, continuation=True)
+    with pytest.raises(ValueError, match="serial ignores fused_loads"):
+        SolverOptions(serial=True, fused_loads=True)
+    with pytest.raises(ValueError, match="without polish ignores similarity"):
+        SolverOptions.from_config(
+            {"lookup_table": {"polish": False}, "similarity": 1e-3}
+        )
+    with pytest.raises(ValueError, match="without polish ignores polish_iter"):
+        SolverOptions(lookup_table={"polish": False}, polish_iter=2)
+    with pytest.raises(ValueError, match="tol must be positive"):
+        SolverOptions(tol=0.0)
@@ -203,3 +203,33 @@ def test_plotter():
         plotter = B3BemPlotter(Path("dummy.json"))
         plotter.plot_all()
         assert "planform" in plotter.data
+
+
+def test_plotter_streamed(tmp_path):
+    """Test B3BemPlotter reads a streamed run from its CSV and skips loads."""
+    (tmp_path / "stream.csv").write_text(
+        "wind_speed,rpm,pitch,P,T\n5,6,0,100,10\n10,7,2,200,20\n"
+    )
+    data = {
+        "planform": {"r": [0, 1], "chord": [1, 0.5], "twist": [0, 10]},
+        "runs": {
+            # Written elsewhere, found next to results.json
+            "stream": {"performance_file": "/elsewhere/stream.csv", "metadata": {}}
+        },
+    }
+    (tmp_path / "results.json").write_text(json.dumps(data))
+    with (
+        patch("b3_bem.plots.plotter.rotorplot") as mock_rotorplot,
+        patch("b3_bem.plots.plotter.plot_bladeloads") as mock_bladeloads,
+        patch("b3_bem.plots.plotter.plot_moments") as mock_moments,
+    ):
+        plotter = B3BemPlotter(tmp_path / "results.json")
+        plotter.plot_rotor_performance(tmp_path / "out.png")
+        plotter.plot_bladeloads(tmp_path / "loads.png")
+        plotter.plot_moments(tmp_path / "moments.png")
+    perf = mock_rotorplot.call_args.args[0]
+    np.testing.assert_allclose(perf["uinf"], [5, 10])
+    np.testing.assert_allclose(perf["omega"], [6, 7])
+    np.testing.assert_allclose(perf["P"], [100, 200])
+    mock_bladeloads.assert_not_called()
+    mock_moments.assert_not_called()
@@ -0,0 +1,48 @@
+import numpy as np
+from b3_bem.core.pool import RotorPool, get_pool, shutdown_pool
+
+
+def _scaled_sum(rotor, arg):
+    """Task using the worker's rotor."""
+    return float(rotor.sum() * arg)
+
+
+def test_rotor_pool():
+    """Test tasks run against the rotor received by the workers."""
+    rotor = np.arange(4.0)
+    pool = RotorPool(rotor, processes=2)
+    try:
+        assert list(pool.imap(_scaled_sum, [1, 2, 3])) == [6.0, 12.0, 18.0]
+    finally:
+        pool.close()
+
+
+def test_get_pool():
+    """Test the persistent pool is reused for the same rotor only."""
+    try:
+        pool = get_pool(np.arange(4.0), processes=2)
+        assert get_pool(np.arange(4.0)) is pool
+        other = get_pool(np.arange(5.0), processes=2)
+        assert other is not pool
+        assert list(other.imap(_scaled_sum, [1])) == [10.0]
+    finally:
+        shutdown_pool()
+
+
+def test_imap_bounded():
+    """Test bounded imap returns results in order and reads args lazily."""
+    read = []
+
+    def args():
+        for i in range(6):
+            read.append(i)
+            yield i
+
+    pool = RotorPool(np.arange(4.0), processes=2)
+    try:
+        results = pool.imap_bounded(_scaled_sum, args(), 2)
+        assert next(results) == 0.0
+        assert len(read) == 2
+        assert list(results) == [6.0, 12.0, 18.0, 24.0, 30.0]
+    finally:
+        pool.close()
@@ -1,5 +1,8 @@
 from pathlib import Path
+import numpy as np
 from unittest.mock import Mock, patch
+from b3_bem.core.results import BladeLoads, OperatingPoints
+from b3_bem.core.options import SolverOptions
 from b3_bem.core.runner import B3BemRun
 
 
@@ -35,7 +38,7 @@ def test_b3bem_run_init():
         patch("b3_bem.core.runner.CCBlade"),
         patch("b3_bem.core.runner.plot_planform"),
         patch("b3_bem.core.runner.interpolate_polars") as mock_interp,
-        patch("b3_bem.core.runner.load_polar"),
+        patch("b3_bem.core.runner.load_polars"),
     ):
         mock_interp.return_value = Mock()
         runner = B3BemRun(config, yml_dir)
@@ -43,6 +46,53 @@ def test_b3bem_run_init():
         assert "r" in runner.planform_data
 
 
+def test_b3bem_run_span():
+    """Test configured and converged span stations."""
+    config = {
+        "workdir": "temp",
+        "bem": {
+            "B": 3,
+            "rho": 1.225,
+            "mu": 1.8e-5,
+            "precone": 0,
+            "tilt": 0,
+            "yaw": 0,
+            "shearExp": 0,
+            "hubHt": 80,
+            "polars": [],
+            "span": {"n": 20, "spacing": "tip"},
+        },
+        "geometry": {
+            "planform": {
+                "chord": [[0, 1], [1, 0.5]],
+                "twist": [[0, 0], [1, 10]],
+                "thickness": [[0, 0.2], [1, 0.1]],
+                "z": [[0, 0], [1, 100]],
+            }
+        },
+    }
+    with (
+        patch("b3_bem.core.runner.CCBlade"),
+        patch("b3_bem.core.runner.plot_planform"),
+        patch("b3_bem.core.runner.interpolate_polars"),
+        patch("b3_bem.core.runner.load_polars"),
+        patch("b3_bem.core.runner.converged_span") as mock_converged,
+    ):
+        runner = B3BemRun(config, Path("/tmp"))
+        r = np.array(runner.planform_data["r"])
+        assert len(r) == 20 and r[-1] == 100
+        assert r[-1] - r[-2] < r[1] - r[0]
+        mock_converged.assert_not_called()
+
+        config["bem"]["span"] = {"n": "auto", "tolerance": 0.01}
+        mock_converged.return_value = (16, {"cp": 0.001, "root_moment": 0.002}, True)
+        runner = B3BemRun(config, Path("/tmp"))
+        assert len(runner.planform_data["r"]) == 16
+        assert runner.span_info["n"] == 16
+        assert runner.span_info["converged"]
+        assert mock_converged.call_args.kwargs["tolerance"] == 0.01
+
+
 def test_b3bem_run_run():
     """Test B3BemRun run method."""
     config = {
@@ -81,18 +131,18 @@ def test_b3bem_run_run():
     ):
         mock_interp.return_value = Mock()
         mock_opt_instance = Mock()
-        mock_opt_instance.optimize_all.return_value = [
-            (5, "low", 2, 0, 1e5, 1e4, 0.5, 0.4, 1e5, 1),
-            (10, "mid", 5, 0, 1e6, 1e5, 0.5, 0.4, 1e6, 1),
-        ]
-        mock_opt_instance.compute_bladeloads.return_value = {
-            "r": [0, 1],
-            "loads_list": [],
-            "uinf_list": [5, 10],
-            "flapwise_moments": [1e4, 1e5],
-            "edgewise_moments": [5e3, 5e4],
-            "combined_rms": [1.118e4, 1.118e5],
-        }
+        mock_opt_instance.optimize_all.return_value = OperatingPoints.from_rows(
+            [
+                (5, "low", 2, 0, 1e5, 1e4, 0.5, 0.4, 1e5, 1),
+                (10, "mid", 5, 0, 1e6, 1e5, 0.5, 0.4, 1e6, 1),
+            ],
+            rtip=60,
+        )
+        mock_opt_instance.compute_bladeloads.return_value = BladeLoads.from_loads(
+            [0, 1],
+            [5, 10],
+            [{"Np": [0, 2e4], "Tp": [0, 1e4]}, {"Np": [0, 2e5], "Tp": [0, 1e5]}],
+        )
         mock_opt_instance.Uinf_low = 4
         mock_opt_instance.Uinf_high = 8
         mock_opt_instance.Uinf_switch = 12
@@ -104,8 +154,149 @@ def test_b3bem_run_run():
         mock_opt_instance.optimize_all.assert_called_once()
         mock_opt_instance.compute_bladeloads.assert_called_once()
         mock_json_dump.assert_called_once()
-        args, kwargs = mock_json_dump.call_args
+        args, _kwargs = mock_json_dump.call_args
         data = args[0]
         assert "performance" in data["runs"]["default"]
         assert "blade_loads" in data["runs"]["default"]
         assert "metadata" in data["runs"]["default"]
+        assert data["runs"]["default"]["performance"]["zone"] == ["low", "mid"]
+        blade_loads = data["runs"]["default"]["blade_loads"]
+        assert blade_loads["flapwise_moments"] == [1e4, 1e5]
+        assert blade_loads["loads_list"][1]["Np"] == [0, 2e5]
+
+
+def test_b3bem_run_multi_fidelity():
+    """Test an optimal run polishes a coarse rotor's solution."""
+    config = {
+        "workdir": "temp",
+        "bem": {
+            "uinf": [5, 10],
+            "B": 3,
+            "rho": 1.225,
+            "mu": 1.8e-5,
+            "precone": 0,
+            "tilt": 0,
+            "yaw": 0,
+            "shearExp": 0,
+            "hubHt": 80,
+            "max_tipspeed": 80,
+            "rated_power": 1e6,
+            "polars": [],
+            "runs": {
+                "opt": {
+                    "type": "optimal",
+                    "multi_fidelity": {"n_span": 8},
+                    "lookup_table": True,
+                    "fused_loads": True,
+                }
+            },
+        },
+        "geometry": {
+            "planform": {
+                "chord": [[0, 1], [1, 0.5]],
+                "twist": [[0, 0], [1, 10]],
+                "thickness": [[0, 0.2], [1, 0.1]],
+                "z": [[0, 0], [1, 100]],
+            }
+        },
+    }
+    results = OperatingPoints.from_rows(
+        [
+            (5, "low", 2, 0, 1e5, 1e4, 0.5, 0.4, 1e5, 1),
+            (10, "mid", 5, 0, 1e6, 1e5, 0.5, 0.4, 1e6, 1),
+        ],
+        rtip=60,
+    )
+    with (
+        patch("b3_bem.core.runner.CCBlade") as mock_ccblade,
+        patch("b3_bem.core.runner.plot_planform"),
+        patch("b3_bem.core.runner.interpolate_polars"),
+        patch("b3_bem.core.runner.load_polars"),
+        patch("b3_bem.core.runner.ControlOptimize") as mock_opt_class,
+        patch("b3_bem.core.runner.json.dump") as mock_json_dump,
+    ):
+        mock_ccblade.side_effect = lambda r, *args, **kwargs: Mock(r=r)
+        mock_opt_instance = Mock(Uinf_low=4, Uinf_high=8, Uinf_switch=12)
+        mock_opt_instance.optimize_all.return_value = results
+        mock_opt_instance.compute_bladeloads.return_value = BladeLoads.from_loads(
+            [0, 1], [5, 10], [{"Np": [0, 1], "Tp": [0, 1]}] * 2
+        )
+        mock_opt_class.return_value = mock_opt_instance
+        runner = B3BemRun(config, Path("/tmp"))
+        runner.run()
+        (coarse, *_), coarse_kwargs = mock_opt_class.call_args_list[0]
+        (full, *_), full_kwargs = mock_opt_class.call_args_list[1]
+        assert len(coarse.r) == 8 and full is runner.rotor
+        # The coarse rotor is solved in this process, batched as the run is
+        # parallel, without a lookup table
+        assert coarse_kwargs["options"] == SolverOptions(serial=True, batched=True)
+        assert full_kwargs["options"] == SolverOptions(
+            lookup_table={}, fused_loads=True, polish_iter=1
+        )
+        # Serial runs solve the coarse rotor as they are, and warm-started
+        # runs without a table polish for two iterations
+        runner._control_optimizer(coarse, {"serial": True, "continuation": True})
+        assert mock_opt_class.call_args.kwargs["options"] == SolverOptions(
+            serial=True, continuation=True
+        )
+        runner._control_optimizer(runner.rotor, {}, warm_started=True)
+        assert mock_opt_class.call_args.kwargs["options"] == SolverOptions(
+            polish_iter=2
+        )
+        calls = mock_opt_instance.optimize_all.call_args_list
+        assert calls[1].kwargs["warm_start"] is results
+        metadata = mock_json_dump.call_args.args[0]["runs"]["opt"]["metadata"]
+        assert metadata["multi_fidelity"]["n_span"] == 8
+
+
+def test_b3bem_run_force_checkpoint(tmp_path):
+    """Test a forced run deletes the checkpoint instead of resuming it."""
+    config = {
+        "workdir": str(tmp_path / "out"),
+        "bem": {
+            "uinf": [5, 10],
+            "B": 3,
+            "rho": 1.225,
+            "mu": 1.8e-5,
+            "precone": 0,
+            "tilt": 0,
+            "yaw": 0,
+            "shearExp": 0,
+            "hubHt": 80,
+            "max_tipspeed": 80,
+            "rated_power": 1e6,
+            "polars": [],
+            "runs": {"opt": {"type": "optimal", "checkpoint": True}},
+        },
+        "geometry": {
+            "planform": {
+                "chord": [[0, 1], [1, 0.5]],
+                "twist": [[0, 0], [1, 10]],
+                "thickness": [[0, 0.2], [1, 0.1]],
+                "z": [[0, 0], [1, 100]],
+            }
+        },
+    }
+    with (
+        patch("b3_bem.core.runner.CCBlade"),
+        patch("b3_bem.core.runner.plot_planform"),
+        patch("b3_bem.core.runner.interpolate_polars"),
+        patch("b3_bem.core.runner.ControlOptimize") as mock_opt_class,
+        patch("b3_bem.core.runner.json.dump"),
+    ):
+        mock_opt_class.return_value.optimize_all.return_value = (
+            OperatingPoints.from_rows(
+                [(5, "low", 2, 0, 1e5, 1e4, 0.5, 0.4, 1e5, 1)], rtip=60
+            )
+        )
+        mock_opt_class.return_value.compute_bladeloads.return_value = (
+            BladeLoads.from_loads([0, 1], [5], [{"Np": [0, 2e4], "Tp": [0, 1e4]}])
+        )
+        runner = B3BemRun(config, tmp_path)
+        checkpoint = runner.workdir / "opt_checkpoint.jsonl"
+        checkpoint.write_text("{}\n")
+        runner.run()
+        assert checkpoint.exists()
+        assert mock_opt_class.call_args.kwargs["checkpoint"] == checkpoint
+        runner.run(force=True)
+        assert not checkpoint.exists()
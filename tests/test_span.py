@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from b3_bem.core.span import converged_span, rotor_metrics, span_stations
+
+
+class QuadratureRotor:
+    """Rotor whose power and loads are integrals sampled at its stations."""
+
+    def __init__(self, s_span, rtip=50.0):
+        self.r = np.asarray(s_span) * rtip
+        self.rtip = rtip
+
+    def evaluate(self, Uinf, Omega, pitch, coefficients=False):
+        s = self.r / self.rtip
+        cp = np.trapezoid(np.sin(np.pi * s) ** 2, s)
+        return {"P": np.array([cp]), "CP": np.array([cp])}, None
+
+    def distributedAeroLoads(self, Uinf, Omega, pitch, azimuth):
+        return {"Np": np.sin(np.pi * self.r / self.rtip), "Tp": 0 * self.r}, None
+
+
+def test_span_stations():
+    """Test the end points and clustering of the spacings."""
+    for spacing in ("uniform", "cosine", "tip"):
+        s = span_stations(11, spacing)
+        assert s[0] == 0 and s[-1] == pytest.approx(1)
+        assert np.all(np.diff(s) > 0)
+    tip = np.diff(span_stations(11, "tip"))
+    assert tip[-1] < tip[0]
+    cosine = np.diff(span_stations(11, "cosine"))
+    assert cosine[0] < cosine[5] and cosine[-1] < cosine[5]
+    with pytest.raises(ValueError):
+        span_stations(11, "random")
+
+
+def test_converged_span():
+    """Test that the smallest station count within tolerance is picked."""
+    n, errors, converged = converged_span(
+        QuadratureRotor, rtip=50.0, tolerance=1e-3, candidates=(5, 10, 20, 40, 80)
+    )
+    assert converged
+    assert max(errors.values()) <= 1e-3
+    reference = rotor_metrics(QuadratureRotor(span_stations(200)), 8.0, 10.0, 0.0)
+    coarser = rotor_metrics(QuadratureRotor(span_stations(n // 2)), 8.0, 10.0, 0.0)
+    coarser_error = abs(coarser[1] - reference[1]) / abs(reference[1])
+    assert coarser_error > 1e-3
+
+
+def test_converged_span_not_reached(caplog):
+    """Test the largest candidate and its errors are returned without convergence."""
+    n, errors, converged = converged_span(
+        QuadratureRotor, rtip=50.0, tolerance=1e-9, candidates=(5, 10, 20)
+    )
+    assert (n, converged) == (20, False)
+    measured = rotor_metrics(QuadratureRotor(span_stations(20)), 8.0, 10.0, 0.0)
+    reference = rotor_metrics(QuadratureRotor(span_stations(200)), 8.0, 10.0, 0.0)
+    assert errors["root_moment"] == pytest.approx(
+        abs(measured[1] - reference[1]) / abs(reference[1])
+    )
+    assert max(errors.values()) > 1e-9
+    assert "within tolerance 1e-09" in caplog.text
+    # Without candidates below the reference nothing is measured
+    assert converged_span(QuadratureRotor, rtip=50.0, reference=4) == (4, {}, False)
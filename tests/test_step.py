@@ -1,5 +1,6 @@
+import json
 from unittest.mock import Mock, patch, ANY
-from b3_bem.core.step import B3BemStep
+from b3_bem.core.step import B3BemStep, input_hashes
 from b3_bem.cli.yml_portable import Config
 
 
@@ -35,3 +36,47 @@ def test_run_example():
         step.run()
         mock_run.assert_called_once_with(config_obj.model_dump(), ANY)
         mock_run_instance.run.assert_called_once()
+
+
+def test_step_cache(tmp_path):
+    """Test runs with unchanged inputs are skipped unless forced."""
+    runs = {"opt": {"type": "optimal"}, "fixed": {"type": "fixed_setpoints"}}
+    config_obj = Config(
+        workdir=str(tmp_path / "out"), general={}, geometry={}, bem={"runs": runs}
+    )
+    config = config_obj.model_dump()
+    hashes = input_hashes(config, tmp_path)
+    (tmp_path / "out").mkdir()
+    previous = {
+        "runs": {
+            name: {"metadata": {"input_hash": hashes[name]}, "performance": {}}
+            for name in runs
+        }
+    }
+    (tmp_path / "out" / "results.json").write_text(json.dumps(previous))
+    config_path = str(tmp_path / "config.yml")
+    with (
+        patch("b3_bem.core.step.yaml_make_portable") as mock_yaml,
+        patch("b3_bem.core.step.B3BemRun") as mock_run,
+    ):
+        mock_yaml.return_value = config_obj
+        B3BemStep(config_path).run()
+        mock_run.assert_not_called()
+        # Execution settings leave the hashes unchanged
+        config["bem"]["cache_size"] = 16
+        config["bem"]["runs"]["fixed"]["chunk_size"] = 16
+        config["bem"]["runs"]["opt"]["serial"] = True
+        assert input_hashes(config, tmp_path) == hashes
+        # Only the edited run is rerun
+        runs["fixed"]["blade_loads"] = True
+        mock_yaml.return_value = Config(
+            workdir=str(tmp_path / "out"), general={}, geometry={}, bem={"runs": runs}
+        )
+        B3BemStep(config_path).run()
+        kwargs = mock_run.return_value.run.call_args.kwargs
+        assert list(kwargs["cached"]) == ["opt"]
+        assert kwargs["hashes"]["opt"] == hashes["opt"]
+        assert kwargs["hashes"]["fixed"] != hashes["fixed"]
+        B3BemStep(config_path, force=True).run()
+        assert mock_run.return_value.run.call_args.kwargs["cached"] == {}
+        assert mock_run.return_value.run.call_args.kwargs["force"]
@@ -0,0 +1,76 @@
+import json
+from unittest.mock import patch
+import numpy as np
+from b3_bem.core.results import BladeLoads, OperatingPoints
+from b3_bem.core.store import ResultsStore, save_arrays, split_run_arrays
+from b3_bem.plots.plotter import B3BemPlotter
+
+
+def _run_data():
+    return {
+        "performance": OperatingPoints.from_rows(
+            [
+                (5.0, "low", 2.0, 0.0, 1.0, 0, 0, 0, 0, 1),
+                (10.0, "mid", 5.0, 0.0, 2.0, 0, 0, 0, 0, 3),
+            ],
+            rtip=60.0,
+        ),
+        "blade_loads": BladeLoads.from_loads(
+            [0.0, 1.0, 2.0],
+            [5.0, 10.0],
+            [
+                {"Np": [1.0, 2.0, 3.0], "Tp": [0.1, 0.2, 0.3]},
+                {"Np": [4.0, 5.0, 6.0], "Tp": [0.4, 0.5, 0.6]},
+            ],
+        ),
+        "metadata": {"Uinf_low": 4},
+    }
+
+
+def test_split_run_arrays(tmp_path):
+    """Test runs split into JSON metadata and memory-mapped columns."""
+    json_data, arrays = split_run_arrays("runs/opt", _run_data())
+    assert json_data == {
+        "metadata": {"Uinf_low": 4},
+        "blade_loads": {"load_fields": ["Np", "Tp"]},
+    }
+    assert arrays["runs/opt/blade_loads/loads"].shape == (2, 2, 3)
+    save_arrays(tmp_path / "results.npz", arrays)
+    store = ResultsStore(tmp_path / "results.npz")
+    assert set(store) == set(arrays)
+    loads = store["runs/opt/blade_loads/loads"]
+    assert isinstance(loads, np.memmap)
+    np.testing.assert_array_equal(loads[1, 0], [4.0, 5.0, 6.0])
+    assert list(store["runs/opt/performance/zone"]) == ["low", "mid"]
+    assert "tsr" in store.keys_under("runs/opt/performance")
+
+
+def test_plotter_arrays(tmp_path):
+    """Test the plotter reads performance and loads from the array store."""
+    json_data, arrays = split_run_arrays("runs/opt", _run_data())
+    save_arrays(tmp_path / "results.npz", arrays)
+    results = {
+        "planform": {
+            "r": [0, 1],
+            "chord": [1, 0.5],
+            "twist": [0, 1],
+            "thickness": [1, 1],
+        },
+        "runs": {"opt": json_data},
+        "arrays": "results.npz",
+    }
+    (tmp_path / "results.json").write_text(json.dumps(results))
+    plotter = B3BemPlotter(tmp_path / "results.json")
+    with (
+        patch("b3_bem.plots.plotter.plot_planform") as planform,
+        patch("b3_bem.plots.plotter.rotorplot") as rotorplot,
+        patch("b3_bem.plots.plotter.plot_moments") as plot_moments,
+    ):
+        plotter.plot_planform()
+        plotter.plot_rotor_performance()
+        plotter.plot_moments()
+    np.testing.assert_array_equal(planform.call_args[0][1], [1, 0.5])
+    np.testing.assert_array_equal(rotorplot.call_args[0][0]["P"], [1.0, 2.0])
+    _r, loads_list, _uinf_list, moments = plot_moments.call_args[0][:4]
+    np.testing.assert_array_equal(loads_list[1]["Tp"], [0.4, 0.5, 0.6])
+    np.testing.assert_allclose(moments["flapwise"], [5.0, 11.0])
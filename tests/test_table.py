@@ -0,0 +1,124 @@
+import numpy as np
+from b3_bem.core.options import SolverOptions
+from b3_bem.core.optimizer import ControlOptimize
+from b3_bem.core.table import PerformanceTable, RPM
+
+
+class CpRotor:
+    """Picklable rotor with a Gaussian CP(TSR, pitch) surface."""
+
+    Rtip = 60.0
+    r = np.linspace(0, 60, 10)
+
+    def evaluate(self, Uinf, Omega, pitch, coefficients=False):
+        Uinf = np.atleast_1d(np.asarray(Uinf, dtype=float))
+        tsr = np.asarray(Omega) * RPM * self.Rtip / Uinf
+        pitch = np.asarray(pitch)
+        CP = 0.48 * np.exp(-(((tsr - 8.0) / 4.0) ** 2) - ((pitch - 1.0) / 8.0) ** 2)
+        P = 0.5 * 1.225 * np.pi * self.Rtip**2 * Uinf**3 * CP
+        outputs = {"P": P, "T": P / 10, "Mb": P / 100}
+        if coefficients:
+            outputs.update(CP=CP, CT=CP, CQ=CP / tsr)
+        return outputs, None
+
+
+def _table():
+    rotor = CpRotor()
+    return PerformanceTable.compute(
+        rotor.evaluate, rotor.Rtip, np.linspace(2, 14, 25), np.linspace(-2, 30, 33)
+    )
+
+
+def test_table_power():
+    """Test interpolated power at operating points off the reference speed."""
+    table = _table()
+    rotor = CpRotor()
+    Uinf, Omega, pitch = np.array([5.0, 11.0]), np.array([6.0, 10.0]), [2.5, 7.3]
+    expected, _ = rotor.evaluate(Uinf, Omega, pitch)
+    np.testing.assert_allclose(
+        table.power(Uinf, Omega, pitch), expected["P"], rtol=1e-3
+    )
+    tsr, pitch_opt = table.optimum()
+    assert abs(tsr - 8.0) < 0.1
+    assert abs(pitch_opt - 1.0) < 0.2
+
+
+def test_table_pitch_for():
+    """Test maximum power pitch and rated power pitch past the maximum."""
+    table = _table()
+    np.testing.assert_allclose(table.pitch_for([6.0, 8.0], 8.0), [1.0, 1.0], atol=0.05)
+    pitch = table.pitch_for([14.0], 15.0, rating=5e6)
+    assert pitch[0] > 1.0
+    np.testing.assert_allclose(table.power(14.0, 15.0, pitch), 5e6, rtol=1e-3)
+
+
+def test_table_save_load(tmp_path):
+    """Test the table round-trips through NPZ."""
+    table = _table()
+    table.fingerprint = "abc"
+    table.save(tmp_path / "table.npz")
+    loaded = PerformanceTable.load(tmp_path / "table.npz")
+    assert loaded.fingerprint == "abc"
+    np.testing.assert_allclose(loaded.CP, table.CP)
+    assert loaded.power(7.0, 8.0, 1.0) == table.power(7.0, 8.0, 1.0)
+
+
+def test_optimize_all_lookup_table(tmp_path):
+    """Test table-based optimization and reuse of the saved table."""
+    rotor = CpRotor()
+    uinf = np.array([1.2, 6.0, 9.0, 14.0])
+    workdir = tmp_path / "mesh"
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        5e6,
+        uinf,
+        workdir,
+        options=SolverOptions(serial=True, lookup_table={}),
+    )
+    results = optimizer.optimize_all()
+    assert (tmp_path / "performance_table.npz").exists()
+    assert [r[1] for r in results] == ["low", "mid", "mid", "high"]
+    assert abs(results[-1][4] - 5e6) < 1.0
+    # Without polishing, the table solution costs one evaluation per point
+    optimizer = ControlOptimize(
+        rotor,
+        95,
+        60,
+        5e6,
+        uinf,
+        workdir,
+        options=SolverOptions(lookup_table={"polish": False}),
+    )
+    fast = optimizer.optimize_all()
+    assert [r[-1] for r in fast] == [1, 1, 1, 1]
+    np.testing.assert_allclose([r[4] for r in fast], [r[4] for r in results], rtol=1e-3)
+
+
+def test_lookup_table_polish(tmp_path):
+    """Test the capped polish costs fewer evaluations than the plain optimization."""
+    uinf = np.array([1.2, 5.0, 7.0, 9.0, 14.0])
+    results = {}
+    for name, config in (
+        ("plain", {}),
+        ("uncapped", {"lookup_table": {}, "polish_iter": 1000}),
+        ("polished", {"lookup_table": True}),
+    ):
+        results[name] = ControlOptimize(
+            CpRotor(),
+            95,
+            60,
+            5e6,
+            uinf,
+            tmp_path / "mesh",
+            options=SolverOptions.from_config({"serial": True, **config}),
+        ).optimize_all()
+    plain, uncapped, polished = (
+        results[name] for name in ("plain", "uncapped", "polished")
+    )
+    assert list(polished.zone) == ["low", "mid", "mid", "mid", "high"]
+    assert np.all(polished.niter <= plain.niter)
+    assert polished.niter.sum() < plain.niter.sum()
+    assert np.all(polished.niter[1:4] < uncapped.niter[1:4])
+    np.testing.assert_allclose(polished.P, plain.P, rtol=1e-4)
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from b3_bem.core.optimizer import ControlOptimize
+from b3_bem.core.options import SolverOptions
+from b3_bem.core.tiers import apply_tier
+
+
+def test_apply_tier():
+    """Test the tier settings merged into a config."""
+    config = {
+        "workdir": "temp",
+        "bem": {
+            "uinf": [3, 4, 5, 6, 7, 8],
+            "span": {"n": 60},
+            "runs": {
+                "opt": {"type": "optimal", "continuation": True},
+                "fixed": {"type": "fixed_setpoints", "setpoints": []},
+            },
+        },
+    }
+    assert apply_tier(config, "standard") is config
+    draft = apply_tier(config, "draft")
+    bem = draft["bem"]
+    assert bem["tier"] == "draft"
+    # Every other wind speed, keeping the last
+    assert bem["uinf"] == [3, 5, 7, 8]
+    assert bem["span"] == {"n": 15, "spacing": "cosine"}
+    assert bem["diagnostic_plots"] is False and bem["json_indent"] is None
+    assert bem["runs"]["opt"]["tol"] == 1e-3
+    # Options that conflict with batching are turned off
+    assert bem["runs"]["opt"]["continuation"] is False
+    assert "tol" not in bem["runs"]["fixed"]
+    # The config itself is left alone
+    assert config["bem"]["span"] == {"n": 60}
+    assert "tol" not in config["bem"]["runs"]["opt"]
+    final = apply_tier(config, "final")
+    assert final["bem"]["span"]["n"] == "auto"
+    assert final["bem"]["uinf"] == config["bem"]["uinf"]
+    # The default optimal run gets the tier settings too
+    assert apply_tier({"bem": {}}, "draft")["bem"]["runs"]["default"]["batched"]
+    # Runs taken from the lookup table alone keep their settings
+    table = {"type": "optimal", "lookup_table": {"polish": False}}
+    runs = apply_tier({"bem": {"runs": {"table": table}}}, "draft")["bem"]["runs"]
+    assert runs["table"] == table
+    with pytest.raises(ValueError):
+        apply_tier(config, "quick")
+
+
+def test_draft_accuracy(tsr_rotor):
+    """Test the draft power curve is within 0.1% of standard and below rating."""
+    config = {
+        "bem": {
+            "uinf": [4, 6, 8, 10, 12, 14, 16, 18, 20, 22],
+            "runs": {"opt": {"type": "optimal", "serial": True, "continuation": True}},
+        }
+    }
+    results = {}
+    for tier in ("standard", "draft"):
+        bem = apply_tier(config, tier)["bem"]
+        results[tier] = ControlOptimize(
+            tsr_rotor(),
+            95,
+            60,
+            1e8,
+            np.array(bem["uinf"], dtype=float),
+            Path("/tmp"),
+            options=SolverOptions.from_config(bem["runs"]["opt"]),
+        ).optimize_all()
+    standard, draft = results["standard"], results["draft"]
+    assert list(draft.zone) == ["mid"] * 2 + ["high"] * 4
+    np.testing.assert_allclose(
+        draft.P, standard.P[np.searchsorted(standard.uinf, draft.uinf)], rtol=1e-3
+    )
+    assert np.all(draft.P <= 1e8 * (1 + 1e-3))
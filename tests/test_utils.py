@@ -1,7 +1,13 @@
 import numpy as np
 import tempfile
 from pathlib import Path
-from b3_bem.utils.utils import load_polar, interpolate_polars
+from unittest.mock import patch
+from b3_bem.utils.utils import (
+    alpha_grid,
+    load_polar,
+    load_polars,
+    interpolate_polars,
+)
 from ccblade.ccblade import CCAirfoil
 
 
@@ -32,3 +38,70 @@ def test_interpolate_polars():
     output = interpolate_polars(polars, tnew)
     assert len(output) == 3
     assert isinstance(output[0], CCAirfoil)
+
+
+def test_interpolate_polars_matches_interp():
+    """Test that every field at every alpha interpolates as np.interp does."""
+    alpha = np.linspace(-180, 180, 7)
+    rng = np.random.default_rng(0)
+    polars = [(t, (alpha, *rng.random((3, 7)))) for t in (1.0, 0.4, 0.3, 0.21)]
+    tnew = np.array([1.2, 1.0, 0.7, 0.35, 0.3, 0.25, 0.1])
+    output = interpolate_polars(polars, tnew)
+    t = [polar[0] for polar in polars][::-1]
+    for n, airfoil in enumerate(output):
+        np.testing.assert_array_equal(airfoil.alpha, alpha)
+        for idx in range(7):
+            cl = [polar[1][1][idx] for polar in polars][::-1]
+            assert np.isclose(airfoil.cl[idx], np.interp(tnew[n], t, cl))
+
+
+def test_interpolate_polars_shares_airfoils():
+    """Test that equal thicknesses and repeated calls share airfoils."""
+    alpha = np.linspace(-180, 180, 5)
+    polars = [(t, (alpha, alpha * t, alpha**2 * t, -alpha * t)) for t in (1.0, 0.2)]
+    tnew = np.array([1.3, 1.0, 1.0, 0.6, 0.2, 0.2, 0.1])
+    output = interpolate_polars(polars, tnew)
+    assert len(output) == 7
+    assert len({id(airfoil) for airfoil in output}) == 3
+    assert output[0] is output[2] and output[4] is output[6]
+    np.testing.assert_allclose(output[3].cl, alpha * 0.6)
+    again = interpolate_polars(polars, np.array([0.6]))
+    assert again[0] is output[3]
+
+
+def test_alpha_grid():
+    """Test the default grid and the denser stall region."""
+    alpha = alpha_grid()
+    assert len(alpha) == 79
+    assert alpha[0] == -180 and alpha[-1] == 180
+    dense = alpha_grid(n_stall=13, stall=(8.0, 20.0))
+    assert np.all(np.diff(dense) > 0)
+    assert np.sum((dense >= 8) & (dense <= 20)) > np.sum((alpha >= 8) & (alpha <= 20))
+    assert np.sum(dense <= -8) - np.sum(alpha <= -8) > 0
+
+
+def test_load_polars_cache():
+    """Test that cached polars match parsed ones and edits invalidate them."""
+    polar_data = "-180 0.0 0.0 0.0\n0 0.5 0.05 0.005\n180 0.0 0.0 0.0\nEOT\n"
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        paths = []
+        for i in range(3):
+            paths.append(tmpdir / f"polar{i}.dat")
+            paths[-1].write_text(polar_data.replace("0.5", f"0.{i + 5}"))
+        cache_dir = tmpdir / "cache"
+        uncached = load_polars(paths)
+        cached = load_polars(paths, cache_dir=cache_dir)
+        assert len(list(cache_dir.iterdir())) == 3
+        for expected, polar in zip(uncached, cached):
+            np.testing.assert_allclose(polar[1], expected[1])
+        # Loaded in the given order
+        maxima = [max(polar[1]) for polar in cached]
+        assert maxima == sorted(maxima)
+
+        with patch("b3_bem.utils.utils._parse_polar") as mock_parse:
+            load_polars(paths, cache_dir=cache_dir)
+        mock_parse.assert_not_called()
+
+        paths[0].write_text(polar_data.replace("0.5", "0.9"))
+        assert max(load_polars(paths, cache_dir=cache_dir)[0][1]) > maxima[-1]